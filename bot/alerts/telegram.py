@@ -28,6 +28,7 @@ class TelegramAlertSink(AlertSink):
         bot_token: str,
         admin_user_ids: list[int],
         session: httpx.AsyncClient | None = None,
+        timeout: float = 5.0,
     ) -> None:
         """Initialize Telegram alert sink.
 
@@ -35,9 +36,12 @@ class TelegramAlertSink(AlertSink):
             bot_token: Telegram bot token
             admin_user_ids: List of admin user IDs to send alerts to
             session: Optional HTTP session for requests
+            timeout: Per-request timeout in seconds, also applied when the
+                session is shared with other components
         """
         self.bot_token = bot_token
         self.admin_user_ids = admin_user_ids
+        self.timeout = timeout
         self.session = session or httpx.AsyncClient()
         self.base_url = f"https://api.telegram.org/bot{bot_token}"
 
@@ -84,7 +88,7 @@ class TelegramAlertSink(AlertSink):
         url = f"{self.base_url}/sendMessage"
         data = {"chat_id": chat_id, "text": text, "parse_mode": "HTML"}
 
-        response = await self.session.post(url, json=data)
+        response = await self.session.post(url, json=data, timeout=self.timeout)
         response.raise_for_status()
 
         result = response.json()
@@ -69,6 +69,9 @@ class AppSettings(BaseSettings):
 
     # Execution mode
     dry_run: bool = Field(default=True, description="Dry run mode (no real trades)")
+    max_parallel_tokens: int = Field(
+        default=8, ge=1, description="Maximum tokens processed concurrently per cycle"
+    )
 
     # Live trading configuration
     preflight_simulate: bool = Field(
@@ -1,6 +1,6 @@
 """Core interfaces for the trading bot."""
 
-from typing import Protocol, runtime_checkable
+from typing import Any, ClassVar, Protocol, runtime_checkable
 
 from .types import FilterDecision, TokenId, TokenSnapshot
 
@@ -20,6 +20,13 @@ class MarketDataSource(Protocol):
 class Filter(Protocol):
     """Token filter protocol."""
 
+    # Lets implementations define __slots__ without a per-instance __dict__
+    __slots__ = ()
+
+    # Relative evaluation cost: 0 for in-memory checks, 10 for a single RPC,
+    # 100 for several. The pipeline runs cheaper filters first.
+    cost: ClassVar[int] = 0
+
     def evaluate(self, snap: TokenSnapshot) -> FilterDecision:
         """Evaluate a token snapshot and return filter decision."""
         ...
@@ -29,15 +36,36 @@ class Filter(Protocol):
 class RiskManager(Protocol):
     """Risk management protocol."""
 
-    def size_usd(self, snap: TokenSnapshot) -> float:
+    # Lets implementations define __slots__ without a per-instance __dict__
+    __slots__ = ()
+
+    def begin_cycle(self, now: float) -> None:
+        """Run per-cycle housekeeping before a batch of risk checks."""
+        ...
+
+    def size_usd(self, snap: TokenSnapshot, now: float | None = None) -> float:
         """Calculate position size in USD for a token."""
         ...
 
-    def allow_buy(self, snap: TokenSnapshot) -> tuple[bool, list[str]]:
+    def can_buy(self, snap: TokenSnapshot, now: float | None = None) -> bool:
+        """Check if buying is allowed, without collecting reasons."""
+        ...
+
+    def allow_buy(
+        self, snap: TokenSnapshot, now: float | None = None
+    ) -> tuple[bool, list[str]]:
         """Check if buying is allowed and return reasons."""
         ...
 
-    def after_fill(self, pnl_usd: float) -> None:
+    def reserve(self, token_mint: str, size_usd: float) -> None:
+        """Hold a position slot for a buy until it settles."""
+        ...
+
+    def release(self, token_mint: str) -> None:
+        """Free the slot held by reserve once the buy has settled."""
+        ...
+
+    def after_fill(self, pnl_usd: float, now: float | None = None) -> None:
         """Update risk state after trade fill."""
         ...
 
@@ -105,3 +133,16 @@ class Persistence(Protocol):
     ) -> list[TokenSnapshot]:
         """Load recent snapshots for a token."""
         ...
+
+    # Key-value state
+    async def list_state_keys(self, prefix: str = "") -> list[str]:
+        """List state keys starting with a prefix."""
+        ...
+
+    async def save_state_json(self, key: str, data: Any) -> None:
+        """Save JSON-serializable data as state."""
+        ...
+
+    async def load_state_json(self, key: str) -> dict[str, Any] | None:
+        """Load JSON state data, or None if not found."""
+        ...
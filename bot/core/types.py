@@ -1,8 +1,9 @@
 """Core data types for the trading bot."""
 
+import sys
 from datetime import datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 
 
 class TokenId(BaseModel):
@@ -11,6 +12,12 @@ class TokenId(BaseModel):
     chain: str = Field(default="sol", description="Blockchain chain identifier")
     mint: str = Field(description="Token mint address")
 
+    @field_validator("mint")
+    @classmethod
+    def _intern_mint(cls, value: str) -> str:
+        """Intern mint addresses so repeated mints share one string object."""
+        return sys.intern(value)
+
 
 class PoolId(BaseModel):
     """Pool identifier with program and address."""
@@ -43,16 +43,19 @@ class JupiterDataSource(MarketDataSource):
         limit: int = 20,
         use_price_v3: bool = False,
         session: Optional[httpx.AsyncClient] = None,
+        timeout: float = 20.0,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.category = category  # toporganicscore | toptraded | toptrending
         self.interval = interval  # 5m | 1h | 6h | 24h
         self.limit = max(1, min(100, int(limit)))
         self.use_price_v3 = use_price_v3
+        # Applied per request so an injected, shared client keeps this timeout
+        self.timeout = timeout
 
         # Prefer an injected AsyncClient; fall back to own client if not provided.
         self._session = session or httpx.AsyncClient(
-            timeout=20.0,
+            timeout=timeout,
             http2=True,
             limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
         )
@@ -67,7 +70,7 @@ class JupiterDataSource(MarketDataSource):
     # -------------------------
     async def _get_json(self, path: str, params: dict[str, Any] | None = None) -> Any:
         url = f"{self.base_url}{path}"
-        r = await self._session.get(url, params=params)
+        r = await self._session.get(url, params=params, timeout=self.timeout)
         r.raise_for_status()
         return r.json()
 
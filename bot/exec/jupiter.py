@@ -488,8 +488,12 @@ class JupiterExecutor(ExecutionClient):
         tx_bytes = base64.b64decode(serialized_tx)
         tx_bytes = self._add_tip_instruction(tx_bytes)
 
-        # Step 4: Sign transaction
-        signed_tx_bytes = self.signer.sign_transaction(tx_bytes)
+        # Step 4: Sign transaction (off the event loop when the signer supports it)
+        sign_async = getattr(self.signer, "sign_transaction_async", None)
+        if sign_async is not None:
+            signed_tx_bytes = await sign_async(tx_bytes)
+        else:
+            signed_tx_bytes = self.signer.sign_transaction(tx_bytes)
         signed_tx_base64 = base64.b64encode(signed_tx_bytes).decode("utf-8")
 
         logger.info(
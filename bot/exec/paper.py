@@ -273,16 +273,18 @@ class PaperExecutor(ExecutionClient):
         cost_usd = result["cost_usd"] + result["fee_usd"]  # Include fees in cost basis
         qty_base = result["qty_base"]
 
-        if token_mint not in self._positions:
+        position = self._positions.get(token_mint)
+        if position is None:
             # New position
-            self._positions[token_mint] = VirtualPosition(
+            position = VirtualPosition(
                 token_mint=token_mint,
                 avg_cost_usd=cost_usd / qty_base,
                 qty_base=qty_base,
             )
+            self._positions[token_mint] = position
         else:
             # Add to existing position
-            self._positions[token_mint].add_position(cost_usd, qty_base)
+            position.add_position(cost_usd, qty_base)
 
         # Record trade
         self._trade_history.append(result)
@@ -291,7 +293,7 @@ class PaperExecutor(ExecutionClient):
             "Buy trade recorded",
             token_mint=token_mint,
             total_positions=len(self._positions),
-            position_qty=self._positions[token_mint].qty_base,
+            position_qty=position.qty_base,
         )
 
         return result
@@ -309,8 +311,9 @@ class PaperExecutor(ExecutionClient):
         token_mint = token.mint
         position = self._positions.get(token_mint)
 
-        if not position or position.qty_base <= 0:
+        if position is None or position.qty_base <= 0:
             raise ValueError(f"No position to sell for token {token_mint}")
+        qty_held = position.qty_base
 
         # Create mock snapshot for current price (in real implementation, would get from data source)
         # For now, use a placeholder price - this would be improved in production
@@ -324,7 +327,7 @@ class PaperExecutor(ExecutionClient):
         )
 
         # Calculate USD amount for the percentage
-        usd_amount = position.qty_base * mock_snap.price_usd * (pct / 100.0)
+        usd_amount = qty_held * mock_snap.price_usd * (pct / 100.0)
 
         result = self._execute_trade(mock_snap, usd_amount, is_buy=False, pct=pct)
 
@@ -1,12 +1,20 @@
 """Transaction signers for Solana trading operations."""
 
+import asyncio
 import base64
+import ctypes
+import functools
 import json
 import os
+import select
+import shutil
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Protocol, Optional, List, Union, TYPE_CHECKING
+from typing import IO, Protocol, TYPE_CHECKING
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -15,6 +23,8 @@ logger = structlog.get_logger(__name__)
 if TYPE_CHECKING:
     import solders.keypair as solders_keypair
 
+    from scripts.secret_vault import SecretVault
+
 # Runtime imports with fallbacks
 try:
     import solders.keypair as solders_keypair
@@ -25,14 +35,43 @@ except ImportError:
     solders_keypair = None
     logger.warning("solders not available - KeypairSigner will not work")
 
+# Prefer orjson for keypair file parsing, falling back to stdlib json
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+# Prefer the Rust-backed decoder; the pure-Python base58 package is the fallback
+try:
+    import based58
+
+    BASED58_AVAILABLE = True
+except ImportError:
+    BASED58_AVAILABLE = False
+    based58 = None
+
 try:
     import base58
 
     BASE58_AVAILABLE = True
 except ImportError:
-    BASE58_AVAILABLE = False
+    BASE58_AVAILABLE = BASED58_AVAILABLE
     base58 = None
-    logger.warning("base58 not available - base58 secret key loading will not work")
+    if not BASED58_AVAILABLE:
+        logger.warning(
+            "base58 not available - base58 secret key loading will not work"
+        )
+
+# External signer pubkeys keyed by (command, args) -> (binary mtime, pubkey)
+_PUBKEY_CACHE_PATH = Path.home() / ".cache" / "trading-bot" / "pubkey_cache.json"
+_PUBKEY_CACHE: dict[tuple[str, tuple[str, ...]], tuple[float, str]] = {}
+_PUBKEY_CACHE_LOADED = False
+
+# Shared pool for concurrent in-process signing, created on first use
+_SIGNING_EXECUTOR: ThreadPoolExecutor | None = None
 
 
 class TxnSigner(Protocol):
@@ -59,9 +98,10 @@ class KeypairSigner:
 
     def __init__(
         self,
-        keypair_path_enc: Optional[str] = None,
-        keypair_path_json: Optional[str] = None,
+        keypair_path_enc: str | None = None,
+        keypair_path_json: str | None = None,
         secret_key_env: str = "SOLANA_SK_B58",
+        fallback: bool = False,
     ) -> None:
         """Initialize KeypairSigner with keypair loading options.
 
@@ -69,12 +109,13 @@ class KeypairSigner:
             keypair_path_enc: Path to encrypted keypair file
             keypair_path_json: Path to JSON keypair file (Phantom/solana-keygen format)
             secret_key_env: Environment variable name for base58 secret key
+            fallback: Try the remaining configured sources if the first fails
         """
         if not SOLDERS_AVAILABLE:
             raise ImportError("solders package is required for KeypairSigner")
 
         self.keypair = self._load_keypair(
-            keypair_path_enc, keypair_path_json, secret_key_env
+            keypair_path_enc, keypair_path_json, secret_key_env, fallback
         )
         logger.info("KeypairSigner initialized", pubkey=self.pubkey_base58())
 
@@ -93,62 +134,77 @@ class KeypairSigner:
         """
         signature = self.keypair.sign_message(txn_bytes)
         # For Solana transactions, we need to prepend the signature
-        return bytes(signature) + txn_bytes
+        # (join sizes the output once instead of concatenating)
+        return b"".join((bytes(signature), txn_bytes))
+
+    async def sign_many(self, txns: list[bytes]) -> list[bytes]:
+        """Sign several transactions concurrently on the shared signing pool.
+
+        Args:
+            txns: Raw transaction bytes to sign
+
+        Returns:
+            Fully signed transactions, in the same order as ``txns``
+        """
+        loop = asyncio.get_running_loop()
+        executor = _get_signing_executor()
+        return list(
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(executor, self.sign_transaction, txn)
+                    for txn in txns
+                )
+            )
+        )
 
     def _load_keypair(
         self,
-        keypair_path_enc: Optional[str],
-        keypair_path_json: Optional[str],
+        keypair_path_enc: str | None,
+        keypair_path_json: str | None,
         secret_key_env: str,
+        fallback: bool = False,
     ):
-        """Load keypair from various sources in order of precedence."""
+        """Load keypair from the first configured source.
 
-        # 1. Try encrypted file first
-        if keypair_path_enc:
-            try:
-                secret_bytes = self._load_encrypted_keypair(keypair_path_enc)
-                return solders_keypair.Keypair.from_bytes(secret_bytes)
-            except Exception as e:
-                logger.warning(
-                    "Failed to load encrypted keypair",
-                    path=keypair_path_enc,
-                    error=str(e),
-                )
+        Sources in order of precedence: encrypted file, environment variable,
+        JSON file. Later sources are only tried when ``fallback`` is set.
+        """
+        env_secret = os.getenv(secret_key_env)
 
-        # 2. Try environment variable
-        try:
-            secret_bytes = load_base58_secret(secret_key_env)
-            return solders_keypair.Keypair.from_bytes(secret_bytes)
-        except Exception as e:
-            logger.warning(
-                "Failed to load secret from environment",
-                env_var=secret_key_env,
-                error=str(e),
+        sources = []
+        if keypair_path_enc:
+            sources.append(
+                ("encrypted", lambda: self._load_encrypted_keypair(keypair_path_enc))
+            )
+        if env_secret:
+            sources.append(
+                ("env", lambda: load_base58_secret_from_string(env_secret))
             )
-
-        # 3. Try JSON file
         if keypair_path_json:
+            sources.append(("json", lambda: load_json_keypair(keypair_path_json)))
+
+        logger.debug(
+            "Loading keypair",
+            sources=[name for name, _ in sources],
+            fallback=fallback,
+        )
+
+        errors = []
+        for name, load_secret in sources if fallback else sources[:1]:
             try:
-                secret_bytes = load_json_keypair(keypair_path_json)
-                return solders_keypair.Keypair.from_bytes(secret_bytes)
+                return solders_keypair.Keypair.from_bytes(load_secret())
             except Exception as e:
-                logger.warning(
-                    "Failed to load JSON keypair", path=keypair_path_json, error=str(e)
-                )
+                errors.append(f"{name}: {e}")
 
         raise ValueError(
             "No valid keypair source found. Please provide one of: encrypted file, environment variable, or JSON file"
+            + (f" ({'; '.join(errors)})" if errors else "")
         )
 
     def _load_encrypted_keypair(self, encrypted_path: str) -> bytes:
         """Load and decrypt keypair from encrypted file using secret vault."""
         try:
-            # Import here to avoid circular imports
-            from scripts.secret_vault import SecretVault, load_key_from_env
-
-            # Load vault key from environment
-            vault_key = load_key_from_env("VAULT_KEY")
-            vault = SecretVault(vault_key)
+            vault = _get_vault()
 
             # Decrypt file in memory (no temp file)
             encrypted_data = Path(encrypted_path).read_bytes()
@@ -167,21 +223,57 @@ class KeypairSigner:
 class ExternalSigner:
     """Signer using external command (e.g., hardware wallet bridge)."""
 
+    # Class-level defaults so partially constructed signers use one-shot mode
+    persistent = False
+    _proc: subprocess.Popen[bytes] | None = None
+    _executor: ThreadPoolExecutor | None = None
+
     def __init__(
-        self, command: str, args: Optional[List[str]] = None, timeout: int = 30
+        self,
+        command: str,
+        args: list[str] | None = None,
+        timeout: int = 30,
+        persistent: bool = False,
+        stdin: bool = False,
     ) -> None:
         """Initialize ExternalSigner with command configuration.
 
+        By default a one-shot signature runs `<command> [args] <base64 txn>`
+        and reads the signed base64 transaction from stdout.
+
         Args:
             command: Path to external signing command
             args: Additional arguments for the command
             timeout: Timeout in seconds for command execution
+            persistent: Keep one long-lived `<command> --daemon` process and
+                exchange one base64 line per transaction over stdin/stdout,
+                instead of spawning the command for every signature
+            stdin: Run one-shot signatures as `<command> [args] --stdin` and
+                write the base64 transaction to its stdin instead of argv;
+                only for commands that support `--stdin`
         """
         self.command = command
         self.args = args or []
         self.timeout = timeout
+        self.persistent = persistent
+        self.stdin = stdin
+        # One-shot command lines; the argv form gets the transaction appended
+        self._argv_cmd = [command, *self.args]
+        self._stdin_cmd = [command, *self.args, "--stdin"]
+        self._proc = None
+        # Daemon output read past the end of the last reply line
+        self._daemon_buffer = b""
+        self._proc_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="external-signer"
+        )
         self.pubkey = self._get_pubkey()
-        logger.info("ExternalSigner initialized", command=command, pubkey=self.pubkey)
+        logger.info(
+            "ExternalSigner initialized",
+            command=command,
+            pubkey=self.pubkey,
+            persistent=persistent,
+        )
 
     def pubkey_base58(self) -> str:
         """Get the public key in base58 format."""
@@ -196,16 +288,23 @@ class ExternalSigner:
         Returns:
             Fully signed transaction bytes ready for RPC submission
         """
-        # Encode transaction as base64
-        txn_b64 = base64.b64encode(txn_bytes).decode("utf-8")
+        if self.persistent:
+            return self._sign_with_daemon(txn_bytes)
 
-        # Prepare command
-        cmd = [self.command] + self.args + [txn_b64]
+        txn_b64 = base64.b64encode(txn_bytes)
+        if self.stdin:
+            # Bytes on stdin: no text decoding and no argv length limits
+            cmd, payload = self._stdin_cmd, txn_b64
+        else:
+            cmd, payload = [*self._argv_cmd, txn_b64.decode("ascii")], None
 
         try:
-            # Execute command
             result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=self.timeout, check=True
+                cmd,
+                input=payload,
+                capture_output=True,
+                timeout=self.timeout,
+                check=True,
             )
 
             # Parse signed transaction from output
@@ -213,20 +312,171 @@ class ExternalSigner:
             if not signed_b64:
                 raise ValueError("External command returned empty output")
 
-            signed_bytes = base64.b64decode(signed_b64)
-            return signed_bytes
+            return base64.b64decode(signed_b64)
 
         except subprocess.TimeoutExpired:
             raise TimeoutError(
                 f"External signing command timed out after {self.timeout} seconds"
             )
         except subprocess.CalledProcessError as e:
-            raise RuntimeError(f"External signing command failed: {e.stderr}")
+            stderr = e.stderr
+            if isinstance(stderr, bytes):
+                stderr = stderr.decode("utf-8", errors="replace")
+            raise RuntimeError(f"External signing command failed: {stderr}")
         except Exception as e:
             raise RuntimeError(f"Failed to execute external signing command: {e}")
 
+    async def sign_transaction_async(self, txn_bytes: bytes) -> bytes:
+        """Sign a transaction without blocking the event loop.
+
+        The blocking external command runs on the signer's thread pool.
+
+        Args:
+            txn_bytes: Raw transaction bytes to sign
+
+        Returns:
+            Fully signed transaction bytes ready for RPC submission
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, self.sign_transaction, txn_bytes
+        )
+
+    def _sign_with_daemon(self, txn_bytes: bytes) -> bytes:
+        """Sign a transaction through the persistent signer process.
+
+        The daemon is restarted once if it has died (broken pipe or EOF).
+
+        Args:
+            txn_bytes: Raw transaction bytes to sign
+
+        Returns:
+            Fully signed transaction bytes ready for RPC submission
+        """
+        request = base64.b64encode(txn_bytes) + b"\n"
+
+        with self._proc_lock:
+            for attempt in range(2):
+                daemon_stdin, daemon_stdout_fd = self._ensure_daemon()
+                try:
+                    daemon_stdin.write(request)
+                    daemon_stdin.flush()
+                    reply = self._read_daemon_line(daemon_stdout_fd)
+                except (BrokenPipeError, ConnectionResetError, EOFError) as e:
+                    self._stop_daemon()
+                    if attempt:
+                        raise RuntimeError(
+                            f"External signing daemon failed: {e}"
+                        ) from e
+                    logger.warning(
+                        "External signing daemon died, restarting", error=str(e)
+                    )
+                    continue
+                except TimeoutError:
+                    self._stop_daemon()
+                    raise
+
+                signed_b64 = reply.strip()
+                if not signed_b64:
+                    raise RuntimeError(
+                        "Failed to execute external signing command: "
+                        "External command returned empty output"
+                    )
+                return base64.b64decode(signed_b64)
+
+        raise RuntimeError("External signing daemon unavailable")
+
+    def _read_daemon_line(self, fd: int) -> bytes:
+        """Read one reply line from the daemon, honouring the signer timeout.
+
+        The pipe is read with os.read rather than a buffered readline, so a
+        partial line cannot block past the deadline.
+
+        Args:
+            fd: File descriptor of the daemon's stdout
+
+        Returns:
+            Reply line including its trailing newline
+        """
+        deadline = time.monotonic() + self.timeout
+        buffer = self._daemon_buffer
+        while (end := buffer.find(b"\n")) < 0:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError(
+                    f"External signing command timed out after {self.timeout} seconds"
+                )
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise EOFError("External signing daemon closed its output")
+            buffer += chunk
+
+        self._daemon_buffer = buffer[end + 1 :]
+        return buffer[: end + 1]
+
+    def _ensure_daemon(self) -> tuple[IO[bytes], int]:
+        """Start the persistent signer process if it is not running.
+
+        Returns:
+            The daemon's stdin pipe and the file descriptor of its stdout
+        """
+        proc = self._proc
+        if proc is None or proc.poll() is not None:
+            proc = self._proc = subprocess.Popen(
+                [self.command] + self.args + ["--daemon"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+            self._daemon_buffer = b""
+            logger.info(
+                "External signing daemon started",
+                command=self.command,
+                pid=proc.pid,
+            )
+        assert proc.stdin is not None and proc.stdout is not None
+        return proc.stdin, proc.stdout.fileno()
+
+    def _stop_daemon(self) -> None:
+        """Terminate the persistent signer process if it is running."""
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+
+        for stream in (proc.stdin, proc.stdout):
+            if stream is not None:
+                stream.close()
+        if proc.poll() is None:
+            proc.terminate()
+            try:
+                proc.wait(timeout=self.timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    def close(self) -> None:
+        """Stop the signing thread pool and the persistent signer process."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+        if self._proc is not None:
+            with self._proc_lock:
+                self._stop_daemon()
+            logger.info("External signing daemon stopped", command=self.command)
+
     def _get_pubkey(self) -> str:
-        """Get public key from external command."""
+        """Get public key from external command.
+
+        The result is cached per (command, args) and reused until the signing
+        binary's mtime changes, so restarts do not re-spawn the command.
+        """
+        cache_key = (self.command, tuple(self.args))
+        mtime = _command_mtime(self.command)
+        if mtime is not None:
+            cached = _load_pubkey_cache().get(cache_key)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+
         # This is a simplified implementation - in practice, the external command
         # might have a separate way to get the public key
         cmd = [self.command] + self.args + ["--pubkey"]
@@ -235,13 +485,217 @@ class ExternalSigner:
             result = subprocess.run(
                 cmd, capture_output=True, text=True, timeout=self.timeout, check=True
             )
-            return result.stdout.strip()
+            pubkey = result.stdout.strip()
         except Exception as e:
             logger.warning(
                 "Failed to get public key from external command", error=str(e)
             )
             return "unknown"
 
+        if mtime is not None and pubkey:
+            _store_pubkey_cache(cache_key, mtime, pubkey)
+
+        return pubkey
+
+
+@functools.lru_cache(maxsize=1)
+def _get_vault() -> "SecretVault":
+    """Get the secret vault keyed from VAULT_KEY, shared by all signers."""
+    # Import here to avoid circular imports
+    from scripts.secret_vault import SecretVault, load_key_from_env
+
+    return SecretVault(load_key_from_env("VAULT_KEY"))
+
+
+def _get_signing_executor() -> ThreadPoolExecutor:
+    """Get the process-wide thread pool used for concurrent signing."""
+    global _SIGNING_EXECUTOR
+
+    if _SIGNING_EXECUTOR is None:
+        _SIGNING_EXECUTOR = ThreadPoolExecutor(
+            max_workers=os.cpu_count(), thread_name_prefix="keypair-signer"
+        )
+    return _SIGNING_EXECUTOR
+
+
+def _command_mtime(command: str) -> float | None:
+    """Get the modification time of an external command binary.
+
+    Args:
+        command: Command name or path
+
+    Returns:
+        Binary mtime, or None if the command cannot be resolved
+    """
+    resolved = shutil.which(command) or command
+    try:
+        return os.stat(resolved).st_mtime
+    except OSError:
+        return None
+
+
+def _load_pubkey_cache() -> dict[tuple[str, tuple[str, ...]], tuple[float, str]]:
+    """Load the on-disk pubkey cache into memory (once per process)."""
+    global _PUBKEY_CACHE_LOADED
+
+    if not _PUBKEY_CACHE_LOADED:
+        _PUBKEY_CACHE_LOADED = True
+        try:
+            entries = json.loads(_PUBKEY_CACHE_PATH.read_text())
+            for entry in entries:
+                key = (entry["command"], tuple(entry["args"]))
+                _PUBKEY_CACHE.setdefault(key, (entry["mtime"], entry["pubkey"]))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(
+                "Failed to load pubkey cache",
+                path=str(_PUBKEY_CACHE_PATH),
+                error=str(e),
+            )
+
+    return _PUBKEY_CACHE
+
+
+def _store_pubkey_cache(
+    cache_key: tuple[str, tuple[str, ...]], mtime: float, pubkey: str
+) -> None:
+    """Record a pubkey in the cache and persist it to disk (best effort)."""
+    cache = _load_pubkey_cache()
+    cache[cache_key] = (mtime, pubkey)
+
+    entries = [
+        {"command": command, "args": list(args), "mtime": mtime, "pubkey": pubkey}
+        for (command, args), (mtime, pubkey) in cache.items()
+    ]
+    try:
+        _PUBKEY_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        _PUBKEY_CACHE_PATH.write_text(json.dumps(entries))
+    except OSError as e:
+        logger.warning(
+            "Failed to persist pubkey cache",
+            path=str(_PUBKEY_CACHE_PATH),
+            error=str(e),
+        )
+
+
+class SharedLibSigner:
+    """Signer calling a local signing library in-process through its C ABI.
+
+    The library must export::
+
+        int sign(const uint8_t *txn, size_t txn_len, uint8_t *out, size_t *out_len)
+
+    returning 0 on success, and may export
+    ``int pubkey(char *out, size_t *out_len)`` for the base58 public key.
+    """
+
+    # Room for signatures and headers the library adds to the transaction
+    SIGN_OVERHEAD_BYTES = 128
+    PUBKEY_BUFFER_BYTES = 64
+
+    def __init__(self, library_path: str) -> None:
+        """Initialize SharedLibSigner by loading the signing library.
+
+        Args:
+            library_path: Path to the shared library exposing ``sign``
+
+        Raises:
+            OSError: If the library cannot be loaded
+            AttributeError: If the library does not export ``sign``
+        """
+        self.library_path = library_path
+        self._lib = ctypes.CDLL(library_path)
+
+        self._sign = self._lib.sign
+        self._sign.argtypes = [
+            ctypes.c_char_p,
+            ctypes.c_size_t,
+            ctypes.c_char_p,
+            ctypes.POINTER(ctypes.c_size_t),
+        ]
+        self._sign.restype = ctypes.c_int
+
+        self.pubkey = self._get_pubkey()
+        logger.info(
+            "SharedLibSigner initialized", library=library_path, pubkey=self.pubkey
+        )
+
+    def pubkey_base58(self) -> str:
+        """Get the public key in base58 format."""
+        return self.pubkey
+
+    def sign_transaction(self, txn_bytes: bytes) -> bytes:
+        """Sign a transaction with the shared library.
+
+        Args:
+            txn_bytes: Raw transaction bytes to sign
+
+        Returns:
+            Fully signed transaction bytes ready for RPC submission
+        """
+        out = ctypes.create_string_buffer(len(txn_bytes) + self.SIGN_OVERHEAD_BYTES)
+        out_len = ctypes.c_size_t(len(out))
+
+        rc = self._sign(txn_bytes, len(txn_bytes), out, ctypes.byref(out_len))
+        if rc != 0:
+            raise RuntimeError(f"Shared library signing failed with code {rc}")
+
+        return out.raw[: out_len.value]
+
+    def _get_pubkey(self) -> str:
+        """Get public key from the library's optional ``pubkey`` export."""
+        try:
+            pubkey_fn = self._lib.pubkey
+        except AttributeError:
+            return "unknown"
+
+        pubkey_fn.argtypes = [ctypes.c_char_p, ctypes.POINTER(ctypes.c_size_t)]
+        pubkey_fn.restype = ctypes.c_int
+
+        out = ctypes.create_string_buffer(self.PUBKEY_BUFFER_BYTES)
+        out_len = ctypes.c_size_t(len(out))
+        if pubkey_fn(out, ctypes.byref(out_len)) != 0:
+            logger.warning("Failed to get public key from signing library")
+            return "unknown"
+
+        return out.raw[: out_len.value].decode("ascii")
+
+
+def load_external_signer(
+    command: str | None = None,
+    args: list[str] | None = None,
+    timeout: int = 30,
+    library_path: str | None = None,
+    stdin: bool = False,
+) -> SharedLibSigner | ExternalSigner:
+    """Create an external signer, preferring the in-process library when present.
+
+    Args:
+        command: Path to external signing command (fallback)
+        args: Additional arguments for the command
+        timeout: Timeout in seconds for command execution
+        library_path: Path to a shared library exposing the signing C ABI
+        stdin: Pass transactions to the command on stdin (see ExternalSigner)
+
+    Returns:
+        SharedLibSigner if the library loads, otherwise ExternalSigner
+    """
+    if library_path:
+        try:
+            return SharedLibSigner(library_path)
+        except (OSError, AttributeError) as e:
+            logger.warning(
+                "Failed to load signing library, falling back to command",
+                library=library_path,
+                error=str(e),
+            )
+
+    if not command:
+        raise ValueError("No external signer command or signing library available")
+
+    return ExternalSigner(command, args, timeout, stdin=stdin)
+
 
 def load_base58_secret(env_var: str) -> bytes:
     """Load base58-encoded secret key from environment variable.
@@ -273,7 +727,10 @@ def load_base58_secret_from_string(secret_str: str) -> bytes:
 
     try:
         # Decode base58
-        secret_bytes = base58.b58decode(secret_str)
+        if BASED58_AVAILABLE:
+            secret_bytes = based58.b58decode(secret_str.encode("ascii"))
+        else:
+            secret_bytes = base58.b58decode(secret_str)
 
         # Validate length (Solana keypairs are 64 bytes)
         if len(secret_bytes) != 64:
@@ -297,8 +754,9 @@ def load_json_keypair(json_path: str) -> bytes:
         64-byte secret key
     """
     try:
-        with open(json_path, "r") as f:
-            data = json.load(f)
+        with open(json_path, "rb") as f:
+            raw = f.read()
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
 
         # Handle different JSON formats
         if isinstance(data, list):
@@ -307,13 +765,13 @@ def load_json_keypair(json_path: str) -> bytes:
                 raise ValueError(
                     f"Invalid keypair array length: {len(data)} (expected 64)"
                 )
-            return bytes(data)
+            return bytes(bytearray(data))
         elif isinstance(data, dict):
             # Alternative format with secret key field
             if "secretKey" in data:
                 secret_data = data["secretKey"]
                 if isinstance(secret_data, list):
-                    return bytes(secret_data)
+                    return bytes(bytearray(secret_data))
                 elif isinstance(secret_data, str):
                     return load_base58_secret_from_string(secret_data)
             raise ValueError("JSON keypair file does not contain valid secretKey field")
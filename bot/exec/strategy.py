@@ -1,6 +1,12 @@
 """Trading strategy implementation with position lifecycle management."""
 
-from datetime import datetime, timedelta
+import asyncio
+import bisect
+import contextlib
+import time
+from collections.abc import Mapping
+from datetime import UTC, datetime, timedelta
+from types import MappingProxyType
 from typing import Any
 
 import structlog
@@ -10,10 +16,26 @@ from ..core.types import TokenSnapshot
 
 logger = structlog.get_logger(__name__)
 
+# Epoch reference for the integer-nanosecond entry_time storage format
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_LOAD_CONCURRENCY = 32
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
 
 class PositionState:
     """Represents the current state of a trading position."""
 
+    __slots__ = (
+        "token_mint",
+        "entry_price_usd",
+        "quantity",
+        "entry_time",
+        "high_water_mark",
+        "trailing_stop_price",
+        "partial_sells",
+        "_sold_levels",
+    )
+
     def __init__(
         self,
         token_mint: str,
@@ -42,14 +64,21 @@ class PositionState:
         self.high_water_mark = high_water_mark
         self.trailing_stop_price = trailing_stop_price
         self.partial_sells = partial_sells or []
+        # Take profit levels already sold, for O(1) lookups on every tick
+        self._sold_levels: set[float] = {
+            sell["level"] for sell in self.partial_sells if "level" in sell
+        }
 
     def to_dict(self) -> dict[str, Any]:
-        """Convert position state to dictionary for storage."""
+        """Convert position state to dictionary for storage.
+
+        ``entry_time`` is stored as integer nanoseconds since the epoch.
+        """
         return {
             "token_mint": self.token_mint,
             "entry_price_usd": self.entry_price_usd,
             "quantity": self.quantity,
-            "entry_time": self.entry_time.isoformat(),
+            "entry_time": _datetime_to_ns(self.entry_time),
             "high_water_mark": self.high_water_mark,
             "trailing_stop_price": self.trailing_stop_price,
             "partial_sells": self.partial_sells,
@@ -57,12 +86,21 @@ class PositionState:
 
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "PositionState":
-        """Create position state from dictionary."""
+        """Create position state from dictionary.
+
+        Accepts ``entry_time`` as integer nanoseconds or a legacy ISO string.
+        """
+        entry_time = data["entry_time"]
+        if isinstance(entry_time, str):
+            entry_time = datetime.fromisoformat(entry_time)
+        else:
+            entry_time = _ns_to_datetime(entry_time)
+
         return cls(
             token_mint=data["token_mint"],
             entry_price_usd=data["entry_price_usd"],
             quantity=data["quantity"],
-            entry_time=datetime.fromisoformat(data["entry_time"]),
+            entry_time=entry_time,
             high_water_mark=data.get("high_water_mark", 0.0),
             trailing_stop_price=data.get("trailing_stop_price", 0.0),
             partial_sells=data.get("partial_sells", []),
@@ -70,7 +108,14 @@ class PositionState:
 
 
 class TradingStrategy:
-    """Trading strategy with position lifecycle management."""
+    """Trading strategy with position lifecycle management.
+
+    Trailing stop and high water mark updates are coalesced and saved at most
+    once per ``flush_interval_ms``. After ``start()`` a background task does
+    the saving; otherwise pending updates are saved inline by the next price
+    update once the interval has passed. Call ``stop()`` (or ``flush()``) on
+    shutdown to write whatever is still pending.
+    """
 
     def __init__(
         self,
@@ -81,6 +126,7 @@ class TradingStrategy:
         trailing_stop_pct: float = 0.15,  # 15% trailing stop
         max_hold_time_hours: float = 24.0,  # 24 hours max hold
         partial_sell_fraction: float = 0.25,  # Sell 25% at each profit level
+        flush_interval_ms: int = 500,  # Coalesce trailing-stop saves
     ) -> None:
         """Initialize trading strategy.
 
@@ -92,24 +138,39 @@ class TradingStrategy:
             trailing_stop_pct: Trailing stop percentage
             max_hold_time_hours: Maximum position hold time in hours
             partial_sell_fraction: Fraction to sell at each profit level
+            flush_interval_ms: Interval for flushing coalesced trailing stop
+                updates to storage
         """
         self.exec_client = exec_client
         self.risk_manager = risk_manager
         self.storage = storage
 
-        # Default take profit levels: (multiplier, fraction)
-        self.take_profit_levels = take_profit_levels or [
-            (2.0, 0.25),  # Sell 25% at 2x
-            (3.0, 0.25),  # Sell 25% at 3x
-        ]
+        # Default take profit levels: (multiplier, fraction), sorted ascending so
+        # the hot path can stop at the first level the price has not reached
+        self.take_profit_levels = sorted(
+            take_profit_levels
+            or [
+                (2.0, 0.25),  # Sell 25% at 2x
+                (3.0, 0.25),  # Sell 25% at 3x
+            ]
+        )
+        self._tp_multipliers = [level[0] for level in self.take_profit_levels]
+        self._tp_fractions = [level[1] for level in self.take_profit_levels]
 
         self.trailing_stop_pct = trailing_stop_pct
         self.max_hold_time_hours = max_hold_time_hours
+        self._max_hold_delta = timedelta(hours=max_hold_time_hours)
         self.partial_sell_fraction = partial_sell_fraction
 
         # Active positions cache
         self._positions: dict[str, PositionState] = {}
 
+        # Positions with unsaved trailing stop updates, flushed periodically
+        self.flush_interval_ms = flush_interval_ms
+        self._dirty: set[str] = set()
+        self._flush_task: asyncio.Task | None = None
+        self._last_flush = time.monotonic()
+
         logger.info(
             "Trading strategy initialized",
             take_profit_levels=self.take_profit_levels,
@@ -218,18 +279,16 @@ class TradingStrategy:
         if current_price > position.high_water_mark:
             position.high_water_mark = current_price
 
-        # Check each take profit level
-        for multiplier, fraction in self.take_profit_levels:
-            if price_multiplier >= multiplier:
-                # Check if we already sold at this level
-                already_sold = any(
-                    sell.get("level") == multiplier for sell in position.partial_sells
-                )
+        # Only the levels at or below the current multiplier can trigger
+        reached = bisect.bisect_right(self._tp_multipliers, price_multiplier)
+        for i in range(reached):
+            multiplier = self._tp_multipliers[i]
 
-                if not already_sold:
-                    return await self._execute_partial_sell(
-                        position, snapshot, fraction, multiplier
-                    )
+            # Skip levels we already sold at
+            if multiplier not in position._sold_levels:
+                return await self._execute_partial_sell(
+                    position, snapshot, self._tp_fractions[i], multiplier
+                )
 
         return None
 
@@ -258,7 +317,7 @@ class TradingStrategy:
             # Only move stop up, never down
             if new_stop_price > position.trailing_stop_price:
                 position.trailing_stop_price = new_stop_price
-                await self._save_position_state(position)
+                self._dirty.add(token_mint)
 
                 logger.debug(
                     "Updated trailing stop",
@@ -278,13 +337,62 @@ class TradingStrategy:
 
             return await self._execute_full_sell(position, snapshot, "trailing_stop")
 
+        await self._flush_if_due()
         return None
 
-    async def time_stop(self, snapshot: TokenSnapshot) -> dict[str, Any] | None:
+    async def update_prices(self, prices: Mapping[str, float]) -> list[str]:
+        """Mark all held positions to market in a single pass.
+
+        Updates high water marks and trailing stops for every position with a
+        price in ``prices``; positions whose stop moved up are queued for the
+        next coalesced flush.
+
+        Args:
+            prices: Mapping of token_mint -> current price in USD
+
+        Returns:
+            Token mints whose trailing stop has been hit
+        """
+        stop_factor = 1 - self.trailing_stop_pct
+        moved = 0
+        triggered: list[str] = []
+
+        for token_mint, position in self._positions.items():
+            current_price = prices.get(token_mint)
+            if current_price is None:
+                continue
+
+            if current_price > position.high_water_mark:
+                position.high_water_mark = current_price
+                new_stop_price = current_price * stop_factor
+                if new_stop_price > position.trailing_stop_price:
+                    position.trailing_stop_price = new_stop_price
+                    self._dirty.add(token_mint)
+                    moved += 1
+
+            if current_price <= position.trailing_stop_price:
+                triggered.append(token_mint)
+
+        if moved or triggered:
+            logger.debug(
+                "Marked positions to market",
+                priced=len(prices),
+                stops_moved=moved,
+                stops_triggered=len(triggered),
+            )
+
+        await self._flush_if_due()
+        return triggered
+
+    async def time_stop(
+        self, snapshot: TokenSnapshot, now: datetime | None = None
+    ) -> dict[str, Any] | None:
         """Check and execute time-based exits.
 
         Args:
             snapshot: Current token snapshot
+            now: Current time, so callers checking many positions per tick can
+                pass one cached value (defaults to datetime.now())
 
         Returns:
             Sell result if time stop triggered, None otherwise
@@ -295,11 +403,11 @@ class TradingStrategy:
         if not position:
             return None
 
-        current_time = datetime.now()
-        hold_time = current_time - position.entry_time
-        max_hold_time = timedelta(hours=self.max_hold_time_hours)
+        if now is None:
+            now = datetime.now()
+        hold_time = now - position.entry_time
 
-        if hold_time >= max_hold_time:
+        if hold_time >= self._max_hold_delta:
             logger.info(
                 "Time stop triggered",
                 token_mint=token_mint,
@@ -307,7 +415,9 @@ class TradingStrategy:
                 max_hold_time_hours=self.max_hold_time_hours,
             )
 
-            return await self._execute_full_sell(position, snapshot, "time_stop")
+            return await self._execute_full_sell(
+                position, snapshot, "time_stop", now=now
+            )
 
         return None
 
@@ -317,6 +427,7 @@ class TradingStrategy:
         snapshot: TokenSnapshot,
         fraction: float,
         level: float,
+        now: datetime | None = None,
     ) -> dict[str, Any]:
         """Execute a partial sell order.
 
@@ -325,6 +436,7 @@ class TradingStrategy:
             snapshot: Current market snapshot
             fraction: Fraction of position to sell
             level: Take profit level (for tracking)
+            now: Current time (defaults to datetime.now())
 
         Returns:
             Sell result
@@ -349,15 +461,17 @@ class TradingStrategy:
         position.quantity -= sell_quantity
         position.partial_sells.append(
             {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": (now or datetime.now()).isoformat(),
                 "quantity": sell_quantity,
                 "price": sell_result["price_exec"],
                 "level": level,
                 "reason": "take_profit",
             }
         )
+        position._sold_levels.add(level)
 
-        # Save updated position
+        # Save updated position (includes any pending trailing stop update)
+        self._dirty.discard(position.token_mint)
         await self._save_position_state(position)
 
         # If position is fully closed, remove from active positions
@@ -371,7 +485,11 @@ class TradingStrategy:
         return sell_result
 
     async def _execute_full_sell(
-        self, position: PositionState, snapshot: TokenSnapshot, reason: str
+        self,
+        position: PositionState,
+        snapshot: TokenSnapshot,
+        reason: str,
+        now: datetime | None = None,
     ) -> dict[str, Any]:
         """Execute a full position sell.
 
@@ -379,6 +497,7 @@ class TradingStrategy:
             position: Position to sell
             snapshot: Current market snapshot
             reason: Reason for selling
+            now: Current time (defaults to datetime.now())
 
         Returns:
             Sell result
@@ -399,21 +518,68 @@ class TradingStrategy:
         # Record final sell
         position.partial_sells.append(
             {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": (now or datetime.now()).isoformat(),
                 "quantity": position.quantity,
                 "price": sell_result["price_exec"],
                 "reason": reason,
             }
         )
+        position.quantity = 0.0
 
         # Remove from active positions
         del self._positions[position.token_mint]
+        self._dirty.discard(position.token_mint)
 
         # Save final position state
         await self._save_position_state(position)
 
         return sell_result
 
+    async def start(self) -> None:
+        """Start the background flush of coalesced position updates."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the background flush and write any pending updates."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Save all positions with pending trailing stop updates."""
+        self._last_flush = time.monotonic()
+        if not self._dirty:
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        positions = [
+            self._positions[mint] for mint in dirty if mint in self._positions
+        ]
+        await asyncio.gather(
+            *(self._save_position_state(position) for position in positions)
+        )
+
+    async def _flush_if_due(self) -> None:
+        """Flush inline when no background flush runs and the interval passed."""
+        if not self._dirty:
+            return
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        if time.monotonic() - self._last_flush >= self.flush_interval_ms / 1000:
+            await self.flush()
+
+    async def _flush_loop(self) -> None:
+        """Periodically flush coalesced position updates."""
+        interval = self.flush_interval_ms / 1000
+        while True:
+            await asyncio.sleep(interval)
+            await self.flush()
+
     async def _save_position_state(self, position: PositionState) -> None:
         """Save position state to storage."""
         try:
@@ -430,21 +596,39 @@ class TradingStrategy:
     async def load_positions(self) -> None:
         """Load active positions from storage."""
         try:
-            # Load all position states from storage
-            # This is a simplified implementation - in practice you'd want
-            # to scan for position_* keys or maintain a position index
             logger.info("Loading positions from storage")
 
-            # For now, we'll assume positions are loaded elsewhere
-            # In a real implementation, you'd scan storage for position keys
-            # and reconstruct PositionState objects
+            keys = await self.storage.list_state_keys("position_")
+            semaphore = asyncio.Semaphore(_LOAD_CONCURRENCY)
+
+            async def load(key: str) -> dict[str, Any] | None:
+                async with semaphore:
+                    return await self.storage.load_state_json(key)
+
+            states = await asyncio.gather(*(load(key) for key in keys))
+
+            for data in states:
+                if not data or data.get("quantity", 0) <= 0:
+                    continue  # Missing or closed position
+                position = PositionState.from_dict(data)
+                self._positions[position.token_mint] = position
+
+            logger.info(
+                "Positions loaded",
+                stored=len(keys),
+                active=len(self._positions),
+            )
 
         except Exception as e:
             logger.error("Failed to load positions", error=str(e))
 
-    def get_active_positions(self) -> dict[str, PositionState]:
-        """Get all active positions."""
-        return self._positions.copy()
+    def get_active_positions(self) -> Mapping[str, PositionState]:
+        """Get a read-only live view of all active positions.
+
+        The view reflects later position changes; use ``dict(...)`` on the
+        result when a snapshot is needed.
+        """
+        return MappingProxyType(self._positions)
 
     def get_position(self, token_mint: str) -> PositionState | None:
         """Get a specific position."""
@@ -454,6 +638,17 @@ class TradingStrategy:
 # Pure helper functions for price calculations
 
 
+def _datetime_to_ns(value: datetime) -> int:
+    """Convert a datetime (naive values are local time) to epoch nanoseconds."""
+    return (value.astimezone(UTC) - _EPOCH) // _ONE_MICROSECOND * 1_000
+
+
+def _ns_to_datetime(ns: int) -> datetime:
+    """Convert epoch nanoseconds to a naive local datetime."""
+    utc_time = _EPOCH + timedelta(microseconds=ns // 1_000)
+    return utc_time.astimezone().replace(tzinfo=None)
+
+
 def calculate_pnl_percentage(entry_price: float, current_price: float) -> float:
     """Calculate percentage P&L.
 
@@ -497,17 +692,20 @@ def calculate_position_value(quantity: float, price: float) -> float:
     return quantity * price
 
 
-def calculate_remaining_hold_time(entry_time: datetime, max_hours: float) -> float:
+def calculate_remaining_hold_time(
+    entry_time: datetime, max_hours: float, now: datetime | None = None
+) -> float:
     """Calculate remaining hold time.
 
     Args:
         entry_time: Position entry time
         max_hours: Maximum hold time in hours
+        now: Current time (defaults to datetime.now())
 
     Returns:
         Remaining time in hours (negative if exceeded)
     """
-    elapsed = datetime.now() - entry_time
+    elapsed = (now or datetime.now()) - entry_time
     elapsed_hours = elapsed.total_seconds() / 3600
     return max_hours - elapsed_hours
 
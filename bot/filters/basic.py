@@ -11,30 +11,84 @@ logger = structlog.get_logger(__name__)
 class BasicFilter(Filter):
     """Basic filter that implements common trading criteria."""
 
+    __slots__ = (
+        "min_volume_usd",
+        "min_liquidity_usd",
+        "min_holders",
+        "min_age_seconds",
+        "verbose",
+        "_log",
+    )
+
     def __init__(
         self,
         min_volume_usd: float = 10000.0,
         min_liquidity_usd: float = 50000.0,
         min_holders: int = 100,
         min_age_seconds: int = 1800,  # 30 minutes
+        verbose: bool = False,
     ) -> None:
-        """Initialize basic filter."""
-        self.min_volume_usd = min_volume_usd
-        self.min_liquidity_usd = min_liquidity_usd
+        """Initialize basic filter.
+
+        Args:
+            min_volume_usd: Minimum 5 minute volume in USD
+            min_liquidity_usd: Minimum liquidity in USD
+            min_holders: Minimum number of holders
+            min_age_seconds: Minimum token age in seconds
+            verbose: Report every failed criterion and its score penalty
+                instead of rejecting on the first failure
+        """
+        # Store thresholds as floats so Decimal config values do not slow
+        # down the per-snapshot comparisons
+        self.min_volume_usd = float(min_volume_usd)
+        self.min_liquidity_usd = float(min_liquidity_usd)
         self.min_holders = min_holders
         self.min_age_seconds = min_age_seconds
+        self.verbose = verbose
+        self._log = logger.bind(filter=type(self).__name__)
 
     def evaluate(self, snap: TokenSnapshot) -> FilterDecision:
         """Evaluate token snapshot against basic criteria."""
-        reasons = []
-        score = 1.0
+        if self.verbose:
+            return self._evaluate_verbose(snap)
 
-        # Check volume
-        if snap.vol_5m_usd < self.min_volume_usd:
-            reasons.append(
-                f"Volume too low: ${snap.vol_5m_usd:.2f} < ${self.min_volume_usd:.2f}"
+        if not self._evaluate_fast(snap):
+            return FilterDecision(
+                accepted=False, score=0.0, reasons=["Failed basic criteria"]
             )
-            score -= 0.3
+
+        return FilterDecision(
+            accepted=True, score=1.0, reasons=["Passed basic criteria"]
+        )
+
+    def evaluate_batch(self, snaps: list[TokenSnapshot]) -> list[bool]:
+        """Check a batch of snapshots against basic criteria.
+
+        Args:
+            snaps: Token snapshots to check
+
+        Returns:
+            Acceptance flag for each snapshot, in input order
+        """
+        passes = self._evaluate_fast
+        return [passes(snap) for snap in snaps]
+
+    def _evaluate_fast(self, snap: TokenSnapshot) -> bool:
+        """Check basic criteria, stopping at the first failure."""
+        if snap.liq_usd < self.min_liquidity_usd:
+            return False
+        if snap.vol_5m_usd < self.min_volume_usd:
+            return False
+        if snap.holders is not None and snap.holders < self.min_holders:
+            return False
+        if snap.age_seconds is not None and snap.age_seconds < self.min_age_seconds:
+            return False
+        return True
+
+    def _evaluate_verbose(self, snap: TokenSnapshot) -> FilterDecision:
+        """Evaluate all basic criteria and collect every failure reason."""
+        reasons = []
+        score = 1.0
 
         # Check liquidity
         if snap.liq_usd < self.min_liquidity_usd:
@@ -43,6 +97,13 @@ class BasicFilter(Filter):
             )
             score -= 0.4
 
+        # Check volume
+        if snap.vol_5m_usd < self.min_volume_usd:
+            reasons.append(
+                f"Volume too low: ${snap.vol_5m_usd:.2f} < ${self.min_volume_usd:.2f}"
+            )
+            score -= 0.3
+
         # Check holders
         if snap.holders is not None and snap.holders < self.min_holders:
             reasons.append(f"Too few holders: {snap.holders} < {self.min_holders}")
@@ -55,12 +116,12 @@ class BasicFilter(Filter):
             )
             score -= 0.1
 
-        accepted = score >= 0.5 and len(reasons) == 0
+        accepted = not reasons
 
         if accepted:
             reasons.append("Passed basic criteria")
 
-        logger.debug(
+        self._log.debug(
             "Basic filter evaluation",
             token_mint=snap.token.mint,
             accepted=accepted,
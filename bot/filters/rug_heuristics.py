@@ -11,56 +11,119 @@ logger = structlog.get_logger(__name__)
 class RugHeuristicsFilter(Filter):
     """Filter to detect potential rug pull tokens using heuristics."""
 
+    __slots__ = (
+        "max_holder_concentration",
+        "min_holders",
+        "max_price_volatility",
+        "verbose",
+        "_log",
+    )
+
     def __init__(
         self,
         max_holder_concentration: float = 0.8,
         min_holders: int = 50,
         max_price_volatility: float = 100.0,  # Max 100% price change in 5m
+        verbose: bool = False,
     ) -> None:
-        """Initialize rug heuristics filter."""
-        self.max_holder_concentration = max_holder_concentration
+        """Initialize rug heuristics filter.
+
+        Args:
+            max_holder_concentration: Maximum share of supply held by top holders
+            min_holders: Minimum number of holders
+            max_price_volatility: Maximum absolute 5 minute price change in percent
+            verbose: Report every failed heuristic and its score penalty
+                instead of rejecting on the first failure
+        """
+        self.max_holder_concentration = float(max_holder_concentration)
         self.min_holders = min_holders
-        self.max_price_volatility = max_price_volatility
+        self.max_price_volatility = float(max_price_volatility)
+        self.verbose = verbose
+        self._log = logger.bind(filter=type(self).__name__)
 
     def evaluate(self, snap: TokenSnapshot) -> FilterDecision:
         """Evaluate token snapshot for rug pull indicators."""
+        if self.verbose:
+            return self._evaluate_verbose(snap)
+
+        if not self._evaluate_fast(snap):
+            return FilterDecision(
+                accepted=False, score=0.0, reasons=["Failed rug heuristics"]
+            )
+
+        return FilterDecision(
+            accepted=True, score=1.0, reasons=["Passed rug heuristics"]
+        )
+
+    def evaluate_batch(self, snaps: list[TokenSnapshot]) -> list[bool]:
+        """Check a batch of snapshots against rug heuristics.
+
+        Args:
+            snaps: Token snapshots to check
+
+        Returns:
+            Acceptance flag for each snapshot, in input order
+        """
+        passes = self._evaluate_fast
+        return [passes(snap) for snap in snaps]
+
+    def _evaluate_fast(self, snap: TokenSnapshot) -> bool:
+        """Check rug heuristics, stopping at the first failure."""
+        if snap.liq_usd < 1000:
+            return False
+
+        holders = snap.holders
+        if holders is None or holders < self.min_holders:
+            return False
+
+        pct = snap.pct_change_5m
+        if pct is not None and (pct > 50 or abs(pct) > self.max_price_volatility):
+            return False
+
+        return True
+
+    def _evaluate_verbose(self, snap: TokenSnapshot) -> FilterDecision:
+        """Evaluate all rug heuristics and collect every failure reason."""
         reasons = []
         score = 1.0
+        liq = snap.liq_usd
+        holders = snap.holders
+        pct = snap.pct_change_5m
+
+        # Check liquidity (very low liquidity is suspicious)
+        if liq < 1000:
+            reasons.append(f"Very low liquidity: ${liq:.2f}")
+            score -= 0.3
 
         # Check holder count
-        if snap.holders is not None:
-            if snap.holders < self.min_holders:
-                reasons.append(f"Too few holders: {snap.holders} < {self.min_holders}")
+        if holders is not None:
+            if holders < self.min_holders:
+                reasons.append(f"Too few holders: {holders} < {self.min_holders}")
                 score -= 0.4
         else:
             reasons.append("Holder count unknown")
             score -= 0.2
 
-        # Check price volatility
-        if snap.pct_change_5m is not None:
-            abs_change = abs(snap.pct_change_5m)
+        if pct is not None:
+            # Check price volatility
+            abs_change = abs(pct)
             if abs_change > self.max_price_volatility:
                 reasons.append(
                     f"Price too volatile: {abs_change:.1f}% > {self.max_price_volatility}%"
                 )
                 score -= 0.3
 
-        # Check for extreme price movements (potential pump and dump)
-        if snap.pct_change_5m is not None and snap.pct_change_5m > 50:
-            reasons.append(f"Potential pump: +{snap.pct_change_5m:.1f}% in 5m")
-            score -= 0.2
-
-        # Check liquidity (very low liquidity is suspicious)
-        if snap.liq_usd < 1000:
-            reasons.append(f"Very low liquidity: ${snap.liq_usd:.2f}")
-            score -= 0.3
+            # Check for extreme price movements (potential pump and dump)
+            if pct > 50:
+                reasons.append(f"Potential pump: +{pct:.1f}% in 5m")
+                score -= 0.2
 
-        accepted = score >= 0.5 and len(reasons) == 0
+        accepted = not reasons
 
         if accepted:
             reasons.append("Passed rug heuristics")
 
-        logger.debug(
+        self._log.debug(
             "Rug heuristics evaluation",
             token_mint=snap.token.mint,
             accepted=accepted,
@@ -1,8 +1,13 @@
 """Persistence storage using SQLite and optional Parquet."""
 
+import asyncio
+import contextlib
 import json
+import time
+import uuid
 import warnings
-from datetime import datetime
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
@@ -13,16 +18,25 @@ from ..core.interfaces import Persistence
 
 logger = structlog.get_logger(__name__)
 
+# Prefer orjson for state (de)serialization, falling back to stdlib json
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 # Try to import pyarrow for Parquet support
 try:
     import pyarrow as pa
-    import pyarrow.parquet as pq
+    import pyarrow.dataset as ds
 
     PARQUET_AVAILABLE = True
 except ImportError:
     PARQUET_AVAILABLE = False
     pa = None
-    pq = None
+    ds = None
 
 
 class SQLiteStorage(Persistence):
@@ -33,6 +47,9 @@ class SQLiteStorage(Persistence):
         db_path: str = "bot.sqlite",
         parquet_dir: str | None = None,
         enable_parquet: bool = False,
+        trade_flush_interval_ms: int = 50,
+        trade_batch_size: int = 100,
+        parquet_batch_size: int = 100,
     ) -> None:
         """Initialize SQLite storage.
 
@@ -40,11 +57,50 @@ class SQLiteStorage(Persistence):
             db_path: Path to SQLite database file
             parquet_dir: Directory for Parquet files (optional)
             enable_parquet: Whether to enable Parquet writing
+            trade_flush_interval_ms: Interval for flushing buffered trades
+            trade_batch_size: Number of buffered trades that forces a flush
+            parquet_batch_size: Number of trades written per Parquet file
         """
         self.db_path = db_path
         self.parquet_dir = Path(parquet_dir) if parquet_dir else None
         self.enable_parquet = enable_parquet and PARQUET_AVAILABLE
 
+        # Long-lived connection, opened on first use and reused for all calls
+        self._db: aiosqlite.Connection | None = None
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+
+        # Write-behind buffer of trade rows, inserted in batches
+        self.trade_flush_interval_ms = trade_flush_interval_ms
+        self.trade_batch_size = trade_batch_size
+        self._trade_buffer: list[tuple[Any, ...]] = []
+        self._next_trade_id: int | None = None
+        self._trade_flush_task: asyncio.Task | None = None
+        # Open hold_trades() blocks; while any is open only flush_batch writes
+        self._trade_holds = 0
+
+        # Parquet rows buffered on the writer thread and written per batch
+        self.parquet_batch_size = parquet_batch_size
+        self._parquet_buffer: list[dict[str, Any]] = []
+        self._parquet_day: tuple[float, float, str] = (0.0, 0.0, "")
+        self._parquet_executor: ThreadPoolExecutor | None = None
+        self._trade_schema = (
+            pa.schema(
+                [
+                    ("id", pa.int64()),
+                    ("token_mint", pa.string()),
+                    ("side", pa.string()),
+                    ("qty", pa.float64()),
+                    ("px", pa.float64()),
+                    ("fee_usd", pa.float64()),
+                    ("ts", pa.float64()),
+                    ("date", pa.string()),
+                ]
+            )
+            if PARQUET_AVAILABLE
+            else None
+        )
+
         if enable_parquet and not PARQUET_AVAILABLE:
             warnings.warn(
                 "Parquet support requested but pyarrow not available. "
@@ -65,10 +121,8 @@ class SQLiteStorage(Persistence):
 
     async def initialize(self) -> None:
         """Initialize database tables."""
-        async with aiosqlite.connect(self.db_path) as db:
-            # Enable foreign keys
-            await db.execute("PRAGMA foreign_keys = ON")
-
+        db = await self._get_db()
+        async with self._write_lock:
             # Create positions table
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS positions (
@@ -92,16 +146,15 @@ class SQLiteStorage(Persistence):
                 )
             """)
 
-            # Create index on trades for better query performance
+            # Per-token trade history is a single range scan on this index
             await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_trades_token_mint
-                ON trades(token_mint)
+                CREATE INDEX IF NOT EXISTS idx_trades_mint_ts
+                ON trades(token_mint, ts DESC)
             """)
 
-            await db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_trades_ts
-                ON trades(ts)
-            """)
+            # Superseded by idx_trades_mint_ts; nothing queries trades by time alone
+            await db.execute("DROP INDEX IF EXISTS idx_trades_token_mint")
+            await db.execute("DROP INDEX IF EXISTS idx_trades_ts")
 
             # Create state table for key-value storage
             await db.execute("""
@@ -113,6 +166,10 @@ class SQLiteStorage(Persistence):
 
             await db.commit()
 
+        await self._seed_trade_id()
+        if self._trade_flush_task is None or self._trade_flush_task.done():
+            self._trade_flush_task = asyncio.create_task(self._trade_flush_loop())
+
         logger.info("Database tables initialized")
 
     async def upsert_position(
@@ -131,9 +188,10 @@ class SQLiteStorage(Persistence):
             updated_ts: Update timestamp (defaults to current time)
         """
         if updated_ts is None:
-            updated_ts = datetime.now().timestamp()
+            updated_ts = time.time()
 
-        async with aiosqlite.connect(self.db_path) as db:
+        db = await self._get_db()
+        async with self._write_lock:
             await db.execute(
                 """
                 INSERT INTO positions (token_mint, qty, avg_cost_usd, updated_ts)
@@ -166,6 +224,9 @@ class SQLiteStorage(Persistence):
     ) -> int:
         """Record a trade.
 
+        The row is buffered and inserted with the next batch; the trade ID is
+        reserved immediately.
+
         Args:
             token_mint: Token mint address
             side: Trade side ('buy' or 'sell')
@@ -178,19 +239,16 @@ class SQLiteStorage(Persistence):
             Trade ID
         """
         if ts is None:
-            ts = datetime.now().timestamp()
+            ts = time.time()
 
-        async with aiosqlite.connect(self.db_path) as db:
-            cursor = await db.execute(
-                """
-                INSERT INTO trades (token_mint, side, qty, px, fee_usd, ts)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """,
-                (token_mint, side, qty, px, fee_usd, ts),
-            )
+        trade_id = self._next_trade_id
+        if trade_id is None:
+            trade_id = await self._seed_trade_id()
+        self._next_trade_id = trade_id + 1
+        self._trade_buffer.append((trade_id, token_mint, side, qty, px, fee_usd, ts))
 
-            trade_id = cursor.lastrowid
-            await db.commit()
+        if len(self._trade_buffer) >= self.trade_batch_size and not self._trade_holds:
+            await self.flush_trades()
 
         logger.debug(
             "Trade recorded",
@@ -210,23 +268,124 @@ class SQLiteStorage(Persistence):
 
         return trade_id
 
+    @contextlib.contextmanager
+    def hold_trades(self) -> Iterator[None]:
+        """Keep buffered trades out of the automatic flushes inside the block.
+
+        Neither the background flusher nor the batch size triggers a write
+        while the block is open, so an explicit flush_batch commits the held
+        trades in the same transaction as its positions.
+        """
+        self._trade_holds += 1
+        try:
+            yield
+        finally:
+            self._trade_holds -= 1
+
+    async def flush_trades(self) -> None:
+        """Insert all buffered trades in a single transaction."""
+        await self.flush_batch([])
+
+    async def flush_batch(
+        self,
+        positions: list[tuple[str, float, float]],
+        updated_ts: float | None = None,
+    ) -> None:
+        """Insert buffered trades and upsert positions in a single transaction.
+
+        Args:
+            positions: (token_mint, qty, avg_cost_usd) rows to upsert
+            updated_ts: Update timestamp for the positions (defaults to now)
+        """
+        if not self._trade_buffer and not positions:
+            return
+
+        if updated_ts is None:
+            updated_ts = time.time()
+
+        db = await self._get_db()
+        async with self._write_lock:
+            batch, self._trade_buffer = self._trade_buffer, []
+            try:
+                if batch:
+                    await db.executemany(
+                        """
+                        INSERT INTO trades (id, token_mint, side, qty, px, fee_usd, ts)
+                        VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                        batch,
+                    )
+                if positions:
+                    await db.executemany(
+                        """
+                        INSERT INTO positions
+                            (token_mint, qty, avg_cost_usd, updated_ts)
+                        VALUES (?, ?, ?, ?)
+                        ON CONFLICT(token_mint) DO UPDATE SET
+                            qty = excluded.qty,
+                            avg_cost_usd = excluded.avg_cost_usd,
+                            updated_ts = excluded.updated_ts
+                    """,
+                        [(*position, updated_ts) for position in positions],
+                    )
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                # Keep the trades for the next flush attempt
+                self._trade_buffer[:0] = batch
+                raise
+
+        logger.debug("Batch flushed", trades=len(batch), positions=len(positions))
+
+    async def _trade_flush_loop(self) -> None:
+        """Periodically flush buffered trades."""
+        interval = self.trade_flush_interval_ms / 1000
+        while True:
+            await asyncio.sleep(interval)
+            if self._trade_holds:
+                continue
+            try:
+                await self.flush_trades()
+            except Exception as e:
+                logger.error("Failed to flush trades", error=str(e))
+
+    async def _seed_trade_id(self) -> int:
+        """Seed the next trade ID from the trades table.
+
+        Returns:
+            Next unused trade ID
+        """
+        db = await self._get_db()
+        async with db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM trades") as cursor:
+            row = await cursor.fetchone()
+
+        # Another caller may have seeded while we were waiting
+        if self._next_trade_id is None:
+            self._next_trade_id = int(row[0]) if row is not None else 1
+        return self._next_trade_id
+
+    async def iter_positions(self) -> AsyncIterator[dict[str, Any]]:
+        """Iterate over all positions without loading them all at once.
+
+        Yields:
+            Position dictionaries, most recently updated first
+        """
+        db = await self._get_db()
+        async with db.execute("""
+            SELECT token_mint, qty, avg_cost_usd, updated_ts
+            FROM positions
+            ORDER BY updated_ts DESC
+        """) as cursor:
+            async for row in cursor:
+                yield dict(row)
+
     async def load_positions(self) -> list[dict[str, Any]]:
         """Load all positions.
 
         Returns:
             List of position dictionaries
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            db.row_factory = aiosqlite.Row
-
-            async with db.execute("""
-                SELECT token_mint, qty, avg_cost_usd, updated_ts
-                FROM positions
-                ORDER BY updated_ts DESC
-            """) as cursor:
-                rows = await cursor.fetchall()
-
-        positions = [dict(row) for row in rows]
+        positions = [position async for position in self.iter_positions()]
 
         logger.debug("Loaded positions", count=len(positions))
         return positions
@@ -240,22 +399,11 @@ class SQLiteStorage(Persistence):
         Returns:
             State value or None if not found
         """
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(
-                """
-                SELECT value FROM state WHERE key = ?
-            """,
-                (key,),
-            ) as cursor:
-                row = await cursor.fetchone()
-
-        if row:
-            value = row[0]
-            logger.debug("State loaded", key=key, value_length=len(value))
-            return value
-
-        logger.debug("State not found", key=key)
-        return None
+        value = await self._fetch_state(key)
+        if isinstance(value, bytes):
+            # Written by save_state_json as raw JSON bytes
+            value = value.decode("utf-8")
+        return value
 
     async def save_state(self, key: str, value: str) -> None:
         """Save state value by key.
@@ -264,7 +412,31 @@ class SQLiteStorage(Persistence):
             key: State key
             value: State value
         """
-        async with aiosqlite.connect(self.db_path) as db:
+        await self._store_state(key, value)
+
+    async def _fetch_state(self, key: str) -> str | bytes | None:
+        """Fetch the raw stored state value by key."""
+        db = await self._get_db()
+        async with db.execute(
+            """
+            SELECT value FROM state WHERE key = ?
+        """,
+            (key,),
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        if row:
+            value: str | bytes = row[0]
+            logger.debug("State loaded", key=key, value_length=len(value))
+            return value
+
+        logger.debug("State not found", key=key)
+        return None
+
+    async def _store_state(self, key: str, value: str | bytes) -> None:
+        """Store a raw state value by key."""
+        db = await self._get_db()
+        async with self._write_lock:
             await db.execute(
                 """
                 INSERT INTO state (key, value)
@@ -279,6 +451,33 @@ class SQLiteStorage(Persistence):
 
         logger.debug("State saved", key=key, value_length=len(value))
 
+    async def list_state_keys(self, prefix: str = "") -> list[str]:
+        """List state keys starting with a prefix.
+
+        Args:
+            prefix: Key prefix to match (empty matches all keys)
+
+        Returns:
+            Matching state keys in sorted order
+        """
+        pattern = (
+            prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            + "%"
+        )
+
+        db = await self._get_db()
+        async with db.execute(
+            """
+            SELECT key FROM state WHERE key LIKE ? ESCAPE '\\' ORDER BY key
+        """,
+            (pattern,),
+        ) as cursor:
+            rows = await cursor.fetchall()
+
+        keys = [row[0] for row in rows]
+        logger.debug("State keys listed", prefix=prefix, count=len(keys))
+        return keys
+
     async def save_state_json(self, key: str, data: Any) -> None:
         """Save JSON-serializable data as state.
 
@@ -286,8 +485,13 @@ class SQLiteStorage(Persistence):
             key: State key
             data: JSON-serializable data
         """
-        value = json.dumps(data)
-        await self.save_state(key, value)
+        # orjson output is stored as-is, skipping the decode to str
+        value: str | bytes
+        if ORJSON_AVAILABLE:
+            value = orjson.dumps(data)
+        else:
+            value = json.dumps(data)
+        await self._store_state(key, value)
 
     async def load_state_json(self, key: str) -> Any | None:
         """Load and deserialize JSON state data.
@@ -298,13 +502,15 @@ class SQLiteStorage(Persistence):
         Returns:
             Deserialized data or None if not found
         """
-        value = await self.load_state(key)
+        value = await self._fetch_state(key)
         if value is None:
             return None
 
         try:
+            if ORJSON_AVAILABLE:
+                return orjson.loads(value)
             return json.loads(value)
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             logger.error("Failed to deserialize state JSON", key=key, error=str(e))
             return None
 
@@ -322,47 +528,136 @@ class SQLiteStorage(Persistence):
         if not self.enable_parquet or not self.parquet_dir:
             return
 
-        try:
-            # Create trade data
-            trade_data = {
-                "id": [trade_id],
-                "token_mint": [token_mint],
-                "side": [side],
-                "qty": [qty],
-                "px": [px],
-                "fee_usd": [fee_usd],
-                "ts": [ts],
-                "date": [datetime.fromtimestamp(ts).date().isoformat()],
+        # A single worker thread keeps appends in order off the event loop
+        if self._parquet_executor is None:
+            self._parquet_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="parquet-writer"
+            )
+
+        await asyncio.get_running_loop().run_in_executor(
+            self._parquet_executor,
+            self._write_trade_blocking,
+            trade_id,
+            token_mint,
+            side,
+            qty,
+            px,
+            fee_usd,
+            ts,
+        )
+
+    def _write_trade_blocking(
+        self,
+        trade_id: int,
+        token_mint: str,
+        side: str,
+        qty: float,
+        px: float,
+        fee_usd: float,
+        ts: float,
+    ) -> None:
+        """Buffer a trade for Parquet on the writer thread, flushing full batches."""
+        self._parquet_buffer.append(
+            {
+                "id": trade_id,
+                "token_mint": token_mint,
+                "side": side,
+                "qty": qty,
+                "px": px,
+                "fee_usd": fee_usd,
+                "ts": ts,
+                # Partition key only; write_dataset keeps it out of the files
+                "date": self._trade_date(ts),
             }
+        )
 
-            # Create PyArrow table
-            table = pa.table(trade_data)
-
-            # Determine file path (partition by date)
-            date_str = datetime.fromtimestamp(ts).date().isoformat()
-            parquet_file = self.parquet_dir / f"trades_{date_str}.parquet"
-
-            # Append to existing file or create new one
-            if parquet_file.exists():
-                # Read existing data and append
-                existing_table = pq.read_table(str(parquet_file))
-                combined_table = pa.concat_tables([existing_table, table])
-                pq.write_table(combined_table, str(parquet_file))
-            else:
-                # Create new file
-                pq.write_table(table, str(parquet_file))
-
-            logger.debug(
-                "Trade written to Parquet", trade_id=trade_id, file=str(parquet_file)
+        if len(self._parquet_buffer) >= self.parquet_batch_size:
+            self._flush_parquet_blocking()
+
+    def _trade_date(self, ts: float) -> str:
+        """Get the local trade date for a timestamp, formatted once per day."""
+        day_start, day_end, date_str = self._parquet_day
+        if not day_start <= ts < day_end:
+            lt = time.localtime(ts)
+            date_str = time.strftime("%Y-%m-%d", lt)
+            day_start = time.mktime(
+                (lt.tm_year, lt.tm_mon, lt.tm_mday, 0, 0, 0, 0, 0, -1)
             )
+            day_end = time.mktime(
+                (lt.tm_year, lt.tm_mon, lt.tm_mday + 1, 0, 0, 0, 0, 0, -1)
+            )
+            self._parquet_day = (day_start, day_end, date_str)
+
+        return date_str
+
+    def _flush_parquet_blocking(self) -> None:
+        """Write buffered trades as new files under date=YYYY-MM-DD partitions.
+
+        Every flush adds new files, so earlier data is never read back or
+        rewritten.
+        """
+        if not self._parquet_buffer:
+            return
+
+        rows, self._parquet_buffer = self._parquet_buffer, []
+        try:
+            table = pa.Table.from_pylist(rows, schema=self._trade_schema)
+            ds.write_dataset(
+                table,
+                base_dir=str(self.parquet_dir),
+                format="parquet",
+                partitioning=ds.partitioning(
+                    pa.schema([("date", pa.string())]), flavor="hive"
+                ),
+                basename_template=f"trades-{uuid.uuid4().hex}-{{i}}.parquet",
+                existing_data_behavior="overwrite_or_ignore",
+            )
+
+            logger.debug("Trades written to Parquet", count=len(rows))
 
         except Exception as e:
             logger.error(
-                "Failed to write trade to Parquet", trade_id=trade_id, error=str(e)
+                "Failed to write trades to Parquet", count=len(rows), error=str(e)
             )
 
+    async def _get_db(self) -> aiosqlite.Connection:
+        """Get the shared database connection, opening it on first use."""
+        if self._db is None:
+            async with self._connect_lock:
+                if self._db is None:
+                    db = await aiosqlite.connect(self.db_path)
+                    db.row_factory = aiosqlite.Row
+                    await db.execute("PRAGMA journal_mode = WAL")
+                    await db.execute("PRAGMA synchronous = NORMAL")
+                    await db.execute("PRAGMA foreign_keys = ON")
+                    await db.execute("PRAGMA cache_size = -64000")
+                    await db.execute("PRAGMA mmap_size = 268435456")
+                    self._db = db
+
+        return self._db
+
     async def close(self) -> None:
-        """Close storage (cleanup if needed)."""
+        """Flush buffered trades and close the database connection."""
+        if self._trade_flush_task is not None:
+            self._trade_flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._trade_flush_task
+            self._trade_flush_task = None
+
+        await self.flush_trades()
+
+        if self._parquet_executor is not None:
+            # Runs after any pending appends on the same worker
+            await asyncio.get_running_loop().run_in_executor(
+                self._parquet_executor, self._flush_parquet_blocking
+            )
+            self._parquet_executor.shutdown()
+            self._parquet_executor = None
+
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
         logger.info("Storage closed")
 
     async def __aenter__(self):
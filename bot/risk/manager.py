@@ -1,7 +1,9 @@
 """Risk management implementation."""
 
+import heapq
 import time
 from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime
 
 import structlog
@@ -11,10 +13,77 @@ from ..core.types import TokenSnapshot
 
 logger = structlog.get_logger(__name__)
 
+# Market minimums every buy must meet regardless of risk state
+MIN_LIQUIDITY_USD = 1000.0
+MIN_VOLUME_5M_USD = 100.0
+
+
+def meets_market_minimums(snap: TokenSnapshot) -> bool:
+    """Check the stateless market minimums enforced by allow_buy.
+
+    Cheap enough to run over a whole batch of snapshots before any
+    per-token work is scheduled.
+
+    Args:
+        snap: Token snapshot with market data
+
+    Returns:
+        True if liquidity, volume and price are all acceptable
+    """
+    return (
+        snap.liq_usd >= MIN_LIQUIDITY_USD
+        and snap.vol_5m_usd >= MIN_VOLUME_5M_USD
+        and snap.price_usd > 0
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class PositionInfo:
+    """Read-only view of an open position tracked by the risk manager.
+
+    Use ``dataclasses.asdict`` where a plain dict is needed.
+    """
+
+    token_mint: str
+    size_usd: float
+    opened_at: float
+
+
+@dataclass(slots=True)
+class TokenRiskState:
+    """Per-token risk state: cooldown start and open position, if any.
+
+    Attributes:
+        cooldown_ts: Timestamp the token's cooldown started (0 if none)
+        size_usd: Open position size in USD
+        active: Whether a position in the token is open
+    """
+
+    cooldown_ts: float = 0.0
+    size_usd: float = 0.0
+    active: bool = False
+
 
 class RiskManagerImpl(RiskManager):
     """Risk manager implementation with in-memory state."""
 
+    __slots__ = (
+        "position_size_usd",
+        "daily_max_loss_usd",
+        "cooldown_seconds",
+        "max_concurrent_positions",
+        "_now_fn",
+        "_daily_pnl",
+        "_daily_start_time",
+        "_next_day_start",
+        "_day_start_iso",
+        "_tokens",
+        "_active_count",
+        "_cooldown_heap",
+        "_in_flight",
+        "_in_flight_usd",
+    )
+
     def __init__(
         self,
         position_size_usd: float,
@@ -42,30 +111,87 @@ class RiskManagerImpl(RiskManager):
 
         # In-memory state
         self._daily_pnl = 0.0
-        self._daily_start_time = self._get_day_start()
-        self._token_cooldowns: dict[str, float] = {}
-        self._active_positions: set[str] = set()
-        self._position_sizes: dict[str, float] = {}
-
-    def _get_day_start(self) -> float:
-        """Get the start of the current day as timestamp."""
-        now = datetime.fromtimestamp(self._now_fn())
-        day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        return day_start.timestamp()
-
-    def _reset_daily_if_needed(self) -> None:
-        """Reset daily tracking if a new day has started."""
-        current_day_start = self._get_day_start()
-        if current_day_start > self._daily_start_time:
-            logger.info(
-                "New trading day started, resetting daily P&L",
-                previous_pnl=self._daily_pnl,
-                new_day_start=datetime.fromtimestamp(current_day_start).date(),
-            )
-            self._daily_pnl = 0.0
-            self._daily_start_time = current_day_start
-            # Also reset cooldowns for new day
-            self._token_cooldowns.clear()
+        self._daily_start_time, self._next_day_start = self._get_day_bounds(
+            self._now_fn()
+        )
+        # Formatted once per day for state summaries
+        self._day_start_iso = datetime.fromtimestamp(self._daily_start_time).isoformat()
+        # Cooldown and position state per token, so each check is one lookup
+        self._tokens: dict[str, TokenRiskState] = {}
+        self._active_count = 0
+        # (cooldown expiry, mint) min-heap used to drop expired idle records
+        self._cooldown_heap: list[tuple[float, str]] = []
+        # Sizes of buys reserved but not yet settled; each holds a position slot
+        self._in_flight: dict[str, float] = {}
+        self._in_flight_usd = 0.0
+
+    @staticmethod
+    def _get_day_bounds(now: float) -> tuple[float, float]:
+        """Get the start of the local day containing now and of the next day."""
+        lt = time.localtime(now)
+        day_start = time.mktime((lt.tm_year, lt.tm_mon, lt.tm_mday, 0, 0, 0, 0, 0, -1))
+        next_day_start = time.mktime(
+            (lt.tm_year, lt.tm_mon, lt.tm_mday + 1, 0, 0, 0, 0, 0, -1)
+        )
+        return day_start, next_day_start
+
+    def _reset_daily_if_needed(self, now: float | None = None) -> None:
+        """Reset daily tracking if a new day has started.
+
+        Args:
+            now: Current timestamp (defaults to now_fn())
+        """
+        if now is None:
+            now = self._now_fn()
+        if now < self._next_day_start:
+            return
+
+        current_day_start, self._next_day_start = self._get_day_bounds(now)
+        day_start = datetime.fromtimestamp(current_day_start)
+        logger.info(
+            "New trading day started, resetting daily P&L",
+            previous_pnl=self._daily_pnl,
+            new_day_start=day_start.date(),
+        )
+        self._daily_pnl = 0.0
+        self._daily_start_time = current_day_start
+        self._day_start_iso = day_start.isoformat()
+        # Also reset cooldowns for new day, keeping only open positions
+        self._tokens = {
+            mint: state for mint, state in self._tokens.items() if state.active
+        }
+        for state in self._tokens.values():
+            state.cooldown_ts = 0.0
+        self._cooldown_heap.clear()
+
+    def begin_cycle(self, now: float) -> None:
+        """Run per-cycle housekeeping once before a batch of risk checks.
+
+        Rolls the trading day over and drops expired cooldown records, so
+        checks that are then given the same ``now`` can skip both.
+
+        Args:
+            now: Timestamp for the cycle
+        """
+        self._reset_daily_if_needed(now)
+        self._purge_expired_cooldowns(now)
+
+    def _purge_expired_cooldowns(self, now: float) -> None:
+        """Drop records of tokens with no open position and an expired cooldown.
+
+        Args:
+            now: Current timestamp
+        """
+        heap = self._cooldown_heap
+        while heap and heap[0][0] <= now:
+            _, token_mint = heapq.heappop(heap)
+            state = self._tokens.get(token_mint)
+            if (
+                state is not None
+                and not state.active
+                and state.cooldown_ts + self.cooldown_seconds <= now
+            ):
+                del self._tokens[token_mint]
 
     @property
     def daily_pnl(self) -> float:
@@ -76,24 +202,32 @@ class RiskManagerImpl(RiskManager):
     @property
     def remaining_daily_budget(self) -> float:
         """Get remaining daily loss budget."""
-        return self.daily_max_loss_usd + self.daily_pnl
+        self._reset_daily_if_needed()
+        return self._remaining_budget()
+
+    def _remaining_budget(self) -> float:
+        """Get remaining daily loss budget, assuming the daily reset already ran."""
+        return self.daily_max_loss_usd + self._daily_pnl
 
-    def size_usd(self, snap: TokenSnapshot) -> float:
+    def size_usd(self, snap: TokenSnapshot, now: float | None = None) -> float:
         """Calculate position size in USD for a token.
 
         Args:
             snap: Token snapshot with market data
+            now: Timestamp already passed to begin_cycle (defaults to now_fn(),
+                running the begin_cycle housekeeping inline)
 
         Returns:
             Position size in USD, capped by position_size_usd and daily budget
         """
-        self._reset_daily_if_needed()
+        if now is None:
+            self._reset_daily_if_needed()
 
         # Base position size
         size = self.position_size_usd
 
         # Cap by remaining daily budget
-        remaining_budget = self.remaining_daily_budget
+        remaining_budget = self._remaining_budget()
         if remaining_budget <= 0:
             logger.warning(
                 "Daily loss limit reached, no new positions allowed",
@@ -118,53 +252,95 @@ class RiskManagerImpl(RiskManager):
 
         return max(0.0, size)
 
-    def allow_buy(self, snap: TokenSnapshot) -> tuple[bool, list[str]]:
+    def can_buy(self, snap: TokenSnapshot, now: float | None = None) -> bool:
+        """Check if buying is allowed, stopping at the first failed check.
+
+        Applies the same rules as allow_buy without building or logging
+        reasons, for callers that only need the verdict.
+
+        Args:
+            snap: Token snapshot with market data
+            now: Timestamp already passed to begin_cycle (defaults to now_fn(),
+                running the begin_cycle housekeeping inline)
+
+        Returns:
+            True if a buy is allowed
+        """
+        if now is None:
+            now = self._now_fn()
+            self.begin_cycle(now)
+
+        if not meets_market_minimums(snap):
+            return False
+        if self._remaining_budget() <= 0:
+            return False
+        if self._active_count + len(self._in_flight) >= self.max_concurrent_positions:
+            return False
+        if snap.token.mint in self._in_flight:
+            return False
+
+        state = self._tokens.get(snap.token.mint)
+        if state is None:
+            return now >= self.cooldown_seconds
+        return (
+            not state.active
+            and now - state.cooldown_ts >= self.cooldown_seconds
+        )
+
+    def allow_buy(
+        self, snap: TokenSnapshot, now: float | None = None
+    ) -> tuple[bool, list[str]]:
         """Check if buying is allowed and return reasons.
 
         Args:
             snap: Token snapshot with market data
+            now: Timestamp already passed to begin_cycle (defaults to now_fn(),
+                running the begin_cycle housekeeping inline)
 
         Returns:
             Tuple of (allowed, list of reasons)
         """
-        self._reset_daily_if_needed()
+        if now is None:
+            now = self._now_fn()
+            self.begin_cycle(now)
 
         reasons = []
         allowed = True
 
         # Check daily loss limit
-        if self.remaining_daily_budget <= 0:
+        if self._remaining_budget() <= 0:
             reasons.append("Daily loss limit exceeded")
             allowed = False
 
         # Check cooldown
         token_mint = snap.token.mint
-        current_time = self._now_fn()
-        last_trade_time = self._token_cooldowns.get(token_mint, 0)
+        state = self._tokens.get(token_mint)
+        last_trade_time = state.cooldown_ts if state is not None else 0
 
-        if current_time - last_trade_time < self.cooldown_seconds:
-            remaining_cooldown = self.cooldown_seconds - (
-                current_time - last_trade_time
-            )
+        if now - last_trade_time < self.cooldown_seconds:
+            remaining_cooldown = self.cooldown_seconds - (now - last_trade_time)
             reasons.append(f"Token in cooldown ({remaining_cooldown:.1f}s remaining)")
             allowed = False
 
-        # Check concurrent positions limit
-        if len(self._active_positions) >= self.max_concurrent_positions:
+        # Check concurrent positions limit, counting buys still in flight
+        if self._active_count + len(self._in_flight) >= self.max_concurrent_positions:
             reasons.append("Maximum concurrent positions reached")
             allowed = False
 
         # Check if already have position in this token
-        if token_mint in self._active_positions:
+        if state is not None and state.active:
             reasons.append("Already have position in this token")
             allowed = False
+        elif token_mint in self._in_flight:
+            reasons.append("Buy already in flight for this token")
+            allowed = False
 
         # Additional risk checks
-        if snap.liq_usd < 1000:  # Minimum liquidity requirement
+        if snap.liq_usd < MIN_LIQUIDITY_USD:
             reasons.append("Insufficient liquidity")
             allowed = False
 
-        if snap.vol_5m_usd < 100:  # Minimum volume requirement
+        if snap.vol_5m_usd < MIN_VOLUME_5M_USD:
             reasons.append("Insufficient trading volume")
             allowed = False
 
@@ -178,18 +354,21 @@ class RiskManagerImpl(RiskManager):
                 token_mint=token_mint,
                 reasons=reasons,
                 daily_pnl=self._daily_pnl,
-                active_positions=len(self._active_positions),
+                active_positions=self._active_count,
             )
 
         return allowed, reasons
 
-    def after_fill(self, pnl_usd: float) -> None:
+    def after_fill(self, pnl_usd: float, now: float | None = None) -> None:
         """Update risk state after trade fill.
 
         Args:
             pnl_usd: P&L from the trade (positive for profit, negative for loss)
+            now: Timestamp already passed to begin_cycle (defaults to now_fn(),
+                running the daily reset check inline)
         """
-        self._reset_daily_if_needed()
+        if now is None:
+            self._reset_daily_if_needed()
 
         old_pnl = self._daily_pnl
         self._daily_pnl += pnl_usd
@@ -199,7 +378,7 @@ class RiskManagerImpl(RiskManager):
             trade_pnl=pnl_usd,
             old_daily_pnl=old_pnl,
             new_daily_pnl=self._daily_pnl,
-            remaining_budget=self.remaining_daily_budget,
+            remaining_budget=self._remaining_budget(),
         )
 
     def record_position(self, token_mint: str, size_usd: float) -> None:
@@ -209,23 +388,58 @@ class RiskManagerImpl(RiskManager):
             token_mint: Token mint address
             size_usd: Position size in USD
         """
-        self._active_positions.add(token_mint)
-        self._position_sizes[token_mint] = size_usd
+        state = self._tokens.get(token_mint)
+        if state is None:
+            state = self._tokens[token_mint] = TokenRiskState()
+        if not state.active:
+            state.active = True
+            self._active_count += 1
+        state.size_usd = size_usd
 
         logger.info(
             "Recorded new position",
             token_mint=token_mint,
             size_usd=size_usd,
-            active_positions=len(self._active_positions),
+            active_positions=self._active_count,
         )
 
-    def set_cooldown(self, token_mint: str) -> None:
+    def reserve(self, token_mint: str, size_usd: float) -> None:
+        """Hold a position slot for a buy until it settles.
+
+        Call right after can_buy and size_usd, before awaiting the order, so
+        that tokens processed concurrently see the slot in their checks.
+
+        Args:
+            token_mint: Token mint address
+            size_usd: Size of the pending buy in USD
+        """
+        self._in_flight_usd += size_usd - self._in_flight.get(token_mint, 0.0)
+        self._in_flight[token_mint] = size_usd
+
+    def release(self, token_mint: str) -> None:
+        """Free the slot held by reserve once the buy has settled.
+
+        Args:
+            token_mint: Token mint address
+        """
+        size_usd = self._in_flight.pop(token_mint, None)
+        if size_usd is not None:
+            self._in_flight_usd -= size_usd
+
+    def set_cooldown(self, token_mint: str, now: float | None = None) -> None:
         """Set cooldown for a token.
 
         Args:
             token_mint: Token mint address
+            now: Current timestamp (defaults to now_fn())
         """
-        self._token_cooldowns[token_mint] = self._now_fn()
+        state = self._tokens.get(token_mint)
+        if state is None:
+            state = self._tokens[token_mint] = TokenRiskState()
+        state.cooldown_ts = self._now_fn() if now is None else now
+        heapq.heappush(
+            self._cooldown_heap, (state.cooldown_ts + self.cooldown_seconds, token_mint)
+        )
         logger.info("Set cooldown for token", token_mint=token_mint)
 
     def close_position(self, token_mint: str) -> None:
@@ -234,33 +448,37 @@ class RiskManagerImpl(RiskManager):
         Args:
             token_mint: Token mint address
         """
-        if token_mint in self._active_positions:
-            self._active_positions.remove(token_mint)
-            self._position_sizes.pop(token_mint, None)
+        state = self._tokens.get(token_mint)
+        if state is not None and state.active:
+            state.active = False
+            state.size_usd = 0.0
+            self._active_count -= 1
+            # Let the record be purged once its cooldown has run out
+            heapq.heappush(
+                self._cooldown_heap,
+                (state.cooldown_ts + self.cooldown_seconds, token_mint),
+            )
 
             logger.info(
                 "Closed position",
                 token_mint=token_mint,
-                active_positions=len(self._active_positions),
+                active_positions=self._active_count,
             )
 
-    def get_position_info(self, token_mint: str) -> dict | None:
+    def get_position_info(self, token_mint: str) -> PositionInfo | None:
         """Get information about a position.
 
         Args:
             token_mint: Token mint address
 
         Returns:
-            Position info dict or None if not found
+            Position info or None if not found
         """
-        if token_mint not in self._active_positions:
+        state = self._tokens.get(token_mint)
+        if state is None or not state.active:
             return None
 
-        return {
-            "token_mint": token_mint,
-            "size_usd": self._position_sizes.get(token_mint, 0.0),
-            "opened_at": self._token_cooldowns.get(token_mint, 0),
-        }
+        return PositionInfo(token_mint, state.size_usd, state.cooldown_ts)
 
     def get_state_summary(self) -> dict:
         """Get current risk manager state summary.
@@ -272,11 +490,13 @@ class RiskManagerImpl(RiskManager):
 
         return {
             "daily_pnl": self._daily_pnl,
-            "remaining_daily_budget": self.remaining_daily_budget,
-            "active_positions": len(self._active_positions),
+            "remaining_daily_budget": self._remaining_budget(),
+            "active_positions": self._active_count,
+            "in_flight_buys": len(self._in_flight),
+            "in_flight_usd": self._in_flight_usd,
             "max_concurrent_positions": self.max_concurrent_positions,
             "position_size_usd": self.position_size_usd,
             "daily_max_loss_usd": self.daily_max_loss_usd,
             "cooldown_seconds": self.cooldown_seconds,
-            "day_start": datetime.fromtimestamp(self._daily_start_time).isoformat(),
+            "day_start": self._day_start_iso,
         }
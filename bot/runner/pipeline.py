@@ -4,15 +4,20 @@ import argparse
 import asyncio
 import signal
 import sys
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
+import httpx
 import structlog
 
 from ..alerts.telegram import TelegramAlertSink
 from ..config.settings import AppSettings, load_settings
 from ..core.interfaces import (
     AlertSink,
+    MarketDataSource,
 )
 from ..core.types import TokenSnapshot
 from ..data.jupiter import JupiterDataSource
@@ -23,10 +28,46 @@ from ..exec.signers import ExternalSigner, KeypairSigner
 from ..filters.basic import BasicFilter
 from ..filters.rug_heuristics import RugHeuristicsFilter
 from ..persist.storage import SQLiteStorage
-from ..risk.manager import RiskManagerImpl
+from ..risk.manager import RiskManagerImpl, meets_market_minimums
+
+# Serialize JSON log lines with orjson when it is installed
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+# Use uvloop's libuv-based event loop when it is installed
+try:
+    import uvloop
+
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+    uvloop = None
 
 logger = structlog.get_logger(__name__)
 
+# Maximum number of token mints with a remembered filter verdict
+_FILTER_CACHE_SIZE = 4096
+
+# Telegram alert sent for every executed buy
+_TRADE_ALERT_TEMPLATE = (
+    "🟢 <b>Trade Executed</b>\n\n"
+    "Token: <code>{mint_prefix}...</code>\n"
+    "Amount: ${amount:.2f}\n"
+    "Quantity: {qty:.6f}\n"
+    "Price: ${price:.6f}\n"
+    "Fee: ${fee:.2f}\n"
+    "Trade ID: {trade_id}"
+)
+
+# Trade alerts combined into one Telegram message at the end of a cycle;
+# 20 alerts stay well under Telegram's 4096 character message limit
+_ALERT_BATCH_SIZE = 20
+
 
 class NoopAlertSink(AlertSink):
     """No-operation alert sink for when Telegram is not configured."""
@@ -43,12 +84,35 @@ class TradingPipeline:
         """Initialize trading pipeline with assembled components."""
         self.settings = settings
         self.running = False
+        # Set by stop() to wake run_forever out of its between-cycle wait
+        self._stop_event = asyncio.Event()
+        # Teardown in stop() runs once; later callers wait for it on the lock
+        self._stop_lock = asyncio.Lock()
+        self._stopped = False
+
+        # Timestamp taken once at the start of each cycle and shared by all tokens
+        self._cycle_now: float | None = None
+
+        # Last filter verdict per token mint, reused while the snapshot is unchanged
+        self._filter_cache: OrderedDict[str, tuple[datetime, bool]] = OrderedDict()
+
+        # Position updates collected during a cycle, written in one transaction
+        self._pending_positions: list[tuple[str, float, float]] = []
+
+        # Trade alerts collected during a cycle, sent in batches after the flush
+        self._pending_alerts: list[str] = []
+
+        # Bounds how many tokens go through the execution path at once
+        self._token_semaphore = asyncio.Semaphore(
+            getattr(settings, "max_parallel_tokens", 8)
+        )
 
         # Validate safety settings before assembly
         if not settings.dry_run:
             self._validate_live_trading_safety(settings)
 
         self.components = self._assemble(settings)
+        self._bind_components()
 
         logger.info(
             "Trading pipeline initialized",
@@ -113,16 +177,31 @@ class TradingPipeline:
         Returns:
             Dictionary of assembled components
         """
-        components = {}
-
-        # Jupiter data source manages its own HTTP client
+        components: dict[str, Any] = {}
+
+        # One pooled HTTP/2 client shared by every component that makes HTTP
+        # calls, so connections and TLS sessions are reused across them. The
+        # 30 s default matches RpcSender and JupiterExecutor; JupiterDataSource
+        # and TelegramAlertSink apply their own shorter per-request timeouts.
+        http_client = httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=64,
+                keepalive_expiry=120.0,
+            ),
+        )
+        components["http_client"] = http_client
 
         # Data sources - only Jupiter
         data_sources = []
 
         # Add Jupiter data source (no API key required)
         data_sources.append(
-            JupiterDataSource(base_url="https://lite-api.jup.ag", limit=10)
+            JupiterDataSource(
+                base_url="https://lite-api.jup.ag", limit=10, session=http_client
+            )
         )
         logger.info("Added Jupiter data source")
 
@@ -149,7 +228,7 @@ class TradingPipeline:
         else:
             # Live trading - need signer and sender
             signer = self._create_signer(settings)
-            sender = RpcSender(rpc_url=settings.rpc_url)
+            sender = RpcSender(rpc_url=settings.rpc_url, client=http_client)
 
             components["exec_client"] = JupiterExecutor(
                 base_url=settings.jupiter_base,
@@ -160,6 +239,7 @@ class TradingPipeline:
                 jito_tip_lamports=settings.jito_tip_lamports,
                 signer=signer,
                 sender=sender,
+                session=http_client,
                 enable_preflight=settings.preflight_simulate,
                 tip_account_b58=settings.tip_account_b58,
             )
@@ -180,6 +260,7 @@ class TradingPipeline:
             components["alerts"] = TelegramAlertSink(
                 bot_token=settings.telegram_bot_token,
                 admin_user_ids=settings.telegram_admin_ids,
+                session=http_client,
             )
             logger.info("Using Telegram alert sink")
         else:
@@ -243,51 +324,154 @@ class TradingPipeline:
             "Configure one of: keypair_path_enc, solana_sk_b58, keypair_path_json, or external_signer_command"
         )
 
+    def _bind_components(self) -> None:
+        """Bind the components used per token to attributes for the cycle.
+
+        Rebound at the start of every cycle so replacing an entry in
+        ``self.components`` still takes effect.
+        """
+        components = self.components
+        # Cheapest filters first so most rejections skip the expensive ones;
+        # evaluate is bound once here rather than looked up per snapshot.
+        # Verbose filters are run per snapshot so their reasons get logged.
+        self._filter_fns = tuple(
+            (
+                type(f).__name__,
+                f.evaluate,
+                None
+                if getattr(f, "verbose", False)
+                else getattr(f, "evaluate_batch", None),
+            )
+            for f in sorted(
+                components["filters"], key=lambda f: getattr(f, "cost", 0)
+            )
+        )
+        self._risk = components["risk"]
+        self._exec_client = components["exec_client"]
+        self._storage = components["storage"]
+        self._alerts = components["alerts"]
+
     async def run_once(self) -> None:
         """Execute one trading cycle."""
+        self._cycle_now = time.time()
+        self._bind_components()
+        self._risk.begin_cycle(self._cycle_now)
         try:
-            # Poll all data sources
+            # Poll all data sources concurrently
+            results = await asyncio.gather(
+                *(
+                    self._safe_poll(data_source)
+                    for data_source in self.components["data_sources"]
+                )
+            )
             all_snapshots = []
-            for data_source in self.components["data_sources"]:
-                try:
-                    snapshots = await data_source.poll()
-                    all_snapshots.extend(snapshots)
-                    logger.debug(
-                        "Polled data source",
-                        source=type(data_source).__name__,
-                        count=len(snapshots),
-                    )
-                except Exception as e:
-                    logger.error(
-                        "Failed to poll data source",
-                        source=type(data_source).__name__,
-                        error=str(e),
-                    )
+            for snapshots in results:
+                all_snapshots.extend(snapshots)
 
             if not all_snapshots:
                 logger.debug("No snapshots received from data sources")
                 return
 
             # Merge snapshots by token mint (keep latest for each token)
-            token_snapshots = {}
+            token_snapshots: dict[str, TokenSnapshot] = {}
             for snapshot in all_snapshots:
                 token_mint = snapshot.token.mint
-                if (
-                    token_mint not in token_snapshots
-                    or snapshot.ts > token_snapshots[token_mint].ts
-                ):
+                existing = token_snapshots.get(token_mint)
+                if existing is None or snapshot.ts > existing.ts:
                     token_snapshots[token_mint] = snapshot
 
             logger.debug("Merged snapshots", unique_tokens=len(token_snapshots))
 
-            # Process each token
-            for _token_mint, snapshot in token_snapshots.items():
-                await self._process_token(snapshot)
+            # Drop tokens the risk manager would reject on market data alone
+            # before scheduling any per-token work for them
+            candidates = [
+                snapshot
+                for snapshot in token_snapshots.values()
+                if meets_market_minimums(snapshot)
+            ]
+            if len(candidates) < len(token_snapshots):
+                logger.debug(
+                    "Skipped tokens below market minimums",
+                    skipped=len(token_snapshots) - len(candidates),
+                )
+
+            candidates = self._filter_candidates(candidates)
+
+            # Hold the cycle's trades back from the storage's automatic flushes
+            # so they are written in one transaction with the position updates
+            with self._storage.hold_trades():
+                # Process tokens concurrently, bounded by max_parallel_tokens
+                await asyncio.gather(
+                    *(
+                        self._process_token_bounded(snapshot)
+                        for snapshot in candidates
+                    )
+                )
+
+                # Write the cycle's trades and position updates together, then
+                # send the cycle's trade alerts even if the write failed
+                try:
+                    await self._flush_pending_writes()
+                finally:
+                    await self._flush_pending_alerts()
 
         except Exception as e:
             logger.error("Error in trading cycle", error=str(e))
             await self.components["alerts"].push(f"🚨 Trading cycle error: {str(e)}")
 
+    async def _flush_pending_writes(self) -> None:
+        """Write the trades and position updates queued during the cycle."""
+        positions, self._pending_positions = self._pending_positions, []
+        try:
+            await self._storage.flush_batch(positions)
+        except Exception:
+            # Keep the updates for the next cycle's flush
+            self._pending_positions[:0] = positions
+            raise
+
+    async def _flush_pending_alerts(self) -> None:
+        """Send the trade alerts queued during the cycle in combined messages."""
+        alerts, self._pending_alerts = self._pending_alerts, []
+        for start in range(0, len(alerts), _ALERT_BATCH_SIZE):
+            await self._alerts.push(
+                "\n\n".join(alerts[start : start + _ALERT_BATCH_SIZE])
+            )
+
+    async def _safe_poll(self, data_source: MarketDataSource) -> list[TokenSnapshot]:
+        """Poll a data source, returning no snapshots if it fails.
+
+        Args:
+            data_source: Data source to poll
+
+        Returns:
+            Snapshots from the data source, or an empty list on error
+        """
+        try:
+            snapshots = await data_source.poll()
+        except Exception as e:
+            logger.error(
+                "Failed to poll data source",
+                source=type(data_source).__name__,
+                error=str(e),
+            )
+            return []
+
+        logger.debug(
+            "Polled data source",
+            source=type(data_source).__name__,
+            count=len(snapshots),
+        )
+        return snapshots
+
+    async def _process_token_bounded(self, snapshot: TokenSnapshot) -> None:
+        """Process a token snapshot once a concurrency slot is free.
+
+        Args:
+            snapshot: Token snapshot to process
+        """
+        async with self._token_semaphore:
+            await self._process_token(snapshot)
+
     async def _process_token(self, snapshot: TokenSnapshot) -> None:
         """Process a single token snapshot through the pipeline.
 
@@ -295,18 +479,6 @@ class TradingPipeline:
             snapshot: Token snapshot to process
         """
         try:
-            # Apply filters
-            for filter_obj in self.components["filters"]:
-                decision = filter_obj.evaluate(snapshot)
-                if not decision.accepted:
-                    logger.debug(
-                        "Token filtered out",
-                        token_mint=snapshot.token.mint,
-                        filter=type(filter_obj).__name__,
-                        reasons=decision.reasons,
-                    )
-                    return
-
             logger.info(
                 "Token passed all filters",
                 token_mint=snapshot.token.mint,
@@ -314,46 +486,51 @@ class TradingPipeline:
                 liq_usd=snapshot.liq_usd,
             )
 
-            # Check risk management
-            risk_manager = self.components["risk"]
-            allowed, reasons = risk_manager.allow_buy(snapshot)
-            if not allowed:
-                logger.info(
-                    "Token rejected by risk manager",
-                    token_mint=snapshot.token.mint,
-                    reasons=reasons,
+            # Check risk management. Everything from the check up to reserve()
+            # must stay free of awaits, so a token processed concurrently sees
+            # this token's in-flight slot before it runs its own check.
+            risk_manager = self._risk
+            if not risk_manager.can_buy(snapshot, now=self._cycle_now):
+                logger.debug(
+                    "Token rejected by risk manager", token_mint=snapshot.token.mint
                 )
                 return
 
             # Calculate position size
-            position_size = risk_manager.size_usd(snapshot)
+            position_size = risk_manager.size_usd(snapshot, now=self._cycle_now)
             if position_size <= 0:
                 logger.debug("Zero position size", token_mint=snapshot.token.mint)
                 return
 
+            # Hold a position slot until the buy settles
+            risk_manager.reserve(snapshot.token.mint, position_size)
+
             logger.info(
                 "Token approved for trading",
                 token_mint=snapshot.token.mint,
                 position_size_usd=position_size,
             )
 
-            # Simulate trade first
-            exec_client = self.components["exec_client"]
-            simulation = await exec_client.simulate(snapshot, position_size)
+            try:
+                # Simulate trade first
+                exec_client = self._exec_client
+                simulation = await exec_client.simulate(snapshot, position_size)
 
-            logger.info(
-                "Trade simulation completed",
-                token_mint=snapshot.token.mint,
-                input_amount=position_size,
-                output_amount=simulation.get("qty_base", 0),
-                price_impact=simulation.get("price_impact_pct", 0),
-            )
+                logger.info(
+                    "Trade simulation completed",
+                    token_mint=snapshot.token.mint,
+                    input_amount=position_size,
+                    output_amount=simulation.get("qty_base", 0),
+                    price_impact=simulation.get("price_impact_pct", 0),
+                )
 
-            # Execute trade
-            trade_result = await exec_client.buy(snapshot, position_size)
+                # Execute trade
+                trade_result = await exec_client.buy(snapshot, position_size)
+            finally:
+                risk_manager.release(snapshot.token.mint)
 
             # Record trade
-            storage = self.components["storage"]
+            storage = self._storage
             trade_id = await storage.record_trade(
                 token_mint=snapshot.token.mint,
                 side="buy",
@@ -362,27 +539,28 @@ class TradingPipeline:
                 fee_usd=trade_result["fee_usd"],
             )
 
-            # Update position
-            await storage.upsert_position(
-                token_mint=snapshot.token.mint,
-                qty=trade_result["qty_base"],
-                avg_cost_usd=trade_result["price_exec"],
+            # Queue the position update for the end-of-cycle flush
+            self._pending_positions.append(
+                (
+                    snapshot.token.mint,
+                    trade_result["qty_base"],
+                    trade_result["price_exec"],
+                )
             )
 
-            # Send alert
-            alert_msg = (
-                f"🟢 <b>Trade Executed</b>\n\n"
-                f"Token: <code>{snapshot.token.mint[:8]}...</code>\n"
-                f"Amount: ${position_size:.2f}\n"
-                f"Quantity: {trade_result['qty_base']:.6f}\n"
-                f"Price: ${trade_result['price_exec']:.6f}\n"
-                f"Fee: ${trade_result['fee_usd']:.2f}\n"
-                f"Trade ID: {trade_id}"
+            # Queue the alert for the end-of-cycle batch
+            alert_msg = _TRADE_ALERT_TEMPLATE.format(
+                mint_prefix=snapshot.token.mint[:8],
+                amount=position_size,
+                qty=trade_result["qty_base"],
+                price=trade_result["price_exec"],
+                fee=trade_result["fee_usd"],
+                trade_id=trade_id,
             )
-            await self.components["alerts"].push(alert_msg)
+            self._pending_alerts.append(alert_msg)
 
-            # Update risk state
-            risk_manager.after_fill(0.0)  # PnL will be calculated later
+            # Update risk state; PnL will be calculated later
+            risk_manager.after_fill(0.0, now=self._cycle_now)
 
             logger.info(
                 "Trade completed successfully",
@@ -395,37 +573,107 @@ class TradingPipeline:
                 "Error processing token", token_mint=snapshot.token.mint, error=str(e)
             )
 
+    def _filter_candidates(self, snapshots: list[TokenSnapshot]) -> list[TokenSnapshot]:
+        """Run the filters over a cycle's snapshots, reusing cached verdicts.
+
+        Snapshots unchanged since their last verdict reuse it. The rest go
+        through each filter in cost order, in a single call for filters
+        that provide ``evaluate_batch``.
+
+        Args:
+            snapshots: Token snapshots to check
+
+        Returns:
+            Snapshots that passed all filters, in input order
+        """
+        cache = self._filter_cache
+        verdicts: dict[str, bool] = {}
+        pending: list[TokenSnapshot] = []
+        for snapshot in snapshots:
+            token_mint = snapshot.token.mint
+            cached = cache.get(token_mint)
+            if cached is not None and cached[0] == snapshot.ts:
+                cache.move_to_end(token_mint)
+                verdicts[token_mint] = cached[1]
+            else:
+                pending.append(snapshot)
+
+        for filter_name, evaluate, evaluate_batch in self._filter_fns:
+            if not pending:
+                break
+            if evaluate_batch is not None:
+                results = [(passed, None) for passed in evaluate_batch(pending)]
+            else:
+                results = [
+                    (decision.accepted, decision.reasons)
+                    for decision in map(evaluate, pending)
+                ]
+
+            survivors: list[TokenSnapshot] = []
+            for snapshot, (passed, reasons) in zip(pending, results, strict=True):
+                if passed:
+                    survivors.append(snapshot)
+                    continue
+                logger.debug(
+                    "Token filtered out",
+                    token_mint=snapshot.token.mint,
+                    filter=filter_name,
+                    reasons=reasons,
+                )
+                self._remember_verdict(snapshot, False)
+                verdicts[snapshot.token.mint] = False
+            pending = survivors
+
+        for snapshot in pending:
+            self._remember_verdict(snapshot, True)
+            verdicts[snapshot.token.mint] = True
+
+        return [s for s in snapshots if verdicts[s.token.mint]]
+
+    def _remember_verdict(self, snapshot: TokenSnapshot, accepted: bool) -> None:
+        """Cache a filter verdict for the snapshot's token."""
+        token_mint = snapshot.token.mint
+        self._filter_cache[token_mint] = (snapshot.ts, accepted)
+        self._filter_cache.move_to_end(token_mint)
+        if len(self._filter_cache) > _FILTER_CACHE_SIZE:
+            self._filter_cache.popitem(last=False)
+
     async def run_forever(self) -> None:
         """Run the trading pipeline forever with configurable sleep intervals."""
         logger.info("Starting trading pipeline", dry_run=self.settings.dry_run)
         self.running = True
+        self._stop_event.clear()
 
         # Send startup alert
         startup_msg = f"🤖 Trading bot started in {'paper' if self.settings.dry_run else 'live'} mode"
         await self.components["alerts"].push(startup_msg)
 
         cycle_count = 0
-        start_time = datetime.now()
+        busy_seconds = 0.0
+        start_time = time.monotonic()
 
         try:
             while self.running:
+                cycle_start = time.monotonic()
                 await self.run_once()
+                elapsed = time.monotonic() - cycle_start
 
                 cycle_count += 1
+                busy_seconds += elapsed
 
                 # Log metrics every 10 cycles
                 if cycle_count % 10 == 0:
-                    uptime = (datetime.now() - start_time).total_seconds()
                     logger.info(
                         "Pipeline metrics",
                         cycles=cycle_count,
-                        uptime_seconds=uptime,
-                        avg_cycle_duration=uptime / cycle_count,
+                        uptime_seconds=time.monotonic() - start_time,
+                        avg_cycle_duration=busy_seconds / cycle_count,
                     )
 
-                # Sleep between cycles (configurable)
+                # Start cycles every cycle_sleep_seconds, counting the time the
+                # cycle itself took
                 sleep_duration = getattr(self.settings, "cycle_sleep_seconds", 30)
-                await asyncio.sleep(sleep_duration)
+                await self._wait_for_next_cycle(max(0.0, sleep_duration - elapsed))
 
         except asyncio.CancelledError:
             logger.info("Pipeline cancelled")
@@ -435,22 +683,94 @@ class TradingPipeline:
         finally:
             await self.stop()
 
-    async def stop(self) -> None:
-        """Stop the trading pipeline."""
-        logger.info("Stopping trading pipeline")
-        self.running = False
+    async def _wait_for_next_cycle(self, timeout: float) -> None:
+        """Wait until the next cycle is due or the pipeline is stopped.
 
-        # Send shutdown alert
-        await self.components["alerts"].push("🛑 Trading bot stopped")
+        Args:
+            timeout: Seconds until the next cycle
+        """
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout)
+        except TimeoutError:
+            pass
 
-        # Close storage
-        if "storage" in self.components:
-            await self.components["storage"].close()
+    async def stop(self) -> None:
+        """Stop the trading pipeline.
+
+        Safe to call more than once, e.g. from the signal handler and again
+        from run_forever's cleanup: teardown runs on the first call and later
+        calls return once it has finished.
+        """
+        self.running = False
+        self._stop_event.set()
 
-        # Close data sources
-        for data_source in self.components.get("data_sources", []):
-            if hasattr(data_source, "close"):
-                await data_source.close()
+        async with self._stop_lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            logger.info("Stopping trading pipeline")
+
+            # Send shutdown alert
+            await self.components["alerts"].push("🛑 Trading bot stopped")
+
+            # Close storage
+            if "storage" in self.components:
+                await self.components["storage"].close()
+
+            # Close data sources
+            for data_source in self.components.get("data_sources", []):
+                if hasattr(data_source, "close"):
+                    await data_source.close()
+
+            # Close the shared HTTP client last, once nothing else can use it
+            if "http_client" in self.components:
+                await self.components["http_client"].aclose()
+
+
+def configure_logging(json_logs: bool = False) -> None:
+    """Configure structlog for the bot process.
+
+    Args:
+        json_logs: Emit one JSON object per line (serialized with orjson when
+            available, Unix timestamps) instead of human-readable console output
+    """
+    shared_processors: list[structlog.typing.Processor] = [
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        structlog.processors.StackInfoRenderer(),
+        structlog.dev.set_exc_info,
+    ]
+
+    processors: list[structlog.typing.Processor]
+    logger_factory: Callable[..., Any]
+    if json_logs:
+        if ORJSON_AVAILABLE:
+            renderer = structlog.processors.JSONRenderer(serializer=orjson.dumps)
+            logger_factory = structlog.BytesLoggerFactory()
+        else:
+            renderer = structlog.processors.JSONRenderer()
+            logger_factory = structlog.PrintLoggerFactory()
+        processors = [
+            *shared_processors,
+            structlog.processors.TimeStamper(fmt=None),
+            structlog.processors.format_exc_info,
+            renderer,
+        ]
+    else:
+        processors = [
+            *shared_processors,
+            structlog.processors.TimeStamper(fmt="%Y-%m-%d %H:%M:%S", utc=False),
+            structlog.dev.ConsoleRenderer(),
+        ]
+        logger_factory = structlog.PrintLoggerFactory()
+
+    structlog.configure(
+        processors=processors,
+        logger_factory=logger_factory,
+        # Module-level loggers would otherwise rebuild their bound logger on
+        # every call
+        cache_logger_on_first_use=True,
+    )
 
 
 async def main() -> None:
@@ -465,8 +785,12 @@ async def main() -> None:
         choices=["dev", "paper", "prod"],
         help="Configuration profile",
     )
+    parser.add_argument(
+        "--json-logs", action="store_true", help="Emit logs as JSON lines"
+    )
 
     args = parser.parse_args()
+    configure_logging(json_logs=args.json_logs)
 
     try:
         # Load settings
@@ -476,13 +800,19 @@ async def main() -> None:
         # Create pipeline
         pipeline = TradingPipeline(settings)
 
-        # Handle shutdown signals
-        def signal_handler(signum, frame):
-            logger.info("Received shutdown signal")
-            asyncio.create_task(pipeline.stop())
+        # Handle shutdown signals on the event loop rather than in a raw
+        # signal handler, which could interrupt the loop mid-step
+        loop = asyncio.get_running_loop()
+        shutdown_tasks: set[asyncio.Task] = set()
 
-        signal.signal(signal.SIGINT, signal_handler)
-        signal.signal(signal.SIGTERM, signal_handler)
+        def signal_handler(signum: signal.Signals) -> None:
+            logger.info("Received shutdown signal", signal=signum.name)
+            task = asyncio.create_task(pipeline.stop())
+            shutdown_tasks.add(task)
+            task.add_done_callback(shutdown_tasks.discard)
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, signal_handler, signum)
 
         # Run pipeline
         await pipeline.run_forever()
@@ -492,5 +822,13 @@ async def main() -> None:
         sys.exit(1)
 
 
+def run() -> None:
+    """Run the bot on the fastest available event loop."""
+    if UVLOOP_AVAILABLE:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
+
+
 if __name__ == "__main__":
-    asyncio.run(main())
+    run()
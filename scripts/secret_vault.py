@@ -2,22 +2,132 @@
 """Secret vault for managing encrypted configuration files using AES-256-GCM."""
 
 import argparse
+import contextlib
+import functools
+import mmap
 import os
 import struct
 import sys
+import tempfile
+import threading
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
 from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 
+# Little-endian vault format version at the start of every blob
+_VERSION_HEADER = struct.Struct('<I')
+
+
 class VaultError(Exception):
     """Base exception for vault operations."""
     pass
 
 
+@contextlib.contextmanager
+def _map_readonly(path: Path) -> Iterator[memoryview]:
+    """Map a file read-only so its pages feed the cipher without copies.
+    
+    Args:
+        path: File to map
+        
+    Yields:
+        Read-only view over the file contents
+    """
+    with path.open('rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files cannot be mapped
+            yield memoryview(b'')
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+@contextlib.contextmanager
+def _replace_atomically(path: Path) -> Iterator[BinaryIO]:
+    """Write to a temp file beside ``path`` and move it into place on success.
+    
+    The target is never truncated while it may still be mapped as the input,
+    and a failed write leaves neither a partial output nor a stray temp file.
+    
+    Args:
+        path: Final output file
+        
+    Yields:
+        Binary file to write the output into
+    """
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            yield tmp
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+
+
+@functools.lru_cache(maxsize=8)
+def _derive_key(password: str, salt: bytes, length: int) -> bytes:
+    """Run PBKDF2 once per (password, salt); repeat derivations hit the cache.
+    
+    The cache lives only in this process, so no derived key is written to disk.
+    """
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(),
+        length=length,
+        salt=salt,
+        iterations=100000,  # NIST recommended minimum
+    )
+    return kdf.derive(password.encode('utf-8'))
+
+
+class _NoncePool:
+    """Hands out nonces sliced from one batched os.urandom draw.
+    
+    Every nonce is a fresh, never reused slice of kernel randomness; the
+    pool only amortizes the getrandom syscall over many encryptions. The
+    pool is emptied in forked children so parent and child can never hand
+    out the same bytes.
+    """
+    
+    POOL_SIZE = 4096
+    
+    def __init__(self) -> None:
+        self._reset()
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._reset)
+    
+    def _reset(self) -> None:
+        self._lock = threading.Lock()
+        self._pool = b''
+        self._offset = 0
+    
+    def take(self, size: int) -> bytes:
+        """Return the next unused ``size`` random bytes."""
+        with self._lock:
+            end = self._offset + size
+            if end > len(self._pool):
+                self._pool = os.urandom(max(self.POOL_SIZE, size))
+                self._offset, end = 0, size
+            nonce = self._pool[self._offset:end]
+            self._offset = end
+            return nonce
+
+
+_NONCE_POOL = _NoncePool()
+
+
 class SecretVault:
     """AES-256-GCM encrypted secret vault."""
     
@@ -25,6 +135,8 @@ class SecretVault:
     NONCE_SIZE = 12  # 96 bits for GCM
     KEY_SIZE = 32    # 256 bits for AES-256
     HEADER_SIZE = 16  # version (4) + nonce (12)
+    TAG_SIZE = 16    # GCM authentication tag appended to the ciphertext
+    CHUNK_SIZE = 1 << 20  # 1 MiB per update when encrypting files
     
     def __init__(self, key: bytes) -> None:
         """Initialize vault with encryption key.
@@ -35,6 +147,7 @@ class SecretVault:
         if len(key) != self.KEY_SIZE:
             raise VaultError(f"Key must be exactly {self.KEY_SIZE} bytes, got {len(key)}")
         
+        self._key = key
         self.aesgcm = AESGCM(key)
     
     @classmethod
@@ -48,13 +161,7 @@ class SecretVault:
         Returns:
             32-byte derived key
         """
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=cls.KEY_SIZE,
-            salt=salt,
-            iterations=100000,  # NIST recommended minimum
-        )
-        return kdf.derive(password.encode('utf-8'))
+        return _derive_key(password, salt, cls.KEY_SIZE)
     
     def encrypt_data(self, plaintext: bytes) -> bytes:
         """Encrypt data with AES-256-GCM.
@@ -66,13 +173,13 @@ class SecretVault:
             Encrypted data with header (version + nonce + ciphertext)
         """
         # Generate random nonce
-        nonce = os.urandom(self.NONCE_SIZE)
+        nonce = _NONCE_POOL.take(self.NONCE_SIZE)
         
         # Encrypt data
         ciphertext = self.aesgcm.encrypt(nonce, plaintext, None)
         
         # Build header: version (4 bytes) + nonce (12 bytes)
-        header = struct.pack('<I', self.VAULT_VERSION) + nonce
+        header = _VERSION_HEADER.pack(self.VAULT_VERSION) + nonce
         
         return header + ciphertext
     
@@ -92,7 +199,7 @@ class SecretVault:
         header = encrypted_data[:self.HEADER_SIZE]
         ciphertext = encrypted_data[self.HEADER_SIZE:]
         
-        version, = struct.unpack('<I', header[:4])
+        version, = _VERSION_HEADER.unpack_from(header)
         if version != self.VAULT_VERSION:
             raise VaultError(f"Unsupported vault version: {version}")
         
@@ -103,7 +210,7 @@ class SecretVault:
             plaintext = self.aesgcm.decrypt(nonce, ciphertext, None)
             return plaintext
         except Exception as e:
-            raise VaultError(f"Decryption failed: {e}")
+            raise VaultError(f"Decryption failed: {e}") from e
     
     def encrypt_file(self, input_path: Path, output_path: Path, force: bool = False) -> None:
         """Encrypt a file.
@@ -119,12 +226,26 @@ class SecretVault:
         if output_path.exists() and not force:
             raise VaultError(f"Output file exists (use --force to overwrite): {output_path}")
         
-        # Read and encrypt file
-        plaintext = input_path.read_bytes()
-        encrypted_data = self.encrypt_data(plaintext)
-        
-        # Write encrypted file
-        output_path.write_bytes(encrypted_data)
+        # Stream the mapped file through GCM in chunks, reusing one output
+        # buffer. The layout matches encrypt_data: header + ciphertext + tag.
+        # Output goes to a temp file so --out may safely name the input.
+        nonce = _NONCE_POOL.take(self.NONCE_SIZE)
+        encryptor = Cipher(algorithms.AES(self._key), modes.GCM(nonce)).encryptor()
+        
+        # update_into needs room for up to one extra block
+        out = bytearray(self.CHUNK_SIZE + 15)
+        out_view = memoryview(out)
+        
+        with _map_readonly(input_path) as data, _replace_atomically(output_path) as dst:
+            dst.write(_VERSION_HEADER.pack(self.VAULT_VERSION) + nonce)
+            for start in range(0, len(data), self.CHUNK_SIZE):
+                # update_into reads and fills any buffer; its stubs say bytes
+                written = encryptor.update_into(
+                    data[start:start + self.CHUNK_SIZE], out  # type: ignore[arg-type]
+                )
+                dst.write(out_view[:written])
+            encryptor.finalize()
+            dst.write(encryptor.tag)
     
     def decrypt_file(self, input_path: Path, output_path: Optional[Path] = None, force: bool = False) -> bytes:
         """Decrypt a file.
@@ -143,14 +264,40 @@ class SecretVault:
         if output_path and output_path.exists() and not force:
             raise VaultError(f"Output file exists (use --force to overwrite): {output_path}")
         
-        # Read and decrypt file
-        encrypted_data = input_path.read_bytes()
-        plaintext = self.decrypt_data(encrypted_data)
-        
+        with _map_readonly(input_path) as data:
+            size = len(data)
+            if size < self.HEADER_SIZE + self.TAG_SIZE:
+                raise VaultError("Invalid encrypted data: too short")
+            
+            version, = _VERSION_HEADER.unpack_from(data)
+            if version != self.VAULT_VERSION:
+                raise VaultError(f"Unsupported vault version: {version}")
+            nonce = bytes(data[4:self.HEADER_SIZE])
+            tag = bytes(data[size - self.TAG_SIZE:])
+            
+            # Decrypt straight from the mapping into one pre-allocated buffer;
+            # nothing is written out until the tag has been verified
+            ciphertext_size = size - self.HEADER_SIZE - self.TAG_SIZE
+            decryptor = Cipher(
+                algorithms.AES(self._key), modes.GCM(nonce, tag)
+            ).decryptor()
+            plaintext = bytearray(ciphertext_size + 15)
+            plaintext_view = memoryview(plaintext)
+            # update_into reads and fills any buffer; its stubs say bytes
+            offset = decryptor.update_into(
+                data[self.HEADER_SIZE:size - self.TAG_SIZE], plaintext_view  # type: ignore[arg-type]
+            )
+            try:
+                decryptor.finalize()
+            except InvalidTag as e:
+                raise VaultError(f"Decryption failed: {e}") from e
+        
+        result = plaintext_view[:offset]
         if output_path:
-            output_path.write_bytes(plaintext)
+            with _replace_atomically(output_path) as dst:
+                dst.write(result)
         
-        return plaintext
+        return bytes(result)
 
 
 def load_key_from_env(env_var: str) -> bytes:
@@ -187,19 +334,20 @@ def mask_env_content(content: str) -> str:
     Returns:
         Content with masked values
     """
-    lines = []
+    lines: list[str] = []
+    append = lines.append
     for line in content.split('\n'):
         line = line.strip()
-        if line and not line.startswith('#') and '=' in line:
-            key, value = line.split('=', 1)
-            if value and len(value) > 8:
-                # Show first 4 and last 4 characters, mask the middle
-                masked_value = value[:4] + '*' * (len(value) - 8) + value[-4:]
-            else:
-                masked_value = '*' * len(value)
-            lines.append(f"{key}={masked_value}")
-        else:
-            lines.append(line)
+        if line and line[0] != '#':
+            key, sep, value = line.partition('=')
+            if sep:
+                size = len(value)
+                if size > 8:
+                    # Show first 4 and last 4 characters, mask the middle
+                    line = f"{key}={value[:4]}{'*' * (size - 8)}{value[-4:]}"
+                else:
+                    line = f"{key}={'*' * size}"
+        append(line)
     
     return '\n'.join(lines)
 
@@ -223,22 +371,20 @@ def cmd_encrypt(args: argparse.Namespace) -> None:
 
 def cmd_decrypt(args: argparse.Namespace) -> None:
     """Handle decrypt command."""
+    if not args.output:
+        # Refuse before loading the key or decrypting anything
+        print("❌ Refusing to print plaintext without --out specified", file=sys.stderr)
+        print("Use --out to specify output file", file=sys.stderr)
+        sys.exit(1)
+    
     try:
         key = load_key_from_env(args.key_from_env)
         vault = SecretVault(key)
         
         input_path = Path(args.input)
-        
-        if args.output:
-            output_path = Path(args.output)
-            vault.decrypt_file(input_path, output_path, args.force)
-            print(f"✅ Decrypted {input_path} -> {output_path}")
-        else:
-            # Don't write plaintext to disk if --out omitted
-            plaintext = vault.decrypt_file(input_path)
-            print("❌ Refusing to print plaintext without --out specified", file=sys.stderr)
-            print("Use --out to specify output file", file=sys.stderr)
-            sys.exit(1)
+        output_path = Path(args.output)
+        vault.decrypt_file(input_path, output_path, args.force)
+        print(f"✅ Decrypted {input_path} -> {output_path}")
         
     except Exception as e:
         print(f"❌ Decryption failed: {e}", file=sys.stderr)
@@ -1,11 +1,12 @@
 """Tests for Telegram alert system."""
 
+import asyncio
 import json
-from unittest.mock import AsyncMock, MagicMock
+from contextlib import nullcontext
+from dataclasses import dataclass
 
 import httpx
 import pytest
-import respx
 
 from bot.alerts.telegram import (
     StatusProvider,
@@ -13,116 +14,183 @@ from bot.alerts.telegram import (
     TelegramCommandHandler,
 )
 
+# Keep the module on one worker under `--dist loadgroup` so its module-scoped
+# fake API and clients are built once rather than once per xdist worker
+pytestmark = pytest.mark.xdist_group("telegram_alerts")
 
+# Alert sink configuration shared by the sink tests
+BOT_TOKEN = "test_token_123"
+ADMIN_IDS = (12345, 67890)
+
+# Bot API endpoint mocked by respx in the integration tests
+INTEGRATION_SEND_URL = "https://api.telegram.org/bottest_token/sendMessage"
+
+
+@dataclass(slots=True, frozen=True)
 class MockStatusProvider:
     """Mock status provider for testing."""
 
-    def __init__(self, status_data: dict):
-        self.status_data = status_data
+    status_data: dict
 
     def get_status(self) -> dict:
         return self.status_data
 
 
+# Shared status providers; tests only read them
+SYSTEM_STATUS_PROVIDER = MockStatusProvider(
+    {
+        "uptime": "2h 30m",
+        "positions": 3,
+        "total_pnl": 125.50,
+        "last_trade": "2024-01-01T12:00:00Z",
+    }
+)
+SHORT_STATUS_PROVIDER = MockStatusProvider({"uptime": "1h", "positions": 2})
+# Larger than Telegram's 4096 character message limit
+LARGE_STATUS_PROVIDER = MockStatusProvider({"data": "x" * 5000})
+
+
+class FakeTelegramAPI:
+    """In-process Telegram Bot API served through httpx.MockTransport."""
+
+    def __init__(self):
+        self.sent: list[dict] = []
+        self.responses: list[httpx.Response] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        """Record the request and answer with the next queued response."""
+        self.sent.append({"url": str(request.url), "json": json.loads(request.content)})
+        if self.responses:
+            return self.responses.pop(0)
+        return httpx.Response(200, json={"ok": True, "result": {"message_id": 123}})
+
+    def reset(self) -> None:
+        """Forget recorded requests and queued responses."""
+        self.sent.clear()
+        self.responses.clear()
+
+
+@pytest.fixture(scope="module")
+def telegram_api():
+    """Create the fake Telegram API once for the whole module."""
+    return FakeTelegramAPI()
+
+
+@pytest.fixture(scope="module")
+def http_session(telegram_api):
+    """Create one real AsyncClient routed to the fake Telegram API."""
+    client = httpx.AsyncClient(transport=httpx.MockTransport(telegram_api.handle))
+    yield client
+    asyncio.run(client.aclose())
+
+
+@pytest.fixture(autouse=True)
+def reset_telegram_api(telegram_api):
+    """Clear recorded requests and queued responses between tests."""
+    yield
+    telegram_api.reset()
+
+
+@pytest.fixture(scope="module")
+def integration_sink():
+    """Create one alert sink on a real pooled client for the respx tests."""
+    client = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=20))
+    yield TelegramAlertSink("test_token", [12345], session=client)
+    asyncio.run(client.aclose())
+
+
 class TestTelegramAlertSink:
     """Test Telegram alert sink functionality."""
 
     @pytest.fixture
-    def alert_sink(self):
+    def alert_sink(self, http_session):
         """Create a test alert sink."""
         return TelegramAlertSink(
-            bot_token="test_token_123",
-            admin_user_ids=[12345, 67890],
-            session=AsyncMock(spec=httpx.AsyncClient),
+            bot_token=BOT_TOKEN,
+            admin_user_ids=list(ADMIN_IDS),
+            session=http_session,
         )
 
-    @pytest.mark.asyncio
-    async def test_initialization(self, alert_sink):
+    def test_initialization(self, alert_sink):
         """Test alert sink initialization."""
-        assert alert_sink.bot_token == "test_token_123"
-        assert alert_sink.admin_user_ids == [12345, 67890]
+        assert alert_sink.bot_token == BOT_TOKEN
+        assert alert_sink.admin_user_ids == list(ADMIN_IDS)
         assert alert_sink.base_url == "https://api.telegram.org/bottest_token_123"
 
     @pytest.mark.asyncio
-    async def test_push_message_success(self, alert_sink):
+    async def test_push_message_success(self, alert_sink, telegram_api):
         """Test successful message push."""
-        # Mock successful responses
-        mock_response = AsyncMock()
-        mock_response.json = MagicMock(
-            return_value={"ok": True, "result": {"message_id": 123}}
-        )
-        mock_response.raise_for_status = MagicMock()
-
-        alert_sink.session.post.return_value = mock_response
-
         await alert_sink.push("Test alert message")
 
         # Verify calls to both admin users
-        assert alert_sink.session.post.call_count == 2
+        first, second = telegram_api.sent
 
         # Check first call
-        first_call = alert_sink.session.post.call_args_list[0]
-        assert (
-            first_call[0][0] == "https://api.telegram.org/bottest_token_123/sendMessage"
-        )
-        assert first_call[1]["json"]["chat_id"] == 12345
-        assert first_call[1]["json"]["text"] == "Test alert message"
-        assert first_call[1]["json"]["parse_mode"] == "HTML"
+        assert first["url"] == "https://api.telegram.org/bottest_token_123/sendMessage"
+        assert first["json"] == {
+            "chat_id": ADMIN_IDS[0],
+            "text": "Test alert message",
+            "parse_mode": "HTML",
+        }
 
         # Check second call
-        second_call = alert_sink.session.post.call_args_list[1]
-        assert second_call[1]["json"]["chat_id"] == 67890
+        assert second["json"]["chat_id"] == ADMIN_IDS[1]
+
+    @pytest.mark.asyncio
+    async def test_send_message_applies_timeout(self):
+        """Test that the sink's timeout overrides a shared client's default."""
+        timeouts = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            timeouts.append(request.extensions["timeout"])
+            return httpx.Response(200, json={"ok": True})
+
+        async with httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), timeout=30.0
+        ) as session:
+            sink = TelegramAlertSink(BOT_TOKEN, [12345], session, timeout=5.0)
+            await sink._send_message(12345, "Test message")
+
+        assert timeouts[0]["read"] == 5.0
 
     @pytest.mark.asyncio
-    async def test_push_message_no_admins(self):
+    async def test_push_message_no_admins(self, http_session, telegram_api):
         """Test push with no admin users."""
         alert_sink = TelegramAlertSink(
             bot_token="test_token",
             admin_user_ids=[],
-            session=AsyncMock(spec=httpx.AsyncClient),
+            session=http_session,
         )
 
         await alert_sink.push("Test message")
 
         # Should not make any HTTP calls
-        alert_sink.session.post.assert_not_called()
+        assert not telegram_api.sent
 
     @pytest.mark.asyncio
-    async def test_push_message_partial_failure(self, alert_sink):
+    async def test_push_message_partial_failure(self, alert_sink, telegram_api):
         """Test push with partial failures."""
-        # Mock first call success, second call failure
-        mock_success = AsyncMock()
-        mock_success.json.return_value = {"ok": True}
-        mock_success.raise_for_status.return_value = None
-
-        mock_failure = AsyncMock()
-        mock_failure.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Error", request=MagicMock(), response=MagicMock()
+        # First call succeeds, second call fails
+        telegram_api.responses.extend(
+            [httpx.Response(200, json={"ok": True}), httpx.Response(500)]
         )
 
-        alert_sink.session.post.side_effect = [mock_success, mock_failure]
-
         await alert_sink.push("Test message")
 
         # Should still make both calls
-        assert alert_sink.session.post.call_count == 2
+        assert len(telegram_api.sent) == 2
 
     @pytest.mark.asyncio
-    async def test_send_message_telegram_error(self, alert_sink):
+    async def test_send_message_telegram_error(self, alert_sink, telegram_api):
         """Test handling of Telegram API errors."""
-        mock_response = AsyncMock()
-        mock_response.json = MagicMock(
-            return_value={"ok": False, "description": "Bad Request"}
+        telegram_api.responses.append(
+            httpx.Response(200, json={"ok": False, "description": "Bad Request"})
         )
-        mock_response.raise_for_status = MagicMock()
-
-        alert_sink.session.post.return_value = mock_response
 
         with pytest.raises(Exception, match="Telegram API error: Bad Request"):
             await alert_sink._send_message(12345, "Test message")
 
-    @pytest.mark.asyncio
-    async def test_handle_help_command(self, alert_sink):
+    def test_handle_help_command(self, alert_sink):
         """Test help command handling."""
         response = alert_sink._handle_help_command()
 
@@ -134,15 +202,7 @@ class TestTelegramAlertSink:
     @pytest.mark.asyncio
     async def test_handle_status_command_with_provider(self, alert_sink):
         """Test status command with provider."""
-        status_data = {
-            "uptime": "2h 30m",
-            "positions": 3,
-            "total_pnl": 125.50,
-            "last_trade": "2024-01-01T12:00:00Z",
-        }
-        provider = MockStatusProvider(status_data)
-
-        response = await alert_sink._handle_status_command(provider)
+        response = await alert_sink._handle_status_command(SYSTEM_STATUS_PROVIDER)
 
         assert "📊" in response
         assert "System Status" in response
@@ -160,11 +220,7 @@ class TestTelegramAlertSink:
     @pytest.mark.asyncio
     async def test_handle_status_command_large_response(self, alert_sink):
         """Test status command with large response."""
-        # Create a large status response
-        large_data = {"data": "x" * 5000}
-        provider = MockStatusProvider(large_data)
-
-        response = await alert_sink._handle_status_command(provider)
+        response = await alert_sink._handle_status_command(LARGE_STATUS_PROVIDER)
 
         assert len(response) <= 4096  # Telegram limit
         assert "... (truncated)" in response
@@ -184,33 +240,36 @@ class TestTelegramAlertSink:
         assert "Unknown command" in response
 
     @pytest.mark.asyncio
-    async def test_context_manager(self):
+    async def test_context_manager(self, telegram_api):
         """Test async context manager."""
-        mock_session = AsyncMock(spec=httpx.AsyncClient)
+        # Own client, since exiting the sink closes its session
+        session = httpx.AsyncClient(transport=httpx.MockTransport(telegram_api.handle))
 
-        async with TelegramAlertSink("test_token", [12345], mock_session) as sink:
+        async with TelegramAlertSink("test_token", [12345], session) as sink:
             assert isinstance(sink, TelegramAlertSink)
 
         # Should close session
-        mock_session.aclose.assert_called_once()
+        assert session.is_closed
+
+
+@pytest.fixture(scope="class")
+def command_handler(http_session):
+    """Create one command handler and alert sink per test class."""
+    alert_sink = TelegramAlertSink(
+        bot_token="test_token",
+        admin_user_ids=[12345],
+        session=http_session,
+    )
+    return TelegramCommandHandler(alert_sink)
 
 
 class TestTelegramCommandHandler:
     """Test Telegram command handler."""
 
-    @pytest.fixture
-    def alert_sink(self):
-        """Create a test alert sink."""
-        return TelegramAlertSink(
-            bot_token="test_token",
-            admin_user_ids=[12345],
-            session=AsyncMock(spec=httpx.AsyncClient),
-        )
-
-    @pytest.fixture
-    def command_handler(self, alert_sink):
-        """Create a test command handler."""
-        return TelegramCommandHandler(alert_sink)
+    @pytest.fixture(autouse=True)
+    def reset_status_provider(self, command_handler):
+        """Start every test without a status provider."""
+        command_handler.set_status_provider(None)
 
     def test_initialization(self, command_handler):
         """Test command handler initialization."""
@@ -225,14 +284,8 @@ class TestTelegramCommandHandler:
         assert command_handler.status_provider == provider
 
     @pytest.mark.asyncio
-    async def test_handle_update_valid_command(self, command_handler):
+    async def test_handle_update_valid_command(self, command_handler, telegram_api):
         """Test handling valid command update."""
-        # Mock successful response
-        mock_response = AsyncMock()
-        mock_response.json = MagicMock(return_value={"ok": True})
-        mock_response.raise_for_status = MagicMock()
-        command_handler.alert_sink.session.post.return_value = mock_response
-
         update = {
             "message": {"chat": {"id": 12345}, "from": {"id": 12345}, "text": "/help"}
         }
@@ -240,10 +293,12 @@ class TestTelegramCommandHandler:
         await command_handler.handle_update(update)
 
         # Should send response
-        command_handler.alert_sink.session.post.assert_called_once()
+        assert len(telegram_api.sent) == 1
 
     @pytest.mark.asyncio
-    async def test_handle_update_unauthorized_user(self, command_handler):
+    async def test_handle_update_unauthorized_user(
+        self, command_handler, telegram_api
+    ):
         """Test handling update from unauthorized user."""
         update = {
             "message": {
@@ -256,10 +311,10 @@ class TestTelegramCommandHandler:
         await command_handler.handle_update(update)
 
         # Should not send any response
-        command_handler.alert_sink.session.post.assert_not_called()
+        assert not telegram_api.sent
 
     @pytest.mark.asyncio
-    async def test_handle_update_missing_fields(self, command_handler):
+    async def test_handle_update_missing_fields(self, command_handler, telegram_api):
         """Test handling update with missing fields."""
         # Missing chat_id
         update1 = {"message": {"from": {"id": 12345}, "text": "/help"}}
@@ -270,20 +325,13 @@ class TestTelegramCommandHandler:
         await command_handler.handle_update(update2)
 
         # Should not send any responses
-        command_handler.alert_sink.session.post.assert_not_called()
+        assert not telegram_api.sent
 
     @pytest.mark.asyncio
-    async def test_handle_update_status_command(self, command_handler):
+    async def test_handle_update_status_command(self, command_handler, telegram_api):
         """Test handling status command."""
         # Set up status provider
-        provider = MockStatusProvider({"uptime": "1h", "positions": 2})
-        command_handler.set_status_provider(provider)
-
-        # Mock successful response
-        mock_response = AsyncMock()
-        mock_response.json = MagicMock(return_value={"ok": True})
-        mock_response.raise_for_status = MagicMock()
-        command_handler.alert_sink.session.post.return_value = mock_response
+        command_handler.set_status_provider(SHORT_STATUS_PROVIDER)
 
         update = {
             "message": {"chat": {"id": 12345}, "from": {"id": 12345}, "text": "/status"}
@@ -292,8 +340,7 @@ class TestTelegramCommandHandler:
         await command_handler.handle_update(update)
 
         # Should send response with status
-        call_args = command_handler.alert_sink.session.post.call_args
-        response_text = call_args[1]["json"]["text"]
+        response_text = telegram_api.sent[-1]["json"]["text"]
         assert "📊" in response_text
         assert "uptime" in response_text
 
@@ -302,62 +349,46 @@ class TestTelegramIntegration:
     """Integration tests with respx HTTP mocking."""
 
     @pytest.mark.asyncio
-    async def test_telegram_api_integration(self):
-        """Test integration with Telegram API using respx."""
-        with respx.mock as respx_mock:
-            # Mock successful sendMessage response
-            respx_mock.post("https://api.telegram.org/bottest_token/sendMessage").mock(
-                return_value=httpx.Response(
-                    200, json={"ok": True, "result": {"message_id": 123}}
-                )
-            )
-
-            alert_sink = TelegramAlertSink("test_token", [12345])
-
-            await alert_sink.push("Integration test message")
-
-            # Verify request was made
-            assert respx_mock.calls.call_count == 1
-            call = respx_mock.calls[0]
-            assert (
-                call.request.url == "https://api.telegram.org/bottest_token/sendMessage"
-            )
-
-            # Verify request data
-            request_data = json.loads(call.request.content)
-            assert request_data["chat_id"] == 12345
-            assert request_data["text"] == "Integration test message"
-            assert request_data["parse_mode"] == "HTML"
-
-    @pytest.mark.asyncio
-    async def test_telegram_api_error_handling(self):
-        """Test handling of Telegram API errors."""
-        with respx.mock as respx_mock:
-            # Mock error response (200 status but ok=False)
-            respx_mock.post("https://api.telegram.org/bottest_token/sendMessage").mock(
-                return_value=httpx.Response(
-                    200, json={"ok": False, "description": "Bad Request"}
-                )
-            )
-
-            alert_sink = TelegramAlertSink("test_token", [12345])
-
-            with pytest.raises(Exception, match="Telegram API error: Bad Request"):
-                await alert_sink._send_message(12345, "Test message")
-
-    @pytest.mark.asyncio
-    async def test_telegram_api_http_error(self):
-        """Test handling of HTTP errors."""
-        with respx.mock as respx_mock:
-            # Mock HTTP error
-            respx_mock.post("https://api.telegram.org/bottest_token/sendMessage").mock(
-                return_value=httpx.Response(500, text="Internal Server Error")
-            )
-
-            alert_sink = TelegramAlertSink("test_token", [12345])
-
-            with pytest.raises(httpx.HTTPStatusError):
-                await alert_sink._send_message(12345, "Test message")
+    @pytest.mark.parametrize(
+        ("response", "expectation"),
+        [
+            pytest.param(
+                httpx.Response(200, json={"ok": True, "result": {"message_id": 123}}),
+                nullcontext(),
+                id="success",
+            ),
+            pytest.param(
+                httpx.Response(200, json={"ok": False, "description": "Bad Request"}),
+                pytest.raises(Exception, match="Telegram API error: Bad Request"),
+                id="telegram_error",
+            ),
+            pytest.param(
+                httpx.Response(500, text="Internal Server Error"),
+                pytest.raises(httpx.HTTPStatusError),
+                id="http_error",
+            ),
+        ],
+    )
+    async def test_send_message(
+        self, integration_sink, respx_mock, response, expectation
+    ):
+        """Test sendMessage requests and response handling against respx."""
+        route = respx_mock.post(INTEGRATION_SEND_URL).mock(return_value=response)
+
+        with expectation:
+            await integration_sink._send_message(12345, "Integration test message")
+
+        # Verify request was made
+        assert route.call_count == 1
+        request = route.calls.last.request
+        assert request.url == INTEGRATION_SEND_URL
+
+        # Verify request data
+        assert json.loads(request.content) == {
+            "chat_id": 12345,
+            "text": "Integration test message",
+            "parse_mode": "HTML",
+        }
 
 
 class TestStatusProviderProtocol:
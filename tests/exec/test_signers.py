@@ -3,24 +3,39 @@
 import base64
 import json
 import os
+import shutil
 import subprocess
 import tempfile
+import threading
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
 import pytest
 
+import bot.exec.signers as signers_module
 from bot.exec.signers import (
     TxnSigner,
     KeypairSigner,
     ExternalSigner,
+    SharedLibSigner,
     load_base58_secret,
     load_base58_secret_from_string,
+    load_external_signer,
     load_json_keypair,
     SOLDERS_AVAILABLE,
     BASE58_AVAILABLE,
 )
 
 
+@pytest.fixture(autouse=True)
+def isolated_pubkey_cache(tmp_path, monkeypatch):
+    """Keep the external signer pubkey cache out of the user's home directory."""
+    monkeypatch.setattr(
+        signers_module, "_PUBKEY_CACHE_PATH", tmp_path / "pubkey_cache.json"
+    )
+    monkeypatch.setattr(signers_module, "_PUBKEY_CACHE", {})
+    monkeypatch.setattr(signers_module, "_PUBKEY_CACHE_LOADED", False)
+
+
 class TestTxnSignerProtocol:
     """Test the TxnSigner protocol compliance."""
 
@@ -82,6 +97,22 @@ class TestKeypairSigner:
                 assert signed == b"test_signature" + txn_bytes
                 mock_keypair.sign_message.assert_called_once_with(txn_bytes)
 
+    @pytest.mark.asyncio
+    async def test_sign_many(self):
+        """Test concurrent signing preserves transaction order."""
+        mock_keypair = Mock()
+        mock_keypair.sign_message.side_effect = lambda txn: b"sig-" + txn[-1:]
+
+        # Bypass keypair loading so the test runs without solders
+        signer = KeypairSigner.__new__(KeypairSigner)
+        signer.keypair = mock_keypair
+
+        txns = [b"txn-a", b"txn-b", b"txn-c"]
+        signed = await signer.sign_many(txns)
+
+        assert signed == [b"sig-a" + b"txn-a", b"sig-b" + b"txn-b", b"sig-c" + b"txn-c"]
+        assert mock_keypair.sign_message.call_count == 3
+
     @pytest.mark.skipif(not SOLDERS_AVAILABLE, reason="solders not available")
     def test_load_keypair_no_sources(self):
         """Test that KeypairSigner raises error when no valid sources are provided."""
@@ -92,7 +123,7 @@ class TestKeypairSigner:
                 side_effect=Exception("Failed"),
             ):
                 with patch(
-                    "bot.exec.signers.load_base58_secret",
+                    "bot.exec.signers.load_base58_secret_from_string",
                     side_effect=Exception("Failed"),
                 ):
                     with patch(
@@ -105,6 +136,103 @@ class TestKeypairSigner:
                             KeypairSigner()
 
 
+class TestKeypairSourceDispatch:
+    """Test KeypairSigner source selection."""
+
+    @pytest.fixture
+    def mock_solders(self):
+        """Stand in for solders so source dispatch can be tested without it."""
+        with patch("bot.exec.signers.SOLDERS_AVAILABLE", True):
+            with patch("bot.exec.signers.solders_keypair") as mock_solders:
+                mock_solders.Keypair.from_bytes.side_effect = lambda b: Mock(
+                    secret=b, pubkey=Mock(return_value="TestPubkey")
+                )
+                yield mock_solders
+
+    def test_first_configured_source_only(self, mock_solders):
+        """Test that only the first configured source is tried by default."""
+        with patch.dict(os.environ, {"TEST_SK": "secret"}):
+            with patch(
+                "bot.exec.signers.load_base58_secret_from_string",
+                side_effect=ValueError("bad env secret"),
+            ):
+                with patch(
+                    "bot.exec.signers.load_json_keypair", return_value=b"\x01" * 64
+                ) as mock_json:
+                    with pytest.raises(ValueError, match="env: bad env secret"):
+                        KeypairSigner(
+                            keypair_path_json="wallet.json", secret_key_env="TEST_SK"
+                        )
+
+        mock_json.assert_not_called()
+
+    def test_fallback_to_next_source(self, mock_solders):
+        """Test falling through to later sources when fallback is enabled."""
+        with patch.dict(os.environ, {"TEST_SK": "secret"}):
+            with patch(
+                "bot.exec.signers.load_base58_secret_from_string",
+                side_effect=ValueError("bad env secret"),
+            ):
+                with patch(
+                    "bot.exec.signers.load_json_keypair", return_value=b"\x01" * 64
+                ):
+                    signer = KeypairSigner(
+                        keypair_path_json="wallet.json",
+                        secret_key_env="TEST_SK",
+                        fallback=True,
+                    )
+
+        assert signer.keypair.secret == b"\x01" * 64
+
+    def test_unset_env_skips_to_json(self, mock_solders):
+        """Test that an unset env var is not treated as a configured source."""
+        with patch.dict(os.environ, {}, clear=True):
+            with patch(
+                "bot.exec.signers.load_json_keypair", return_value=b"\x02" * 64
+            ):
+                signer = KeypairSigner(
+                    keypair_path_json="wallet.json", secret_key_env="TEST_SK"
+                )
+
+        assert signer.keypair.secret == b"\x02" * 64
+
+
+class TestEncryptedKeypair:
+    """Test loading keypairs from vault-encrypted files."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_vault(self):
+        """Reset the memoized vault around each test."""
+        signers_module._get_vault.cache_clear()
+        yield
+        signers_module._get_vault.cache_clear()
+
+    def test_vault_shared_across_signers(self, tmp_path):
+        """Test that the vault key is loaded once for several keypair files."""
+        from scripts.secret_vault import SecretVault
+
+        vault = SecretVault(b"k" * 32)
+        secret = "secret-b58"
+        paths = []
+        for name in ("wallet1.enc", "wallet2.enc"):
+            path = tmp_path / name
+            path.write_bytes(vault.encrypt_data(secret.encode("utf-8")))
+            paths.append(str(path))
+
+        signer = KeypairSigner.__new__(KeypairSigner)
+        with patch(
+            "scripts.secret_vault.load_key_from_env", return_value=b"k" * 32
+        ) as mock_load_key:
+            with patch(
+                "bot.exec.signers.load_base58_secret_from_string",
+                side_effect=lambda s: s.encode("utf-8"),
+            ):
+                for path in paths:
+                    assert signer._load_encrypted_keypair(path) == b"secret-b58"
+
+        mock_load_key.assert_called_once_with("VAULT_KEY")
+
+
 class TestExternalSigner:
     """Test ExternalSigner functionality."""
 
@@ -131,20 +259,15 @@ class TestExternalSigner:
             # Mock successful subprocess execution
             mock_result = Mock()
             # Use a valid base64 string
-            mock_result.stdout = (
-                base64.b64encode(b"test_signed_data").decode("utf-8") + "\n"
-            )
+            mock_result.stdout = base64.b64encode(b"test_signed_data") + b"\n"
             mock_result.returncode = 0
             mock_run.return_value = mock_result
 
-            # Create signer without calling _get_pubkey during init
-            signer = ExternalSigner.__new__(ExternalSigner)
-            signer.command = "test_command"
-            signer.args = []
-            signer.timeout = 30
-            signer.pubkey = (
-                "TestPubkey123"  # Set pubkey directly to avoid _get_pubkey call
-            )
+            # Create signer without spawning the command for the pubkey
+            with patch.object(
+                ExternalSigner, "_get_pubkey", return_value="TestPubkey123"
+            ):
+                signer = ExternalSigner("test_command")
 
             txn_bytes = b"test_transaction"
             signed = signer.sign_transaction(txn_bytes)
@@ -156,14 +279,59 @@ class TestExternalSigner:
             assert call_args[0][0] == expected_cmd
 
             # Verify subprocess parameters
+            assert call_args[1]["input"] is None
             assert call_args[1]["capture_output"] is True
-            assert call_args[1]["text"] is True
             assert call_args[1]["timeout"] == 30
             assert call_args[1]["check"] is True
 
             # Verify result
             assert signed == b"test_signed_data"
 
+    def test_sign_transaction_stdin(self):
+        """Test opt-in signing with the transaction written to stdin."""
+        with patch("subprocess.run") as mock_run:
+            mock_result = Mock()
+            mock_result.stdout = base64.b64encode(b"test_signed_data") + b"\n"
+            mock_run.return_value = mock_result
+
+            with patch.object(
+                ExternalSigner, "_get_pubkey", return_value="TestPubkey123"
+            ):
+                signer = ExternalSigner("test_command", ["--ledger"], stdin=True)
+
+            txn_bytes = b"test_transaction"
+            signed = signer.sign_transaction(txn_bytes)
+
+            call_args = mock_run.call_args
+            assert call_args[0][0] == ["test_command", "--ledger", "--stdin"]
+            assert call_args[1]["input"] == base64.b64encode(txn_bytes)
+            assert signed == b"test_signed_data"
+
+    @pytest.mark.asyncio
+    async def test_sign_transaction_async_runs_off_event_loop(self):
+        """Test that async signing runs the external command on the thread pool."""
+        main_thread = threading.get_ident()
+        calls = []
+
+        def fake_run(cmd, **kwargs):
+            calls.append(threading.get_ident())
+            result = Mock()
+            result.stdout = base64.b64encode(b"test_signed_data")
+            return result
+
+        with patch.object(ExternalSigner, "_get_pubkey", return_value="TestPubkey"):
+            signer = ExternalSigner("test_command")
+
+        try:
+            with patch("subprocess.run", side_effect=fake_run):
+                signed = await signer.sign_transaction_async(b"test_transaction")
+        finally:
+            signer.close()
+
+        assert signed == b"test_signed_data"
+        assert len(calls) == 1
+        assert calls[0] != main_thread
+
     def test_sign_transaction_timeout(self):
         """Test transaction signing timeout."""
         with patch(
@@ -181,7 +349,7 @@ class TestExternalSigner:
         with patch(
             "subprocess.run",
             side_effect=subprocess.CalledProcessError(
-                1, "test_command", stderr="Error"
+                1, "test_command", stderr=b"Error"
             ),
         ):
             signer = ExternalSigner("test_command")
@@ -193,18 +361,15 @@ class TestExternalSigner:
         """Test transaction signing with empty output."""
         with patch("subprocess.run") as mock_run:
             mock_result = Mock()
-            mock_result.stdout = ""
+            mock_result.stdout = b""
             mock_result.returncode = 0
             mock_run.return_value = mock_result
 
-            # Create signer without calling _get_pubkey during init
-            signer = ExternalSigner.__new__(ExternalSigner)
-            signer.command = "test_command"
-            signer.args = []
-            signer.timeout = 30
-            signer.pubkey = (
-                "TestPubkey123"  # Set pubkey directly to avoid _get_pubkey call
-            )
+            # Create signer without spawning the command for the pubkey
+            with patch.object(
+                ExternalSigner, "_get_pubkey", return_value="TestPubkey123"
+            ):
+                signer = ExternalSigner("test_command")
 
             with pytest.raises(
                 RuntimeError, match="Failed to execute external signing command: External command returned empty output"
@@ -249,6 +414,95 @@ class TestExternalSigner:
 
             assert pubkey == "unknown"
 
+    def test_get_pubkey_cached_by_binary_mtime(self, tmp_path):
+        """Test that the pubkey is reused until the signing binary changes."""
+        command = tmp_path / "signer"
+        command.write_text("#!/bin/sh\n")
+
+        with patch("subprocess.run") as mock_run:
+            mock_result = Mock()
+            mock_result.stdout = "TestPubkey123\n"
+            mock_run.return_value = mock_result
+
+            assert ExternalSigner(str(command)).pubkey == "TestPubkey123"
+            assert ExternalSigner(str(command)).pubkey == "TestPubkey123"
+            assert mock_run.call_count == 1
+
+            # Persisted cache survives a process restart
+            signers_module._PUBKEY_CACHE.clear()
+            signers_module._PUBKEY_CACHE_LOADED = False
+            assert ExternalSigner(str(command)).pubkey == "TestPubkey123"
+            assert mock_run.call_count == 1
+
+            # Rebuilt binary invalidates the cached entry
+            stat = command.stat()
+            os.utime(command, (stat.st_atime, stat.st_mtime + 10))
+            ExternalSigner(str(command))
+            assert mock_run.call_count == 2
+
+
+SIGNING_LIB_SOURCE = """
+#include <stddef.h>
+#include <string.h>
+
+int sign(const unsigned char *txn, size_t txn_len, unsigned char *out, size_t *out_len) {
+    if (*out_len < txn_len + 4) return 1;
+    memcpy(out, "SIG:", 4);
+    memcpy(out + 4, txn, txn_len);
+    *out_len = txn_len + 4;
+    return 0;
+}
+
+int pubkey(char *out, size_t *out_len) {
+    memcpy(out, "LibPubkey123", 12);
+    *out_len = 12;
+    return 0;
+}
+"""
+
+
+@pytest.fixture
+def signing_lib(tmp_path):
+    """Build a tiny shared library implementing the signing C ABI."""
+    compiler = shutil.which("cc") or shutil.which("gcc")
+    if compiler is None:
+        pytest.skip("C compiler not available")
+
+    source = tmp_path / "signer.c"
+    source.write_text(SIGNING_LIB_SOURCE)
+    library = tmp_path / "libsigner.so"
+    subprocess.run(
+        [compiler, "-shared", "-fPIC", "-o", str(library), str(source)], check=True
+    )
+    return str(library)
+
+
+class TestSharedLibSigner:
+    """Test SharedLibSigner functionality."""
+
+    def test_sign_transaction(self, signing_lib):
+        """Test signing through the shared library."""
+        signer = SharedLibSigner(signing_lib)
+
+        assert signer.pubkey_base58() == "LibPubkey123"
+        assert signer.sign_transaction(b"test_transaction") == b"SIG:test_transaction"
+
+    def test_load_external_signer_prefers_library(self, signing_lib):
+        """Test that the library is used when it loads."""
+        signer = load_external_signer("test_command", library_path=signing_lib)
+
+        assert isinstance(signer, SharedLibSigner)
+
+    def test_load_external_signer_falls_back_to_command(self):
+        """Test fallback to the external command when the library is missing."""
+        with patch.object(ExternalSigner, "_get_pubkey", return_value="TestPubkey"):
+            signer = load_external_signer(
+                "test_command", library_path="/nonexistent/libsigner.so"
+            )
+
+        assert isinstance(signer, ExternalSigner)
+        assert signer.command == "test_command"
+
 
 class TestHelperFunctions:
     """Test helper functions for loading secrets."""
@@ -431,3 +685,110 @@ else:
 
         finally:
             os.unlink(temp_script)
+
+    def test_external_signer_stdin_fake_command(self):
+        """Test opt-in stdin signing with a fake command reading stdin."""
+        script_content = """#!/usr/bin/env python3
+import sys
+
+if "--stdin" in sys.argv:
+    # Echo back the input as "signed"
+    print(sys.stdin.read())
+else:
+    print("TestPubkey123")
+"""
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+            f.write(script_content)
+            temp_script = f.name
+
+        try:
+            os.chmod(temp_script, 0o755)
+
+            signer = ExternalSigner(temp_script, stdin=True)
+
+            assert signer.pubkey_base58() == "TestPubkey123"
+            assert signer.sign_transaction(b"test_transaction_data") == (
+                b"test_transaction_data"
+            )
+
+        finally:
+            os.unlink(temp_script)
+
+    def test_external_signer_persistent_daemon(self):
+        """Test ExternalSigner reusing one daemon process across signatures."""
+        script_content = """#!/usr/bin/env python3
+import base64
+import os
+import sys
+
+if "--pubkey" in sys.argv:
+    print("TestPubkey123")
+elif "--daemon" in sys.argv:
+    for line in sys.stdin:
+        # Echo back the input tagged with our pid
+        signed = base64.b64decode(line) + b":" + str(os.getpid()).encode()
+        sys.stdout.write(base64.b64encode(signed).decode() + "\\n")
+        sys.stdout.flush()
+"""
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+            f.write(script_content)
+            temp_script = f.name
+
+        try:
+            os.chmod(temp_script, 0o755)
+
+            signer = ExternalSigner(temp_script, persistent=True)
+            try:
+                first_txn, first_pid = signer.sign_transaction(b"txn-1").split(b":")
+                second_txn, second_pid = signer.sign_transaction(b"txn-2").split(b":")
+                assert (first_txn, second_txn) == (b"txn-1", b"txn-2")
+                assert first_pid == second_pid
+
+                # A dead daemon is restarted transparently
+                signer._proc.kill()
+                signer._proc.wait()
+                third_txn, third_pid = signer.sign_transaction(b"txn-3").split(b":")
+                assert third_txn == b"txn-3"
+                assert third_pid != first_pid
+            finally:
+                signer.close()
+
+            assert signer._proc is None
+
+        finally:
+            os.unlink(temp_script)
+
+    def test_external_signer_daemon_partial_line_times_out(self):
+        """Test that a daemon stalling mid-line cannot block past the timeout."""
+        script_content = """#!/usr/bin/env python3
+import sys
+import time
+
+if "--pubkey" in sys.argv:
+    print("TestPubkey123")
+elif "--daemon" in sys.argv:
+    sys.stdin.readline()
+    sys.stdout.write("cGFydGlhbA")
+    sys.stdout.flush()
+    time.sleep(30)
+"""
+
+        with tempfile.NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
+            f.write(script_content)
+            temp_script = f.name
+
+        try:
+            os.chmod(temp_script, 0o755)
+
+            signer = ExternalSigner(temp_script, timeout=1, persistent=True)
+            try:
+                with pytest.raises(TimeoutError, match="timed out after 1 seconds"):
+                    signer.sign_transaction(b"txn-1")
+                assert signer._proc is None
+            finally:
+                signer.close()
+
+        finally:
+            os.unlink(temp_script)
@@ -1,5 +1,6 @@
 """Tests for trading strategy implementation."""
 
+import asyncio
 from datetime import datetime, timedelta
 
 import pytest
@@ -88,7 +89,7 @@ class MockRiskManager(RiskManager):
         else:
             return False, ["Risk limit exceeded"]
 
-    def after_fill(self, pnl_usd: float) -> None:
+    def after_fill(self, pnl_usd: float, now: float | None = None) -> None:
         """Mock after fill update."""
         self.after_fill_calls += 1
 
@@ -137,6 +138,10 @@ class MockStorage(Persistence):
         self.load_state_calls += 1
         return self.stored_data.get(key)
 
+    async def list_state_keys(self, prefix: str = "") -> list[str]:
+        """Mock state key listing."""
+        return sorted(key for key in self.stored_data if key.startswith(prefix))
+
 
 def create_snapshot(token_mint: str, price_usd: float, **kwargs) -> TokenSnapshot:
     """Create a test token snapshot."""
@@ -199,6 +204,21 @@ class TestPositionState:
         assert restored.high_water_mark == position.high_water_mark
         assert restored.trailing_stop_price == position.trailing_stop_price
         assert len(restored.partial_sells) == len(position.partial_sells)
+        assert isinstance(data["entry_time"], int)
+        assert restored.entry_time == entry_time
+
+    def test_position_state_from_legacy_iso_entry_time(self):
+        """Test loading positions saved with an ISO-format entry time."""
+        data = {
+            "token_mint": "TestToken123",
+            "entry_price_usd": 1.0,
+            "quantity": 100.0,
+            "entry_time": "2024-01-01T12:30:00",
+        }
+
+        restored = PositionState.from_dict(data)
+
+        assert restored.entry_time == datetime(2024, 1, 1, 12, 30)
 
 
 class TestTradingStrategy:
@@ -228,6 +248,18 @@ class TestTradingStrategy:
         assert strategy.max_hold_time_hours == 24.0
         assert len(strategy.get_active_positions()) == 0
 
+    @pytest.mark.asyncio
+    async def test_get_active_positions_is_read_only_view(self, strategy):
+        """Test that active positions are exposed as a live read-only view."""
+        positions = strategy.get_active_positions()
+        assert len(positions) == 0
+
+        await strategy.on_signal(create_snapshot("TestToken123", 1.0))
+
+        assert "TestToken123" in positions
+        with pytest.raises(TypeError):
+            positions["Other"] = None
+
     @pytest.mark.asyncio
     async def test_on_signal_success(self, strategy):
         """Test successful signal processing."""
@@ -369,6 +401,37 @@ class TestTradingStrategy:
             strategy.exec_client.sell_count == initial_sell_count
         )  # No additional sell
 
+    @pytest.mark.asyncio
+    async def test_take_profits_restored_position_skips_sold_level(self, strategy):
+        """Test that sold levels survive a to_dict/from_dict round trip."""
+        await strategy.on_signal(create_snapshot("TestToken123", 1.0))
+        await strategy.take_profits(create_snapshot("TestToken123", 2.0))
+
+        position = strategy.get_position("TestToken123")
+        restored = PositionState.from_dict(position.to_dict())
+        strategy._positions["TestToken123"] = restored
+        sell_count = strategy.exec_client.sell_count
+
+        assert await strategy.take_profits(create_snapshot("TestToken123", 2.5)) is None
+        assert strategy.exec_client.sell_count == sell_count
+
+    @pytest.mark.asyncio
+    async def test_take_profit_levels_sorted(self):
+        """Test that take profit levels are evaluated in ascending order."""
+        strategy = TradingStrategy(
+            exec_client=MockExecutionClient(),
+            risk_manager=MockRiskManager(),
+            storage=MockStorage(),
+            take_profit_levels=[(3.0, 0.5), (2.0, 0.25)],
+        )
+        assert strategy.take_profit_levels == [(2.0, 0.25), (3.0, 0.5)]
+
+        await strategy.on_signal(create_snapshot("TestToken123", 1.0))
+        await strategy.take_profits(create_snapshot("TestToken123", 3.5))
+
+        position = strategy.get_position("TestToken123")
+        assert position.partial_sells[-1]["level"] == 2.0
+
     @pytest.mark.asyncio
     async def test_trailing_stop_update(self, strategy):
         """Test trailing stop price updates."""
@@ -406,6 +469,70 @@ class TestTradingStrategy:
         # Position should be closed
         assert strategy.get_position("TestToken123") is None
 
+    @pytest.mark.asyncio
+    async def test_update_prices_batch(self, strategy):
+        """Test marking several positions to market in one pass."""
+        await strategy.on_signal(create_snapshot("TokenA", 1.0))
+        await strategy.on_signal(create_snapshot("TokenB", 2.0))
+        await strategy.on_signal(create_snapshot("TokenC", 4.0))
+        saves_before = strategy.storage.save_state_calls
+
+        triggered = await strategy.update_prices(
+            {"TokenA": 1.5, "TokenB": 1.6, "Unknown": 9.9}
+        )
+
+        assert triggered == ["TokenB"]  # 1.6 <= 2.0 * 0.85
+        position_a = strategy.get_position("TokenA")
+        assert position_a.high_water_mark == 1.5
+        assert position_a.trailing_stop_price == 1.275
+        # Unpriced positions are untouched
+        assert strategy.get_position("TokenC").high_water_mark == 4.0
+        # Only the position whose stop moved is queued for persistence
+        assert strategy._dirty == {"TokenA"}
+        await strategy.flush()
+        assert strategy.storage.save_state_calls == saves_before + 1
+
+    @pytest.mark.asyncio
+    async def test_trailing_stop_flushed_inline_without_start(self, strategy):
+        """Test that updates are saved without the background flush task."""
+        await strategy.on_signal(create_snapshot("TestToken123", 1.0))
+        saves_before = strategy.storage.save_state_calls
+
+        # Within the interval the update stays pending
+        await strategy.trailing_stop(create_snapshot("TestToken123", 1.2))
+        assert strategy.storage.save_state_calls == saves_before
+
+        # Once the interval has passed the next update saves inline
+        strategy.flush_interval_ms = 0
+        await strategy.trailing_stop(create_snapshot("TestToken123", 1.5))
+
+        assert not strategy._dirty
+        assert strategy.storage.save_state_calls == saves_before + 1
+        stored = strategy.storage.stored_data["position_TestToken123"]
+        assert stored["trailing_stop_price"] == 1.275
+
+    @pytest.mark.asyncio
+    async def test_trailing_stop_updates_coalesced(self, strategy):
+        """Test that trailing stop nudges are saved by the background flush."""
+        strategy.flush_interval_ms = 10
+        await strategy.on_signal(create_snapshot("TestToken123", 1.0))
+        saves_before = strategy.storage.save_state_calls
+
+        await strategy.start()
+        try:
+            for price in (1.1, 1.2, 1.3, 1.4, 1.5):
+                await strategy.trailing_stop(create_snapshot("TestToken123", price))
+            assert strategy.storage.save_state_calls == saves_before
+
+            await asyncio.sleep(0.05)
+        finally:
+            await strategy.stop()
+
+        assert strategy.storage.save_state_calls == saves_before + 1
+        stored = strategy.storage.stored_data["position_TestToken123"]
+        assert stored["high_water_mark"] == 1.5
+        assert stored["trailing_stop_price"] == 1.275
+
     @pytest.mark.asyncio
     async def test_time_stop_triggered(self, strategy):
         """Test time-based stop being triggered."""
@@ -456,6 +583,49 @@ class TestTradingStrategy:
         # Position should still exist
         assert strategy.get_position("TestToken123") is not None
 
+    @pytest.mark.asyncio
+    async def test_time_stop_with_cached_now(self, strategy):
+        """Test time stop evaluated against a caller-supplied tick time."""
+        entry_time = datetime(2024, 1, 1, 12, 0, 0)
+        snapshot = create_snapshot("TestToken123", 1.0)
+        strategy._positions["TestToken123"] = PositionState(
+            token_mint="TestToken123",
+            entry_price_usd=1.0,
+            quantity=50.0,
+            entry_time=entry_time,
+        )
+
+        tick = entry_time + timedelta(hours=23)
+        assert await strategy.time_stop(snapshot, now=tick) is None
+
+        tick = entry_time + timedelta(hours=24)
+        result = await strategy.time_stop(snapshot, now=tick)
+
+        assert result is not None
+        stored = strategy.storage.stored_data["position_TestToken123"]
+        assert stored["partial_sells"][-1]["timestamp"] == tick.isoformat()
+
+    @pytest.mark.asyncio
+    async def test_load_positions_restores_open_positions(self, strategy):
+        """Test that stored open positions are restored and closed ones skipped."""
+        for mint in ("TokenA", "TokenB"):
+            await strategy.on_signal(create_snapshot(mint, 1.0))
+
+        # Close TokenB via time stop
+        late = datetime.now() + timedelta(hours=25)
+        await strategy.time_stop(create_snapshot("TokenB", 1.0), now=late)
+
+        restored = TradingStrategy(
+            exec_client=MockExecutionClient(),
+            risk_manager=MockRiskManager(),
+            storage=strategy.storage,
+        )
+        await restored.load_positions()
+
+        positions = restored.get_active_positions()
+        assert list(positions) == ["TokenA"]
+        assert positions["TokenA"].quantity == 50.0
+
     @pytest.mark.asyncio
     async def test_full_position_lifecycle(self, strategy):
         """Test complete position lifecycle with synthetic price path."""
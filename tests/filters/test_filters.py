@@ -0,0 +1,133 @@
+"""Tests for trading filters."""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from bot.core.types import TokenId, TokenSnapshot
+from bot.filters.basic import BasicFilter
+from bot.filters.rug_heuristics import RugHeuristicsFilter
+
+
+def create_snapshot(**kwargs) -> TokenSnapshot:
+    """Create a test token snapshot that passes all default filters."""
+    return TokenSnapshot(
+        token=TokenId(mint="test_token"),
+        price_usd=1.0,
+        liq_usd=kwargs.get("liq_usd", 100000.0),
+        vol_5m_usd=kwargs.get("vol_5m_usd", 50000.0),
+        holders=kwargs.get("holders", 1000),
+        age_seconds=kwargs.get("age_seconds", 3600),
+        pct_change_5m=kwargs.get("pct_change_5m", 5.0),
+        source="test",
+        ts=datetime.now(),
+    )
+
+
+class TestBasicFilter:
+    """Test basic filter."""
+
+    def test_accepts_passing_token(self):
+        """Test that a token meeting all criteria is accepted."""
+        decision = BasicFilter().evaluate(create_snapshot())
+
+        assert decision.accepted
+        assert decision.score == 1.0
+        assert decision.reasons == ["Passed basic criteria"]
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"liq_usd": 1000.0},
+            {"vol_5m_usd": 100.0},
+            {"holders": 10},
+            {"age_seconds": 60},
+        ],
+    )
+    def test_rejects_on_any_failure(self, overrides):
+        """Test that the fast path and verbose path agree on rejection."""
+        snap = create_snapshot(**overrides)
+
+        assert not BasicFilter().evaluate(snap).accepted
+        assert not BasicFilter(verbose=True).evaluate(snap).accepted
+
+    def test_evaluate_batch(self):
+        """Test that batch evaluation matches per-snapshot evaluation."""
+        basic_filter = BasicFilter()
+        snaps = [
+            create_snapshot(),
+            create_snapshot(liq_usd=1000.0),
+            create_snapshot(holders=None),
+        ]
+
+        assert basic_filter.evaluate_batch(snaps) == [True, False, True]
+        assert basic_filter.evaluate_batch(snaps) == [
+            basic_filter.evaluate(snap).accepted for snap in snaps
+        ]
+
+    def test_uses_slots(self):
+        """Test that filter instances carry no per-instance __dict__."""
+        assert not hasattr(BasicFilter(), "__dict__")
+        assert not hasattr(RugHeuristicsFilter(), "__dict__")
+
+    def test_decimal_thresholds_coerced_to_float(self):
+        """Test that Decimal thresholds are stored as floats."""
+        basic_filter = BasicFilter(min_volume_usd=Decimal("100.50"))
+
+        assert type(basic_filter.min_volume_usd) is float
+        assert basic_filter.evaluate(create_snapshot()).accepted
+
+    def test_verbose_reports_all_failures(self):
+        """Test that verbose mode collects every failed criterion."""
+        snap = create_snapshot(liq_usd=1000.0, vol_5m_usd=100.0)
+
+        decision = BasicFilter(verbose=True).evaluate(snap)
+
+        assert not decision.accepted
+        assert decision.score == pytest.approx(0.3)
+        assert len(decision.reasons) == 2
+        assert decision.reasons[0].startswith("Liquidity too low")
+
+
+class TestRugHeuristicsFilter:
+    """Test rug heuristics filter."""
+
+    def test_accepts_passing_token(self):
+        """Test that a token with no rug indicators is accepted."""
+        decision = RugHeuristicsFilter().evaluate(create_snapshot())
+
+        assert decision.accepted
+        assert decision.reasons == ["Passed rug heuristics"]
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"holders": None},
+            {"holders": 10},
+            {"pct_change_5m": -150.0},
+            {"pct_change_5m": 60.0},
+            {"liq_usd": 500.0},
+        ],
+    )
+    def test_rejects_on_any_failure(self, overrides):
+        """Test that the fast path and verbose path agree on rejection."""
+        snap = create_snapshot(**overrides)
+
+        assert not RugHeuristicsFilter().evaluate(snap).accepted
+        assert not RugHeuristicsFilter(verbose=True).evaluate(snap).accepted
+
+    def test_evaluate_batch(self):
+        """Test that batch evaluation matches per-snapshot evaluation."""
+        snaps = [create_snapshot(), create_snapshot(pct_change_5m=60.0)]
+
+        assert RugHeuristicsFilter().evaluate_batch(snaps) == [True, False]
+
+    def test_verbose_reports_all_failures(self):
+        """Test that verbose mode collects every failed heuristic."""
+        snap = create_snapshot(pct_change_5m=150.0, liq_usd=500.0)
+
+        decision = RugHeuristicsFilter(verbose=True).evaluate(snap)
+
+        assert not decision.accepted
+        assert len(decision.reasons) == 3
@@ -1,5 +1,6 @@
 """Tests for SQLite storage implementation."""
 
+import asyncio
 import json
 import tempfile
 import warnings
@@ -169,6 +170,184 @@ class TestSQLiteStorage:
         assert value == complex_value
         assert json.loads(value) == {"nested": {"data": [1, 2, 3]}}
 
+    @pytest.mark.asyncio
+    async def test_iter_positions(self, storage):
+        """Test streaming positions, most recently updated first."""
+        await storage.upsert_position("token_1", 100.0, 1.0, 1000.0)
+        await storage.upsert_position("token_2", 200.0, 2.0, 2000.0)
+
+        mints = [position["token_mint"] async for position in storage.iter_positions()]
+
+        assert mints == ["token_2", "token_1"]
+
+    @pytest.mark.asyncio
+    async def test_state_json_operations(self, storage):
+        """Test JSON state save and load operations."""
+        data = {"token_mint": "TestToken", "entry_time": 1704067200000000000}
+
+        await storage.save_state_json("position_TestToken", data)
+        assert await storage.load_state_json("position_TestToken") == data
+        assert json.loads(await storage.load_state("position_TestToken")) == data
+        assert await storage.load_state_json("missing") is None
+
+        # Corrupt values are reported as missing
+        await storage.save_state("corrupt", "{not json")
+        assert await storage.load_state_json("corrupt") is None
+
+    @pytest.mark.asyncio
+    async def test_connection_is_reused(self, storage):
+        """Test that one WAL-mode connection serves all operations."""
+        db = storage._db
+        assert db is not None
+
+        await storage.upsert_position("test_token", 100.0, 1.0)
+        await storage.save_state("key", "value")
+        assert storage._db is db
+
+        async with db.execute("PRAGMA journal_mode") as cursor:
+            assert (await cursor.fetchone())[0] == "wal"
+
+        await storage.close()
+        assert storage._db is None
+
+    @pytest.mark.asyncio
+    async def test_trades_composite_index(self, storage):
+        """Test that per-token trade queries use the composite index."""
+        async with storage._db.execute(
+            "EXPLAIN QUERY PLAN "
+            "SELECT * FROM trades WHERE token_mint = ? ORDER BY ts DESC",
+            ("test_token",),
+        ) as cursor:
+            plan = " ".join(row[-1] for row in await cursor.fetchall())
+
+        assert "idx_trades_mint_ts" in plan
+        assert "TEMP B-TREE" not in plan
+
+    @pytest.mark.asyncio
+    async def test_trades_are_batched(self, storage):
+        """Test that trades are buffered and inserted in batches."""
+
+        async def count_trades() -> int:
+            async with storage._db.execute("SELECT COUNT(*) FROM trades") as cursor:
+                return (await cursor.fetchone())[0]
+
+        # Only explicit and size-triggered flushes in this test
+        storage._trade_flush_task.cancel()
+        storage.trade_batch_size = 3
+        ids = [
+            await storage.record_trade("test_token", "buy", 10.0, 1.0, ts=1.0)
+            for _ in range(2)
+        ]
+        assert ids[1] == ids[0] + 1
+        assert await count_trades() == 0
+
+        # Reaching the batch size flushes the buffer
+        await storage.record_trade("test_token", "sell", 20.0, 1.5, ts=2.0)
+        assert await count_trades() == 3
+
+        await storage.record_trade("test_token", "sell", 20.0, 1.5, ts=3.0)
+        await storage.flush_trades()
+        assert await count_trades() == 4
+
+    @pytest.mark.asyncio
+    async def test_flush_batch_writes_trades_and_positions(self, storage):
+        """Test that buffered trades and positions are committed together."""
+        storage._trade_flush_task.cancel()
+        await storage.record_trade("token_a", "buy", 10.0, 1.0, ts=1.0)
+        await storage.record_trade("token_b", "buy", 5.0, 2.0, ts=1.0)
+
+        await storage.flush_batch(
+            [("token_a", 10.0, 1.0), ("token_b", 5.0, 2.0)], updated_ts=1.0
+        )
+
+        async with storage._db.execute("SELECT COUNT(*) FROM trades") as cursor:
+            assert (await cursor.fetchone())[0] == 2
+        positions = {p["token_mint"]: p for p in await storage.load_positions()}
+        assert positions["token_a"]["qty"] == 10.0
+        assert positions["token_b"]["avg_cost_usd"] == 2.0
+
+    @pytest.mark.asyncio
+    async def test_held_trades_wait_for_flush_batch(self, storage):
+        """Test that held trades are only written by the explicit flush_batch."""
+
+        async def count_trades() -> int:
+            async with storage._db.execute("SELECT COUNT(*) FROM trades") as cursor:
+                return (await cursor.fetchone())[0]
+
+        storage.trade_batch_size = 2
+        with storage.hold_trades():
+            for _ in range(3):
+                await storage.record_trade("token_a", "buy", 10.0, 1.0, ts=1.0)
+            # Longer than the 50 ms background flush interval
+            await asyncio.sleep(0.12)
+            assert await count_trades() == 0
+
+            await storage.flush_batch([("token_a", 30.0, 1.0)], updated_ts=1.0)
+            assert await count_trades() == 3
+
+    @pytest.mark.asyncio
+    async def test_list_state_keys(self, storage):
+        """Test listing state keys by prefix."""
+        await storage.save_state("position_B", "{}")
+        await storage.save_state("position_A", "{}")
+        await storage.save_state("positionXC", "{}")
+        await storage.save_state("last_run", "{}")
+
+        assert await storage.list_state_keys("position_") == [
+            "position_A",
+            "position_B",
+        ]
+        assert len(await storage.list_state_keys()) == 4
+        assert await storage.list_state_keys("missing_") == []
+
+    @pytest.mark.asyncio
+    async def test_parquet_trades_partitioned_by_date(self, storage_with_parquet):
+        """Test that trades are written as Hive-partitioned Parquet files."""
+        import bot.persist.storage as storage_module
+
+        if not storage_module.PARQUET_AVAILABLE:
+            pytest.skip("pyarrow not available")
+
+        storage = storage_with_parquet
+        storage.parquet_batch_size = 2
+        for i in range(3):
+            await storage.record_trade("test_token", "buy", 10.0, 1.0, ts=1.0e9 + i)
+        await storage.close()
+
+        # One full batch plus the remainder flushed on close
+        files = list(storage.parquet_dir.glob("date=*/trades-*.parquet"))
+        assert len(files) == 2
+
+        # The date lives only in the directory name, not in the files
+        import pyarrow.parquet as pq
+
+        assert "date" not in pq.read_schema(str(files[0])).names
+
+        dataset = storage_module.ds.dataset(
+            str(storage.parquet_dir), format="parquet", partitioning="hive"
+        )
+        table = dataset.to_table()
+        assert table.num_rows == 3
+        assert table.schema.field("id").type == storage_module.pa.int64()
+        assert set(table.column("date").to_pylist()) == {
+            datetime.fromtimestamp(1.0e9).date().isoformat()
+        }
+
+        # A later run adds files instead of rewriting existing ones
+        await storage.record_trade("test_token", "sell", 10.0, 1.2, ts=1.0e9 + 10)
+        await storage.close()
+        assert len(list(storage.parquet_dir.glob("date=*/trades-*.parquet"))) == 3
+
+    def test_trade_date_matches_local_date(self):
+        """Test the cached trade date across day boundaries."""
+        storage = SQLiteStorage(db_path=":memory:")
+        start = datetime(2024, 3, 9, 23, 59, 59).timestamp()
+
+        for offset in (0, 1, 3600, 86400, 86400 * 40, -86400):
+            ts = start + offset
+            expected = datetime.fromtimestamp(ts).date().isoformat()
+            assert storage._trade_date(ts) == expected
+
     @pytest.mark.asyncio
     async def test_parquet_warning_without_pyarrow(self):
         """Test that warning is issued when Parquet requested but pyarrow unavailable."""
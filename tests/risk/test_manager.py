@@ -1,10 +1,11 @@
 """Tests for risk manager."""
 
+import dataclasses
 import time
 from datetime import datetime
 
 from bot.core.types import TokenId, TokenSnapshot
-from bot.risk.manager import RiskManagerImpl
+from bot.risk.manager import RiskManagerImpl, meets_market_minimums
 
 
 class TestRiskManagerImpl:
@@ -26,6 +27,14 @@ class TestRiskManagerImpl:
         assert rm.daily_pnl == 0.0
         assert rm.remaining_daily_budget == 500.0
 
+    def test_uses_slots(self):
+        """Test that risk manager instances carry no per-instance __dict__."""
+        rm = RiskManagerImpl(
+            position_size_usd=100.0, daily_max_loss_usd=500.0, cooldown_seconds=60
+        )
+
+        assert not hasattr(rm, "__dict__")
+
     def test_size_usd_basic(self):
         """Test basic position sizing."""
         rm = RiskManagerImpl(
@@ -199,6 +208,44 @@ class TestRiskManagerImpl:
         assert allowed is False
         assert "Maximum concurrent positions reached" in reasons
 
+    def test_reserved_buys_hold_slots_until_released(self):
+        """Test that in-flight buys count toward the cap but not the budget."""
+        rm = RiskManagerImpl(
+            position_size_usd=100.0,
+            daily_max_loss_usd=500.0,
+            cooldown_seconds=60,
+            max_concurrent_positions=2,
+        )
+        snaps = [
+            TokenSnapshot(
+                token=TokenId(mint=mint),
+                price_usd=1.0,
+                liq_usd=10000.0,
+                vol_5m_usd=1000.0,
+                source="test",
+                ts=datetime.now(),
+            )
+            for mint in ("token1", "token2", "token3")
+        ]
+
+        rm.reserve("token1", 100.0)
+        allowed, reasons = rm.allow_buy(snaps[0])
+        assert allowed is False
+        assert "Buy already in flight for this token" in reasons
+
+        rm.reserve("token2", 100.0)
+        assert rm.can_buy(snaps[2]) is False
+        assert rm.remaining_daily_budget == 500.0
+        assert rm.size_usd(snaps[2]) == 100.0
+
+        rm.release("token1")
+        rm.release("token2")
+        assert all(rm.can_buy(snap) for snap in snaps)
+        summary = rm.get_state_summary()
+        assert summary["in_flight_buys"] == 0
+        assert summary["in_flight_usd"] == 0.0
+        assert summary["active_positions"] == 0
+
     def test_allow_buy_already_has_position(self):
         """Test buy denied when already have position in token."""
         rm = RiskManagerImpl(
@@ -278,6 +325,29 @@ class TestRiskManagerImpl:
         assert allowed is False
         assert "Invalid price" in reasons
 
+    def test_meets_market_minimums(self):
+        """Test the stateless pre-check agrees with allow_buy market checks."""
+        rm = RiskManagerImpl(
+            position_size_usd=100.0, daily_max_loss_usd=500.0, cooldown_seconds=0
+        )
+
+        for price, liq, vol in [
+            (1.0, 10000.0, 1000.0),
+            (1.0, 999.0, 1000.0),
+            (1.0, 10000.0, 99.0),
+            (0.0, 10000.0, 1000.0),
+        ]:
+            snap = TokenSnapshot(
+                token=TokenId(mint="test_token"),
+                price_usd=price,
+                liq_usd=liq,
+                vol_5m_usd=vol,
+                source="test",
+                ts=datetime.now(),
+            )
+            allowed, _ = rm.allow_buy(snap)
+            assert meets_market_minimums(snap) is allowed
+
     def test_after_fill_profit(self):
         """Test after_fill with profit."""
         rm = RiskManagerImpl(
@@ -310,21 +380,23 @@ class TestRiskManagerImpl:
 
         # Record position
         rm.record_position("test_token", 50.0)
-        assert len(rm._active_positions) == 1
-        assert "test_token" in rm._active_positions
-        assert rm._position_sizes["test_token"] == 50.0
+        assert rm.get_state_summary()["active_positions"] == 1
 
         # Get position info
         info = rm.get_position_info("test_token")
         assert info is not None
-        assert info["token_mint"] == "test_token"
-        assert info["size_usd"] == 50.0
+        assert info.token_mint == "test_token"
+        assert info.size_usd == 50.0
+        assert dataclasses.asdict(info)["size_usd"] == 50.0
 
         # Close position
         rm.close_position("test_token")
-        assert len(rm._active_positions) == 0
-        assert "test_token" not in rm._active_positions
-        assert "test_token" not in rm._position_sizes
+        assert rm.get_state_summary()["active_positions"] == 0
+        assert rm.get_position_info("test_token") is None
+
+        # Closing twice is a no-op
+        rm.close_position("test_token")
+        assert rm.get_state_summary()["active_positions"] == 0
 
     def test_get_state_summary(self):
         """Test getting state summary."""
@@ -380,6 +452,131 @@ class TestRiskManagerTimeBased:
         pnl = rm.daily_pnl
         assert pnl == 0.0  # Should reset to 0 for new day
 
+    def test_single_clock_read_per_call(self):
+        """Test that risk checks read the clock once per call."""
+        calls = [0]
+
+        def counting_now():
+            calls[0] += 1
+            return 1_000_000.0
+
+        rm = RiskManagerImpl(
+            position_size_usd=100.0,
+            daily_max_loss_usd=500.0,
+            cooldown_seconds=60,
+            now_fn=counting_now,
+        )
+        snap = TokenSnapshot(
+            token=TokenId(mint="test_token"),
+            price_usd=1.0,
+            liq_usd=10000.0,
+            vol_5m_usd=1000.0,
+            source="test",
+            ts=datetime.now(),
+        )
+
+        calls[0] = 0
+        rm.allow_buy(snap)
+        assert calls[0] == 1
+
+        calls[0] = 0
+        rm.size_usd(snap)
+        assert calls[0] == 1
+
+        calls[0] = 0
+        rm.allow_buy(snap, now=1_000_000.0)
+        rm.size_usd(snap, now=1_000_000.0)
+        assert calls[0] == 0
+
+    def test_explicit_now(self):
+        """Test that a caller-provided timestamp drives cooldowns."""
+        rm = RiskManagerImpl(
+            position_size_usd=100.0,
+            daily_max_loss_usd=500.0,
+            cooldown_seconds=60,
+            now_fn=lambda: 1_000_000.0,
+        )
+
+        snap = TokenSnapshot(
+            token=TokenId(mint="test_token"),
+            price_usd=1.0,
+            liq_usd=10000.0,
+            vol_5m_usd=1000.0,
+            source="test",
+            ts=datetime.now(),
+        )
+
+        rm.set_cooldown("test_token", now=1_000_000.0)
+        assert rm.allow_buy(snap, now=1_000_030.0)[0] is False
+        assert rm.allow_buy(snap, now=1_000_061.0)[0] is True
+        assert rm.size_usd(snap, now=1_000_061.0) == 100.0
+
+    def test_begin_cycle_runs_housekeeping(self):
+        """Test that begin_cycle rolls the day and purges expired cooldowns."""
+        day_one = datetime(2024, 3, 9, 12, 0, 0).timestamp()
+        day_two = datetime(2024, 3, 10, 12, 0, 0).timestamp()
+        rm = RiskManagerImpl(
+            position_size_usd=100.0,
+            daily_max_loss_usd=500.0,
+            cooldown_seconds=60,
+            now_fn=lambda: day_one,
+        )
+        rm.after_fill(-100.0)
+        rm.set_cooldown("test_token", now=day_one)
+
+        rm.begin_cycle(day_one + 61)
+        assert "test_token" not in rm._tokens
+        assert rm._daily_pnl == -100.0
+
+        rm.begin_cycle(day_two)
+        assert rm._daily_pnl == 0.0
+        assert rm.get_state_summary()["day_start"] == "2024-03-10T00:00:00"
+
+    def test_after_fill_with_cycle_time_skips_reset_check(self):
+        """Test that after_fill given the cycle's now leaves the day to begin_cycle."""
+        day_one = datetime(2024, 3, 9, 12, 0, 0).timestamp()
+        day_two = datetime(2024, 3, 10, 12, 0, 0).timestamp()
+        current_time = [day_one]
+        rm = RiskManagerImpl(
+            position_size_usd=100.0,
+            daily_max_loss_usd=500.0,
+            cooldown_seconds=60,
+            now_fn=lambda: current_time[0],
+        )
+
+        current_time[0] = day_two
+        rm.after_fill(-100.0, now=day_one)
+        assert rm._daily_pnl == -100.0
+
+        rm.after_fill(-50.0)
+        assert rm._daily_pnl == -50.0
+
+    def test_daily_reset_at_local_midnight(self):
+        """Test that the daily reset happens exactly at local midnight."""
+        current_time = [datetime(2024, 3, 9, 23, 59, 59).timestamp()]
+
+        rm = RiskManagerImpl(
+            position_size_usd=100.0,
+            daily_max_loss_usd=500.0,
+            cooldown_seconds=60,
+            now_fn=lambda: current_time[0],
+        )
+
+        rm.after_fill(-100.0)
+        rm.record_position("open_token", 50.0)
+        rm.set_cooldown("other_token")
+        current_time[0] += 0.5
+        assert rm.daily_pnl == -100.0
+
+        current_time[0] += 0.5
+        assert rm.daily_pnl == 0.0
+
+        # Open positions survive the reset; cooldowns do not
+        assert rm.get_position_info("open_token").size_usd == 50.0
+        assert rm.get_state_summary()["active_positions"] == 1
+        assert "other_token" not in rm._tokens
+        assert rm.get_state_summary()["day_start"] == "2024-03-10T00:00:00"
+
     def test_cooldown_expiration(self):
         """Test cooldown expiration."""
         current_time = [time.time()]
@@ -419,6 +616,88 @@ class TestRiskManagerTimeBased:
         assert allowed is True
         assert reasons == []
 
+    def test_can_buy_matches_allow_buy(self):
+        """Test that the short-circuit check agrees with allow_buy."""
+        current_time = [time.time()]
+        rm = RiskManagerImpl(
+            position_size_usd=100.0,
+            daily_max_loss_usd=50.0,
+            cooldown_seconds=60,
+            max_concurrent_positions=2,
+            now_fn=lambda: current_time[0],
+        )
+
+        def snap(mint: str) -> TokenSnapshot:
+            return TokenSnapshot(
+                token=TokenId(mint=mint),
+                price_usd=1.0,
+                liq_usd=10000.0,
+                vol_5m_usd=1000.0,
+                source="test",
+                ts=datetime.now(),
+            )
+
+        def check(mint: str) -> bool:
+            allowed, _ = rm.allow_buy(snap(mint))
+            assert rm.can_buy(snap(mint)) is allowed
+            return allowed
+
+        assert check("fresh") is True
+
+        rm.set_cooldown("cooling")
+        assert check("cooling") is False
+        current_time[0] += 61
+        assert check("cooling") is True
+
+        rm.record_position("held", 25.0)
+        assert check("held") is False
+
+        rm.record_position("other", 25.0)
+        assert check("fresh") is False
+
+        rm.close_position("other")
+        rm.after_fill(-50.0)
+        assert check("fresh") is False
+
+    def test_expired_cooldowns_are_purged(self):
+        """Test that idle token records are dropped once their cooldown ends."""
+        current_time = [datetime(2024, 3, 10, 12, 0, 0).timestamp()]
+        rm = RiskManagerImpl(
+            position_size_usd=100.0,
+            daily_max_loss_usd=500.0,
+            cooldown_seconds=60,
+            now_fn=lambda: current_time[0],
+        )
+        snap = TokenSnapshot(
+            token=TokenId(mint="probe"),
+            price_usd=1.0,
+            liq_usd=10000.0,
+            vol_5m_usd=1000.0,
+            source="test",
+            ts=datetime.now(),
+        )
+
+        for i in range(100):
+            rm.set_cooldown(f"token{i}")
+        rm.record_position("held", 25.0)
+        rm.set_cooldown("held")
+
+        current_time[0] += 30
+        rm.set_cooldown("token0")
+        rm.can_buy(snap)
+        assert len(rm._tokens) == 101
+
+        current_time[0] += 31
+        rm.can_buy(snap)
+        assert set(rm._tokens) == {"token0", "held"}
+        assert rm.get_position_info("held") is not None
+
+        rm.close_position("held")
+        current_time[0] += 60
+        allowed, _ = rm.allow_buy(snap)
+        assert allowed is True
+        assert rm._tokens == {}
+
     def test_multiple_reasons(self):
         """Test multiple reasons for buy denial."""
         rm = RiskManagerImpl(
@@ -531,7 +810,7 @@ class TestRiskManagerEdgeCases:
         rm.close_position("nonexistent_token")
 
         # State should remain unchanged
-        assert len(rm._active_positions) == 0
+        assert rm.get_state_summary()["active_positions"] == 0
 
     def test_get_nonexistent_position_info(self):
         """Test getting info for nonexistent position."""
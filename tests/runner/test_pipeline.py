@@ -1,14 +1,16 @@
 """Tests for the trading pipeline."""
 
 import asyncio
-from datetime import datetime
-from unittest.mock import MagicMock
+import contextlib
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
 
 import pytest
 
 from bot.config.settings import AppSettings
 from bot.core.interfaces import AlertSink, ExecutionClient, Filter, RiskManager
 from bot.core.types import FilterDecision, TokenId, TokenSnapshot
+from bot.risk.manager import RiskManagerImpl
 from bot.runner.pipeline import TradingPipeline
 
 
@@ -50,19 +52,35 @@ class MockRiskManager:
         self.position_size = position_size
         self.size_count = 0
         self.allow_count = 0
+        self.begin_cycle_count = 0
 
-    def size_usd(self, snap: TokenSnapshot) -> float:
+    def begin_cycle(self, now: float) -> None:
+        self.begin_cycle_count += 1
+
+    def size_usd(self, snap: TokenSnapshot, now: float | None = None) -> float:
         self.size_count += 1
         return self.position_size
 
-    def allow_buy(self, snap: TokenSnapshot) -> tuple[bool, list[str]]:
+    def allow_buy(
+        self, snap: TokenSnapshot, now: float | None = None
+    ) -> tuple[bool, list[str]]:
         self.allow_count += 1
         if self.allow_all:
             return True, ["Mock allowed"]
         else:
             return False, ["Mock rejected"]
 
-    def after_fill(self, pnl_usd: float) -> None:
+    def can_buy(self, snap: TokenSnapshot, now: float | None = None) -> bool:
+        allowed, _ = self.allow_buy(snap, now)
+        return allowed
+
+    def reserve(self, token_mint: str, size_usd: float) -> None:
+        pass
+
+    def release(self, token_mint: str) -> None:
+        pass
+
+    def after_fill(self, pnl_usd: float, now: float | None = None) -> None:
         pass
 
 
@@ -100,6 +118,8 @@ class MockStorage:
     def __init__(self):
         self.record_trade_count = 0
         self.upsert_position_count = 0
+        self.flush_batch_count = 0
+        self.flushed_positions = []
 
     async def record_trade(self, token: TokenId, side: str, usd_amount: float, price_usd: float) -> None:
         self.record_trade_count += 1
@@ -107,10 +127,34 @@ class MockStorage:
     async def upsert_position(self, token: TokenId, qty: float, avg_cost_usd: float) -> None:
         self.upsert_position_count += 1
 
+    async def flush_batch(self, positions: list[tuple[str, float, float]]) -> None:
+        self.flush_batch_count += 1
+        self.flushed_positions.extend(positions)
+
+    @contextlib.contextmanager
+    def hold_trades(self):
+        yield
+
     async def close(self) -> None:
         pass
 
 
+class FillingExecutionClient(MockExecutionClient):
+    """Execution client that reports a fill for every buy."""
+
+    async def buy(self, snap: TokenSnapshot, usd_amount: float) -> dict:
+        await super().buy(snap, usd_amount)
+        return {"qty_base": 50.0, "price_exec": 1.0, "fee_usd": 0.1}
+
+
+class TradeStorage(MockStorage):
+    """Storage that accepts the pipeline's trade records and numbers them."""
+
+    async def record_trade(self, **kwargs) -> int:
+        self.record_trade_count += 1
+        return self.record_trade_count
+
+
 class TestTradingPipeline:
     """Test the trading pipeline."""
 
@@ -254,7 +298,7 @@ class TestTradingPipeline:
 
         # Verify alerts were sent
         alerts = pipeline.components["alerts"]
-        assert alerts.push_count == 2  # One for each trade
+        assert alerts.push_count == 1  # Both trades in one batched alert
         assert any("Trade Executed" in msg for msg in alerts.messages)
 
     @pytest.mark.asyncio
@@ -330,3 +374,475 @@ class TestTradingPipeline:
         # Verify storage was closed
         storage = pipeline.components["storage"]
         assert hasattr(storage, 'close')  # Mock should have close method
+
+
+class TestPipelineCycle:
+    """Test trading cycle internals with fully mocked components."""
+
+    @pytest.fixture
+    def make_pipeline(self):
+        """Build a pipeline around the given mock components."""
+
+        def factory(snapshots, filter_obj, risk_manager=None):
+            components = {
+                "data_sources": [MockDataSource(snapshots)],
+                "filters": [filter_obj],
+                "risk": risk_manager or MockRiskManager(allow_all=False),
+                "exec_client": MockExecutionClient(),
+                "alerts": MockAlertSink(),
+                "storage": MockStorage(),
+            }
+            settings = MagicMock(spec=AppSettings)
+            settings.dry_run = True
+            with patch.object(TradingPipeline, "_assemble", return_value=components):
+                return TradingPipeline(settings)
+
+        return factory
+
+    @pytest.mark.asyncio
+    async def test_filter_verdict_reused_for_unchanged_snapshot(
+        self, make_pipeline
+    ):
+        """Test that filters only re-run when a token's snapshot changes."""
+        ts = datetime(2024, 1, 1, 12, 0, 0)
+        snapshot = TokenSnapshot(
+            token=TokenId(mint="TokenA123456789"),
+            price_usd=1.0,
+            liq_usd=10000.0,
+            vol_5m_usd=1000.0,
+            source="jupiter",
+            ts=ts,
+        )
+        filter_obj = MockFilter(accept_all=False)
+        pipeline = make_pipeline([snapshot], filter_obj)
+
+        await pipeline.run_once()
+        await pipeline.run_once()
+        assert filter_obj.evaluate_count == 1
+
+        pipeline.components["data_sources"][0].snapshots = [
+            snapshot.model_copy(update={"ts": ts + timedelta(seconds=5)})
+        ]
+        await pipeline.run_once()
+        assert filter_obj.evaluate_count == 2
+
+    @pytest.mark.asyncio
+    async def test_batch_filter_checks_uncached_candidates_together(
+        self, make_pipeline
+    ):
+        """Test that batch filters get one call per cycle for new snapshots."""
+
+        class BatchFilter(MockFilter):
+            def __init__(self) -> None:
+                super().__init__()
+                self.batches: list[list[str]] = []
+
+            def evaluate_batch(self, snaps: list[TokenSnapshot]) -> list[bool]:
+                self.batches.append([snap.token.mint for snap in snaps])
+                return [snap.token.mint != "TokenB123456789" for snap in snaps]
+
+        ts = datetime(2024, 1, 1, 12, 0, 0)
+        snapshots = [
+            TokenSnapshot(
+                token=TokenId(mint=mint),
+                price_usd=1.0,
+                liq_usd=10000.0,
+                vol_5m_usd=1000.0,
+                source="jupiter",
+                ts=ts,
+            )
+            for mint in ("TokenA123456789", "TokenB123456789", "TokenC123456789")
+        ]
+        filter_obj = BatchFilter()
+        pipeline = make_pipeline(snapshots, filter_obj)
+
+        await pipeline.run_once()
+        assert filter_obj.batches == [
+            ["TokenA123456789", "TokenB123456789", "TokenC123456789"]
+        ]
+        assert filter_obj.evaluate_count == 0
+        assert pipeline.components["risk"].allow_count == 2
+
+        snapshots[2] = snapshots[2].model_copy(
+            update={"ts": ts + timedelta(seconds=5)}
+        )
+        pipeline.components["data_sources"][0].snapshots = snapshots
+        await pipeline.run_once()
+        assert filter_obj.batches[1:] == [["TokenC123456789"]]
+        assert pipeline.components["risk"].allow_count == 4
+
+    @pytest.mark.asyncio
+    async def test_data_sources_polled_concurrently(self, make_pipeline):
+        """Test that sources are polled together and failures are isolated."""
+
+        class SlowSource(MockDataSource):
+            async def poll(self) -> list[TokenSnapshot]:
+                await asyncio.sleep(0.1)
+                return await super().poll()
+
+        class FailingSource(MockDataSource):
+            async def poll(self) -> list[TokenSnapshot]:
+                raise RuntimeError("source down")
+
+        snapshot = TokenSnapshot(
+            token=TokenId(mint="TokenA123456789"),
+            price_usd=1.0,
+            liq_usd=10000.0,
+            vol_5m_usd=1000.0,
+            source="jupiter",
+            ts=datetime.now(),
+        )
+        filter_obj = MockFilter(accept_all=False)
+        pipeline = make_pipeline([], filter_obj)
+        pipeline.components["data_sources"] = [
+            SlowSource([snapshot]),
+            SlowSource([snapshot]),
+            FailingSource([]),
+        ]
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await pipeline.run_once()
+
+        assert loop.time() - start < 0.19
+        assert filter_obj.evaluate_count == 1
+
+    @pytest.mark.asyncio
+    async def test_merge_keeps_latest_snapshot_per_token(self, make_pipeline):
+        """Test that only the newest snapshot of each token is processed."""
+
+        class RecordingFilter(MockFilter):
+            def __init__(self):
+                super().__init__(accept_all=False)
+                self.seen = []
+
+            def evaluate(self, snap: TokenSnapshot) -> FilterDecision:
+                self.seen.append(snap)
+                return super().evaluate(snap)
+
+        ts = datetime(2024, 1, 1, 12, 0, 0)
+        older = TokenSnapshot(
+            token=TokenId(mint="TokenA123456789"),
+            price_usd=1.0,
+            liq_usd=10000.0,
+            vol_5m_usd=1000.0,
+            source="jupiter",
+            ts=ts,
+        )
+        newer = older.model_copy(update={"price_usd": 2.0, "ts": ts + timedelta(1)})
+        filter_obj = RecordingFilter()
+        pipeline = make_pipeline([older, newer, older], filter_obj)
+
+        await pipeline.run_once()
+
+        assert filter_obj.seen == [newer]
+
+    @pytest.mark.asyncio
+    async def test_tokens_processed_with_bounded_concurrency(self, make_pipeline):
+        """Test that tokens overlap in execution up to the configured limit."""
+
+        class SlowExecutionClient(MockExecutionClient):
+            def __init__(self):
+                super().__init__()
+                self.in_flight = 0
+                self.max_in_flight = 0
+
+            async def simulate(self, snap: TokenSnapshot, usd_amount: float) -> dict:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(0.01)
+                self.in_flight -= 1
+                raise RuntimeError("stop after simulate")
+
+        snapshots = [
+            TokenSnapshot(
+                token=TokenId(mint=f"Token{i:02d}"),
+                price_usd=1.0,
+                liq_usd=10000.0,
+                vol_5m_usd=1000.0,
+                source="jupiter",
+                ts=datetime.now(),
+            )
+            for i in range(10)
+        ]
+        pipeline = make_pipeline(
+            snapshots, MockFilter(accept_all=True), MockRiskManager(allow_all=True)
+        )
+        pipeline._token_semaphore = asyncio.Semaphore(3)
+        exec_client = SlowExecutionClient()
+        pipeline.components["exec_client"] = exec_client
+
+        await pipeline.run_once()
+
+        assert exec_client.max_in_flight == 3
+
+    @pytest.fixture
+    def slow_exec_client(self):
+        """Filling execution client that records how many buys overlap."""
+
+        class SlowFillingExecutionClient(FillingExecutionClient):
+            def __init__(self):
+                super().__init__()
+                self.in_flight = 0
+                self.max_in_flight = 0
+                self.amounts = []
+
+            async def simulate(self, snap: TokenSnapshot, usd_amount: float) -> dict:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                await asyncio.sleep(0.01)
+                return await super().simulate(snap, usd_amount)
+
+            async def buy(self, snap: TokenSnapshot, usd_amount: float) -> dict:
+                self.in_flight -= 1
+                self.amounts.append(usd_amount)
+                return await super().buy(snap, usd_amount)
+
+        return SlowFillingExecutionClient()
+
+    @staticmethod
+    def _liquid_snapshots(count: int) -> list[TokenSnapshot]:
+        return [
+            TokenSnapshot(
+                token=TokenId(mint=f"Token{i:02d}"),
+                price_usd=1.0,
+                liq_usd=10000.0,
+                vol_5m_usd=1000.0,
+                source="jupiter",
+                ts=datetime.now(),
+            )
+            for i in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_position_cap_limits_buys_in_flight(
+        self, make_pipeline, slow_exec_client
+    ):
+        """Test that concurrent buys respect the cap without exhausting it."""
+        risk_manager = RiskManagerImpl(
+            position_size_usd=50.0,
+            daily_max_loss_usd=1000.0,
+            cooldown_seconds=60,
+            max_concurrent_positions=2,
+        )
+        pipeline = make_pipeline(
+            self._liquid_snapshots(6), MockFilter(accept_all=True), risk_manager
+        )
+        pipeline.components["exec_client"] = slow_exec_client
+        pipeline.components["storage"] = TradeStorage()
+
+        # More cycles than max_concurrent_positions; settled buys free their slot
+        for _ in range(4):
+            await pipeline.run_once()
+
+        assert slow_exec_client.max_in_flight == 2
+        assert slow_exec_client.buy_count == 8
+        summary = risk_manager.get_state_summary()
+        assert summary["active_positions"] == 0
+        assert summary["in_flight_buys"] == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_buys_sized_from_loss_budget(
+        self, make_pipeline, slow_exec_client
+    ):
+        """Test that buys in flight do not shrink each other's size."""
+        risk_manager = RiskManagerImpl(
+            position_size_usd=50.0,
+            daily_max_loss_usd=100.0,
+            cooldown_seconds=60,
+        )
+        pipeline = make_pipeline(
+            self._liquid_snapshots(6), MockFilter(accept_all=True), risk_manager
+        )
+        pipeline.components["exec_client"] = slow_exec_client
+        pipeline.components["storage"] = TradeStorage()
+
+        await pipeline.run_once()
+
+        assert slow_exec_client.max_in_flight == 6
+        assert slow_exec_client.amounts == [50.0] * 6
+        assert risk_manager.remaining_daily_budget == 100.0
+
+    @pytest.mark.asyncio
+    async def test_failed_buy_releases_risk_reservation(self, make_pipeline):
+        """Test that a buy that fails frees its in-flight slot."""
+
+        class FailingExecutionClient(MockExecutionClient):
+            async def buy(self, snap: TokenSnapshot, usd_amount: float) -> dict:
+                await super().buy(snap, usd_amount)
+                raise RuntimeError("swap failed")
+
+        (snapshot,) = self._liquid_snapshots(1)
+        risk_manager = RiskManagerImpl(
+            position_size_usd=50.0,
+            daily_max_loss_usd=100.0,
+            cooldown_seconds=60,
+            max_concurrent_positions=1,
+        )
+        pipeline = make_pipeline([snapshot], MockFilter(accept_all=True), risk_manager)
+        pipeline.components["exec_client"] = FailingExecutionClient()
+
+        await pipeline.run_once()
+
+        assert risk_manager.get_state_summary()["in_flight_buys"] == 0
+        assert risk_manager.can_buy(snapshot)
+
+    @pytest.mark.asyncio
+    async def test_tokens_below_market_minimums_skipped(self, make_pipeline):
+        """Test that illiquid tokens never reach filters or risk checks."""
+        snapshot = TokenSnapshot(
+            token=TokenId(mint="TokenA123456789"),
+            price_usd=1.0,
+            liq_usd=500.0,
+            vol_5m_usd=1000.0,
+            source="jupiter",
+            ts=datetime.now(),
+        )
+        filter_obj = MockFilter(accept_all=True)
+        risk_manager = MockRiskManager(allow_all=True)
+        pipeline = make_pipeline([snapshot], filter_obj, risk_manager)
+
+        await pipeline.run_once()
+
+        assert filter_obj.evaluate_count == 0
+        assert risk_manager.allow_count == 0
+
+    @pytest.mark.asyncio
+    async def test_position_updates_flushed_once_per_cycle(self, make_pipeline):
+        """Test that a cycle's position updates go to storage in one batch."""
+        snapshots = [
+            TokenSnapshot(
+                token=TokenId(mint=f"Token{i:02d}"),
+                price_usd=1.0,
+                liq_usd=10000.0,
+                vol_5m_usd=1000.0,
+                source="jupiter",
+                ts=datetime.now(),
+            )
+            for i in range(3)
+        ]
+        risk_manager = MockRiskManager(allow_all=True)
+        pipeline = make_pipeline(snapshots, MockFilter(accept_all=True), risk_manager)
+        storage = TradeStorage()
+        pipeline.components["exec_client"] = FillingExecutionClient()
+        pipeline.components["storage"] = storage
+
+        await pipeline.run_once()
+
+        assert risk_manager.begin_cycle_count == 1
+        assert risk_manager.allow_count == 3
+        assert storage.record_trade_count == 3
+        assert storage.upsert_position_count == 0
+        assert storage.flush_batch_count == 1
+        assert sorted(storage.flushed_positions) == [
+            (f"Token{i:02d}", 50.0, 1.0) for i in range(3)
+        ]
+
+        messages = pipeline.components["alerts"].messages
+        assert len(messages) == 1
+        assert messages[0].count("Trade Executed") == 3
+        assert messages[0].startswith(
+            "🟢 <b>Trade Executed</b>\n\n"
+            "Token: <code>Token00...</code>\n"
+            "Amount: $50.00\n"
+            "Quantity: 50.000000\n"
+            "Price: $1.000000\n"
+            "Fee: $0.10\n"
+            "Trade ID: 1\n\n"
+        )
+
+    @pytest.mark.asyncio
+    async def test_trade_alerts_sent_in_batches(self, make_pipeline):
+        """Test that a cycle's trade alerts are combined up to the batch size."""
+        snapshots = [
+            TokenSnapshot(
+                token=TokenId(mint=f"Token{i:02d}"),
+                price_usd=1.0,
+                liq_usd=10000.0,
+                vol_5m_usd=1000.0,
+                source="jupiter",
+                ts=datetime.now(),
+            )
+            for i in range(25)
+        ]
+        pipeline = make_pipeline(
+            snapshots, MockFilter(accept_all=True), MockRiskManager(allow_all=True)
+        )
+        pipeline.components["exec_client"] = FillingExecutionClient()
+        pipeline.components["storage"] = TradeStorage()
+
+        await pipeline.run_once()
+
+        messages = pipeline.components["alerts"].messages
+        assert [msg.count("Trade Executed") for msg in messages] == [20, 5]
+
+    @pytest.mark.asyncio
+    async def test_cycle_sleep_accounts_for_cycle_duration(self, make_pipeline):
+        """Test that cycles start every cycle_sleep_seconds, not sleep + work."""
+        pipeline = make_pipeline([], MockFilter())
+        pipeline.settings.cycle_sleep_seconds = 0.1
+        loop = asyncio.get_running_loop()
+        cycle_starts = []
+
+        async def slow_cycle() -> None:
+            cycle_starts.append(loop.time())
+            await asyncio.sleep(0.06)
+            if len(cycle_starts) == 3:
+                pipeline.running = False
+
+        pipeline.run_once = slow_cycle
+        await pipeline.run_forever()
+
+        intervals = [
+            b - a for a, b in zip(cycle_starts[:-1], cycle_starts[1:], strict=True)
+        ]
+        assert all(0.09 <= interval < 0.14 for interval in intervals)
+
+    @pytest.mark.asyncio
+    async def test_stop_interrupts_cycle_wait(self, make_pipeline):
+        """Test that stop() wakes the pipeline instead of waiting out the sleep."""
+        pipeline = make_pipeline([], MockFilter())
+        pipeline.settings.cycle_sleep_seconds = 30
+        cycles = 0
+
+        async def quick_cycle() -> None:
+            nonlocal cycles
+            cycles += 1
+
+        pipeline.run_once = quick_cycle
+        task = asyncio.create_task(pipeline.run_forever())
+        await asyncio.sleep(0.05)
+
+        await asyncio.wait_for(pipeline.stop(), timeout=1)
+        await asyncio.wait_for(task, timeout=1)
+
+        assert cycles == 1
+        assert not pipeline.running
+        # run_forever's cleanup calls stop() again; teardown runs only once
+        messages = pipeline.components["alerts"].messages
+        assert messages.count("🛑 Trading bot stopped") == 1
+
+    @pytest.mark.asyncio
+    async def test_filters_run_cheapest_first(self, make_pipeline):
+        """Test that a cheap rejecting filter spares the expensive one."""
+
+        class ExpensiveFilter(MockFilter):
+            cost = 100
+
+        snapshot = TokenSnapshot(
+            token=TokenId(mint="TokenA123456789"),
+            price_usd=1.0,
+            liq_usd=10000.0,
+            vol_5m_usd=1000.0,
+            source="jupiter",
+            ts=datetime.now(),
+        )
+        expensive = ExpensiveFilter(accept_all=True)
+        cheap = MockFilter(accept_all=False)
+        pipeline = make_pipeline([snapshot], expensive)
+        pipeline.components["filters"] = [expensive, cheap]
+
+        await pipeline.run_once()
+
+        assert cheap.evaluate_count == 1
+        assert expensive.evaluate_count == 0
@@ -7,10 +7,12 @@ from pathlib import Path
 from unittest.mock import patch
 
 import pytest
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 from scripts.secret_vault import (
     SecretVault,
     VaultError,
+    _NoncePool,
     load_key_from_env,
     mask_env_content,
 )
@@ -58,6 +60,15 @@ class TestSecretVault:
         key3 = SecretVault.derive_key_from_password("different_password")
         assert key1 != key3
 
+    def test_derive_key_is_cached(self):
+        """Test that repeated derivations skip the PBKDF2 work."""
+        with patch("scripts.secret_vault.PBKDF2HMAC", wraps=PBKDF2HMAC) as kdf:
+            key1 = SecretVault.derive_key_from_password("cached_password")
+            key2 = SecretVault.derive_key_from_password("cached_password")
+
+        assert key1 == key2
+        assert kdf.call_count == 1
+
     def test_encrypt_decrypt_data(self, vault, test_data):
         """Test data encryption and decryption."""
         encrypted = vault.encrypt_data(test_data)
@@ -120,6 +131,44 @@ class TestSecretVault:
             assert output_file.exists()
             assert output_file.read_bytes() == test_data
 
+    def test_file_streaming_matches_in_memory_format(self, vault):
+        """Test that chunked file encryption interoperates with encrypt_data."""
+        vault.CHUNK_SIZE = 64
+        data = os.urandom(1000)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "input.bin"
+            encrypted_file = Path(temp_dir) / "encrypted.bin"
+            input_file.write_bytes(data)
+
+            vault.encrypt_file(input_file, encrypted_file)
+            assert vault.decrypt_data(encrypted_file.read_bytes()) == data
+
+            encrypted_file.write_bytes(vault.encrypt_data(data))
+            assert vault.decrypt_file(encrypted_file) == data
+
+    def test_empty_file_roundtrip(self, vault):
+        """Test that empty files, which cannot be mapped, still round-trip."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "empty.bin"
+            encrypted_file = Path(temp_dir) / "encrypted.bin"
+            input_file.write_bytes(b"")
+
+            vault.encrypt_file(input_file, encrypted_file)
+            assert vault.decrypt_file(encrypted_file) == b""
+
+    def test_file_decryption_tampered_writes_nothing(self, vault, test_data):
+        """Test that a file failing authentication is never written out."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            encrypted_file = Path(temp_dir) / "encrypted.bin"
+            output_file = Path(temp_dir) / "output.txt"
+            encrypted = bytearray(vault.encrypt_data(test_data))
+            encrypted[20] ^= 0x01
+            encrypted_file.write_bytes(bytes(encrypted))
+
+            with pytest.raises(VaultError, match="Decryption failed"):
+                vault.decrypt_file(encrypted_file, output_file)
+            assert not output_file.exists()
+
     def test_file_encryption_missing_input(self, vault):
         """Test file encryption with missing input file."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -146,6 +195,32 @@ class TestSecretVault:
             vault.encrypt_file(input_file, output_file, force=True)
             assert output_file.exists()
 
+    def test_file_encryption_in_place(self, vault, test_data):
+        """Test that encrypting a file onto itself keeps the plaintext."""
+        vault.CHUNK_SIZE = 8
+        with tempfile.TemporaryDirectory() as temp_dir:
+            secret_file = Path(temp_dir) / "secrets.env"
+            secret_file.write_bytes(test_data)
+
+            vault.encrypt_file(secret_file, secret_file, force=True)
+            assert vault.decrypt_file(secret_file) == test_data
+
+            vault.decrypt_file(secret_file, secret_file, force=True)
+            assert secret_file.read_bytes() == test_data
+            assert os.listdir(temp_dir) == ["secrets.env"]
+
+    def test_file_encryption_failure_leaves_no_output(self, vault, test_data):
+        """Test that a failed encryption leaves no partial output behind."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            input_file = Path(temp_dir) / "input.txt"
+            output_file = Path(temp_dir) / "output.bin"
+            input_file.write_bytes(test_data)
+
+            with patch.object(vault, "CHUNK_SIZE", 0):
+                with pytest.raises(ValueError):
+                    vault.encrypt_file(input_file, output_file)
+            assert os.listdir(temp_dir) == ["input.txt"]
+
     def test_file_decryption_return_data(self, vault, test_data):
         """Test file decryption returning data without writing file."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -514,6 +589,16 @@ class TestVaultSecurity:
         # All nonces should be unique
         assert len(set(nonces)) == len(nonces)
 
+    def test_nonce_pool_refills_without_reuse(self):
+        """Test that pooled nonces stay distinct across pool refills."""
+        pool = _NoncePool()
+        count = 2 * pool.POOL_SIZE // SecretVault.NONCE_SIZE + 5
+
+        nonces = [pool.take(SecretVault.NONCE_SIZE) for _ in range(count)]
+
+        assert all(len(nonce) == SecretVault.NONCE_SIZE for nonce in nonces)
+        assert len(set(nonces)) == count
+
     def test_ciphertext_integrity(self):
         """Test that tampering with ciphertext fails authentication."""
         vault = SecretVault(b"0123456789abcdef0123456789abcdef")
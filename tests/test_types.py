@@ -19,6 +19,16 @@ def test_token_id_creation() -> None:
     assert token_eth.mint == "0xA0b86a33E6441b8c4C8C8C8C8C8C8C8C8C8C8C8C8"
 
 
+def test_token_id_mint_is_interned() -> None:
+    """Test that equal mints from separate sources share one string object."""
+    mint = "".join(["EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"])
+    payload = json.dumps({"mint": mint})
+
+    token_a = TokenId(mint=mint)
+    token_b = TokenId.model_validate_json(payload)
+
+    assert token_a.mint is token_b.mint
+
 def test_pool_id_creation() -> None:
     """Test PoolId creation and validation."""
     pool = PoolId(